@@ -1,10 +1,12 @@
 import logging
 import sqlite3
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
 
-from transcript_engine.core.dependencies import get_db
+from transcript_engine.core.dependencies import get_db, get_db_reader # Writer + pooled readers
 from transcript_engine.database import crud
-from transcript_engine.database.models import ChunkCreate
+from transcript_engine.database.models import Transcript
 from transcript_engine.processing.chunking import chunk_text
 
 # Configure logging
@@ -14,29 +16,114 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Constants
-TRANSCRIPT_BATCH_SIZE = 10 # Process N transcripts at a time
-CHUNK_BATCH_SIZE = 100 # Insert M chunks at a time
+TRANSCRIPT_BATCH_SIZE = 200 # Process N transcripts at a time
+CHUNK_BATCH_SIZE = 100 # Flush accumulated chunks to the DB every M chunks
+
+def _fetch_batch(after_id: int) -> List[Transcript]:
+    """Reads the next batch of unchunked transcripts on a pooled read-only connection.
+
+    Runs on the fetch thread, so its reads never interleave with the
+    writer connection's open transaction.
+    """
+    with get_db_reader() as reader_conn:
+        return crud.get_transcripts_needing_chunking(
+            reader_conn, limit=TRANSCRIPT_BATCH_SIZE, after_id=after_id
+        )
+
+def _write_batch(
+    db_conn: sqlite3.Connection,
+    transcripts: List[Transcript],
+    stats: Dict[str, int],
+) -> None:
+    """Chunks a batch of transcripts and writes the chunks to the database.
+
+    Chunks are accumulated across transcripts and flushed in one transaction
+    every CHUNK_BATCH_SIZE chunks (and at the end of the batch).
+
+    Raises:
+        sqlite3.Error: If a flush fails; that flush is rolled back.
+    """
+    chunks_to_add: list[crud.ChunkRow] = []
+    chunked_ids: list[int] = []
+    for transcript in transcripts:
+        logger.debug("Processing transcript ID: %s", transcript.id)
+        transcript_chunks: list[crud.ChunkRow] = []
+        try:
+            # Assuming basic text chunking for now
+            # TODO: Incorporate start/end times if available in transcript/chunking logic
+            text_chunks = chunk_text(transcript.content)
+
+            if not text_chunks:
+                 logger.warning(f"Transcript ID {transcript.id} generated no chunks. Skipping.")
+                 # Mark as chunked even if empty to avoid reprocessing
+                 chunked_ids.append(transcript.id)
+                 continue
+
+            # Placeholder start/end times - needs refinement
+            # Convert datetime to float timestamp for DB insertion; identical
+            # for every chunk of this transcript, so compute them once
+            start_ts = transcript.start_time.timestamp() if transcript.start_time else None
+            end_ts = transcript.end_time.timestamp() if transcript.end_time else None
+
+            for chunk_content in text_chunks:
+                # Plain tuples: skips pydantic validation on the bulk path
+                transcript_chunks.append(
+                    (transcript.id, chunk_content, start_ts, end_ts) # Transcript start/end timestamps
+                )
+            chunks_to_add.extend(transcript_chunks)
+            chunked_ids.append(transcript.id)
+
+        except Exception as e:
+            logger.error(
+                f"Unexpected error processing transcript {transcript.id}: {e}",
+                exc_info=True
+            )
+            # Potentially mark transcript as failed? For now, skip.
+            continue # Continue to next transcript in batch
+
+        if len(chunks_to_add) >= CHUNK_BATCH_SIZE:
+            crud.add_chunks_and_mark_chunked(db_conn, chunks_to_add, chunked_ids)
+            stats["chunks"] += len(chunks_to_add)
+            stats["transcripts"] += len(chunked_ids)
+            logger.info(f"Flushed {len(chunks_to_add)} chunks for {len(chunked_ids)} transcripts.")
+            chunks_to_add = []
+            chunked_ids = []
+
+    # Flush whatever is left from this batch
+    if chunks_to_add or chunked_ids:
+        crud.add_chunks_and_mark_chunked(db_conn, chunks_to_add, chunked_ids)
+        stats["chunks"] += len(chunks_to_add)
+        stats["transcripts"] += len(chunked_ids)
+        logger.info(f"Flushed {len(chunks_to_add)} chunks for {len(chunked_ids)} transcripts.")
 
 def main():
-    """Main function to find unchunked transcripts and chunk them."""
+    """Main function to find unchunked transcripts and chunk them.
+
+    chunk_text is cheap string slicing, so it runs in-process: shipping
+    each transcript to a worker process costs more than the chunking.
+    While batch N is chunked and written, a fetch thread reads batch N+1,
+    so the SQLite read overlaps with the write.
+    """
     logger.info("--- Starting Transcript Chunking Script ---")
     db_conn: sqlite3.Connection | None = None
-    processed_count = 0
-    total_chunks_created = 0
-    
+    fetch_pool: ThreadPoolExecutor | None = None
+    stats = {"transcripts": 0, "chunks": 0}
+
     try:
         db_conn = get_db()
         db_conn.row_factory = sqlite3.Row # Ensure rows can be accessed by column name
+        fetch_pool = ThreadPoolExecutor(max_workers=1)
 
+        last_id = 0 # Keyset cursor: highest transcript ID written so far
+        logger.info(f"Fetching up to {TRANSCRIPT_BATCH_SIZE} transcripts needing chunking...")
+        next_fetch: Future = fetch_pool.submit(_fetch_batch, last_id)
         while True:
-            logger.info(f"Fetching up to {TRANSCRIPT_BATCH_SIZE} transcripts needing chunking...")
             try:
-                transcripts_to_process = crud.get_transcripts_needing_chunking(
-                    db_conn, limit=TRANSCRIPT_BATCH_SIZE
-                )
+                transcripts_to_process = next_fetch.result()
             except sqlite3.Error as e:
                 logger.error(f"Database error fetching transcripts: {e}", exc_info=True)
                 time.sleep(5) # Wait before retrying
+                next_fetch = fetch_pool.submit(_fetch_batch, last_id)
                 continue
 
             if not transcripts_to_process:
@@ -44,75 +131,37 @@ def main():
                 break
 
             logger.info(f"Found {len(transcripts_to_process)} transcripts to process.")
-            
-            for transcript in transcripts_to_process:
-                logger.debug(f"Processing transcript ID: {transcript.id}")
-                chunks_to_add: list[ChunkCreate] = []
-                try:
-                    # Assuming basic text chunking for now
-                    # TODO: Incorporate start/end times if available in transcript/chunking logic
-                    text_chunks = chunk_text(transcript.content)
-                    
-                    if not text_chunks:
-                         logger.warning(f"Transcript ID {transcript.id} generated no chunks. Skipping.")
-                         # Mark as chunked even if empty to avoid reprocessing
-                         crud.mark_transcript_chunked(db_conn, transcript.id)
-                         processed_count += 1
-                         continue
-
-                    for chunk_content in text_chunks:
-                        # Placeholder start/end times - needs refinement
-                        # Convert datetime to float timestamp for DB insertion
-                        start_ts = transcript.start_time.timestamp() if transcript.start_time else None
-                        end_ts = transcript.end_time.timestamp() if transcript.end_time else None
-                        
-                        chunks_to_add.append(
-                            ChunkCreate(
-                                transcript_id=transcript.id,
-                                content=chunk_content,
-                                start_time=start_ts, # Use transcript start timestamp
-                                end_time=end_ts # Use transcript end timestamp
-                            )
-                        )
-                    
-                    # Add chunks in batches (though likely small batches per transcript)
-                    if chunks_to_add:
-                        crud.add_chunks(db_conn, chunks_to_add)
-                        total_chunks_created += len(chunks_to_add)
-                        logger.debug(f"Added {len(chunks_to_add)} chunks for transcript {transcript.id}")
-                    
-                    # Mark the transcript as chunked after successful chunk processing
-                    crud.mark_transcript_chunked(db_conn, transcript.id)
-                    processed_count += 1
-                    logger.info(f"Successfully chunked transcript ID: {transcript.id}")
-
-                except sqlite3.Error as e:
-                    logger.error(f"Database error processing transcript {transcript.id}: {e}", exc_info=True)
-                    # Decide whether to retry or skip this transcript
-                    # For now, we'll log and continue to the next batch
-                    break # Break inner loop, try fetching next batch
-                except Exception as e:
-                    logger.error(
-                        f"Unexpected error processing transcript {transcript.id}: {e}", 
-                        exc_info=True
-                    )
-                    # Potentially mark transcript as failed? For now, skip.
-                    continue # Continue to next transcript in batch
-            
+            # Read the following batch while this one is chunked and written
+            logger.info(f"Fetching up to {TRANSCRIPT_BATCH_SIZE} transcripts needing chunking...")
+            next_fetch = fetch_pool.submit(_fetch_batch, transcripts_to_process[-1].id)
+            try:
+                _write_batch(db_conn, transcripts_to_process, stats)
+            except sqlite3.Error as e:
+                logger.error(f"Database error committing chunks: {e}", exc_info=True)
+                # The pending flush was rolled back; drop the prefetched
+                # batch and retry from the same cursor
+                next_fetch.cancel()
+                time.sleep(5)
+                next_fetch = fetch_pool.submit(_fetch_batch, last_id)
+                continue
+            last_id = transcripts_to_process[-1].id
+
             # Optional: Add a small delay between batches if needed
-            # time.sleep(1) 
+            # time.sleep(1)
 
     except Exception as e:
         logger.critical(f"Unhandled exception in chunking script: {e}", exc_info=True)
     finally:
+        if fetch_pool:
+            fetch_pool.shutdown(cancel_futures=True)
         if db_conn:
             db_conn.close()
             logger.info("Database connection closed.")
-            
+
     logger.info("--- Transcript Chunking Script Finished ---")
-    logger.info(f"Total transcripts processed: {processed_count}")
-    logger.info(f"Total chunks created: {total_chunks_created}")
+    logger.info(f"Total transcripts processed: {stats['transcripts']}")
+    logger.info(f"Total chunks created: {stats['chunks']}")
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
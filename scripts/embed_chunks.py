@@ -1,7 +1,9 @@
 import logging
+import queue
 import sqlite3
+import threading
 import time
-from typing import List
+from typing import Dict, List, Tuple
 
 # Import settings directly
 from transcript_engine.core.config import Settings, get_settings 
@@ -12,7 +14,7 @@ from transcript_engine.core.config import Settings, get_settings
 #     get_embedding_service,
 #     get_vector_store,
 # )
-from transcript_engine.core.dependencies import get_db # Keep get_db for connection
+from transcript_engine.core.dependencies import get_db, get_db_reader # Writer + pooled readers
 from transcript_engine.embeddings.bge_local import BGELocalEmbeddings
 from transcript_engine.vector_stores.chroma_store import ChromaStore
 
@@ -20,7 +22,7 @@ from transcript_engine.database import crud
 from transcript_engine.database.models import Chunk
 # Correct interface imports
 from transcript_engine.interfaces.embedding_interface import EmbeddingInterface
-from transcript_engine.interfaces.vector_store_interface import VectorStoreInterface
+from transcript_engine.interfaces.vector_store_interface import VectorStoreInterface, EmbeddingVector
 
 # Configure logging
 logging.basicConfig(
@@ -29,14 +31,224 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # Constants
-CHUNK_BATCH_SIZE = 100 # Process N chunks for embedding at a time
+# Each stage batches at the size that suits it: large cheap SQLite reads,
+# model-sized inference batches, and bigger vector store writes.
+FETCH_BATCH_SIZE = 2048 # Chunks read from SQLite per query
+EMBED_BATCH_SIZE = 256 # Chunks per embed_documents call
+UPSERT_BATCH_SIZE = 1024 # Chunks per vector store add / mark-embedded update
+QUEUE_MAX_BATCHES = 2 # Batches buffered between pipeline stages (backpressure)
+QUEUE_POLL_SECONDS = 0.5 # How often blocked stages re-check the stop event
+
+# Marks the end of the stream on a pipeline queue
+_SENTINEL = None
+
+def _put(q: queue.Queue, item, stop_event: threading.Event) -> bool:
+    """Puts an item on a bounded queue, giving up if the pipeline is stopping.
+
+    Returns:
+        True if the item was queued, False if the stop event was set first.
+    """
+    while not stop_event.is_set():
+        try:
+            q.put(item, timeout=QUEUE_POLL_SECONDS)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def _get(q: queue.Queue, stop_event: threading.Event):
+    """Gets an item from a queue, returning the sentinel if the pipeline is stopping."""
+    while not stop_event.is_set():
+        try:
+            return q.get(timeout=QUEUE_POLL_SECONDS)
+        except queue.Empty:
+            continue
+    return _SENTINEL
+
+def _fetch_worker(fetch_queue: queue.Queue, stop_event: threading.Event) -> None:
+    """Stage 1: reads batches of unembedded chunks from SQLite.
+
+    Uses a pooled read-only connection so its reads never commit or
+    interleave with the upsert stage's open write transaction. Pages
+    forward by chunk ID so batches still in flight in later stages are
+    not fetched a second time.
+    """
+    last_id = 0
+    try:
+        with get_db_reader() as db_conn:
+            while not stop_event.is_set():
+                logger.info(f"Fetching up to {FETCH_BATCH_SIZE} chunks needing embedding...")
+                chunks_to_process = crud.get_chunks_needing_embedding(
+                    db_conn, limit=FETCH_BATCH_SIZE, after_id=last_id
+                )
+                if not chunks_to_process:
+                    logger.info("No more chunks found needing embedding.")
+                    break
+                last_id = chunks_to_process[-1].id
+                logger.info(f"Found {len(chunks_to_process)} chunks to embed.")
+                if not _put(fetch_queue, chunks_to_process, stop_event):
+                    break
+    except Exception as e:
+        logger.error(f"Error fetching chunks needing embedding: {e}", exc_info=True)
+    finally:
+        _put(fetch_queue, _SENTINEL, stop_event)
+
+def _fan_out(
+    chunks_by_hash: Dict[bytes, List[Chunk]],
+    content_hashes: List[bytes],
+    embeddings: List[EmbeddingVector],
+) -> Tuple[List[Chunk], List[EmbeddingVector]]:
+    """Pairs each vector with every chunk sharing that text, as an upsert queue item."""
+    chunks_to_process: List[Chunk] = []
+    chunk_embeddings: List[EmbeddingVector] = []
+    for content_hash, embedding in zip(content_hashes, embeddings):
+        for chunk in chunks_by_hash[content_hash]:
+            chunks_to_process.append(chunk)
+            chunk_embeddings.append(embedding)
+    return chunks_to_process, chunk_embeddings
+
+def _embed_worker(
+    embed_service: EmbeddingInterface,
+    fetch_queue: queue.Queue,
+    upsert_queue: queue.Queue,
+    stop_event: threading.Event,
+) -> None:
+    """Stage 2: embeds each fetched batch in EMBED_BATCH_SIZE micro-batches.
+
+    Chunks are grouped by content hash first, so identical chunk texts in
+    a fetched batch go through the model once and share the vector. Texts
+    already embedded in an earlier batch or run are looked up by hash and
+    reuse their stored vector without going through the model at all.
+    """
+    try:
+        while True:
+            fetched_chunks = _get(fetch_queue, stop_event)
+            if fetched_chunks is _SENTINEL:
+                break
+
+            chunks_by_hash: Dict[bytes, List[Chunk]] = {}
+            for chunk in fetched_chunks:
+                # Chunks stored before content_hash existed have NULL hashes
+                content_hash = chunk.content_hash or crud.chunk_content_hash(chunk.content)
+                chunks_by_hash.setdefault(content_hash, []).append(chunk)
+
+            try:
+                with get_db_reader() as db_conn:
+                    known_embeddings = crud.get_embeddings_by_content_hash(db_conn, list(chunks_by_hash))
+            except Exception as e:
+                logger.warning(f"Could not look up stored embeddings; embedding the whole batch: {e}")
+                known_embeddings = {}
+            if known_embeddings:
+                logger.info(f"Reusing {len(known_embeddings)} stored embeddings.")
+                reused = _fan_out(chunks_by_hash, list(known_embeddings), list(known_embeddings.values()))
+                if not _put(upsert_queue, reused, stop_event):
+                    return
+
+            unique_hashes = [h for h in chunks_by_hash if h not in known_embeddings]
+            if len(unique_hashes) < len(fetched_chunks):
+                logger.info(f"Embedding {len(unique_hashes)} unique texts for {len(fetched_chunks)} chunks.")
+
+            for offset in range(0, len(unique_hashes), EMBED_BATCH_SIZE):
+                batch_hashes = unique_hashes[offset:offset + EMBED_BATCH_SIZE]
+                batch_chunk_content = [chunks_by_hash[h][0].content for h in batch_hashes]
+                try:
+                    logger.info("Generating embeddings...")
+                    embeddings = embed_service.embed_documents(batch_chunk_content)
+                    logger.info(f"Successfully generated {len(embeddings)} embeddings.")
+                except Exception as e:
+                    batch_chunk_ids = [chunks_by_hash[h][0].id for h in batch_hashes]
+                    logger.error(f"Error generating embeddings for chunk batch (IDs: {batch_chunk_ids[:5]}...): {e}", exc_info=True)
+                    logger.warning("Skipping current batch due to embedding error.")
+                    continue # Skip to next micro-batch
+
+                if not _put(upsert_queue, _fan_out(chunks_by_hash, batch_hashes, embeddings), stop_event):
+                    return
+    finally:
+        _put(upsert_queue, _SENTINEL, stop_event)
+
+def _to_chunks_data(chunks: List[Chunk], embeddings: List[EmbeddingVector]) -> List[Dict]:
+    """Builds the chunk dicts vector_store.add expects, keyed by the chunk's database ID."""
+    chunks_data = []
+    for chunk, embedding_vector in zip(chunks, embeddings):
+        metadata = {"transcript_id": chunk.transcript_id}
+        if chunk.start_time is not None:
+            metadata["start_time"] = chunk.start_time
+        if chunk.end_time is not None:
+            metadata["end_time"] = chunk.end_time
+        chunks_data.append({
+            "id": str(chunk.id),
+            "content": chunk.content,
+            "embedding": embedding_vector,
+            "metadata": metadata,
+        })
+    return chunks_data
+
+def _store_batch(
+    vector_store: VectorStoreInterface,
+    db_conn: sqlite3.Connection,
+    chunks_to_store: List[Chunk],
+    embeddings: List[EmbeddingVector],
+    stats: Dict[str, int],
+) -> None:
+    """Adds one upsert batch to the vector store and marks its chunks as embedded.
+
+    The is_embedded update is held open in a transaction around the vector
+    store add, so a failed add rolls the mark back and the chunks are
+    picked up again on the next run. Each chunk's vector is stored with the
+    mark so later chunks with the same text can reuse it.
+    """
+    batch_chunk_ids = [chunk.id for chunk in chunks_to_store]
+    start_time = time.monotonic()
+
+    try:
+        with crud.chunks_embedded_transaction(db_conn, batch_chunk_ids, embeddings) as updated_count:
+            logger.info(f"Adding {len(batch_chunk_ids)} chunks and embeddings to vector store...")
+            vector_store.add(_to_chunks_data(chunks_to_store, embeddings))
+        stats["added_to_vs"] += len(chunks_to_store) # Count successful additions
+        stats["processed"] += updated_count
+        logger.info(f"Successfully added {len(chunks_to_store)} chunks to vector store and marked {updated_count} as embedded.")
+    except Exception as e:
+        logger.error(f"Error storing chunk batch (Chunk IDs: {batch_chunk_ids[:5]}...): {e}. Embedded flags rolled back; these chunks will be reprocessed later.", exc_info=True)
+        return
+    
+    end_time = time.monotonic()
+    logger.info(f"Stored batch of {len(chunks_to_store)} chunks in {end_time - start_time:.2f} seconds.")
+
+def _upsert_worker(
+    vector_store: VectorStoreInterface,
+    db_conn: sqlite3.Connection,
+    upsert_queue: queue.Queue,
+    stop_event: threading.Event,
+    stats: Dict[str, int],
+) -> None:
+    """Stage 3: accumulates embedded micro-batches and stores them UPSERT_BATCH_SIZE at a time."""
+    pending_chunks: List[Chunk] = []
+    pending_embeddings: List[EmbeddingVector] = []
+    while True:
+        item = _get(upsert_queue, stop_event)
+        if item is _SENTINEL:
+            break
+        chunks_to_process, embeddings = item
+        pending_chunks.extend(chunks_to_process)
+        pending_embeddings.extend(embeddings)
+        if len(pending_chunks) >= UPSERT_BATCH_SIZE:
+            _store_batch(vector_store, db_conn, pending_chunks, pending_embeddings, stats)
+            pending_chunks, pending_embeddings = [], []
+
+    # Flush the tail, unless we are stopping because of an error/interrupt
+    if pending_chunks and not stop_event.is_set():
+        _store_batch(vector_store, db_conn, pending_chunks, pending_embeddings, stats)
 
 def main():
-    """Main function to find unembedded chunks, embed them, and add to vector store."""
+    """Main function to find unembedded chunks, embed them, and add to vector store.
+
+    Runs fetch, embed and upsert as three threads connected by bounded
+    queues, so SQLite reads, model inference and vector store writes overlap.
+    """
     logger.info("--- Starting Chunk Embedding Script ---")
     db_conn: sqlite3.Connection | None = None
-    processed_chunk_count = 0
-    total_added_to_vs = 0
+    stats = {"processed": 0, "added_to_vs": 0}
+    stop_event = threading.Event()
     
     try:
         logger.info("Initializing services...")
@@ -47,64 +259,30 @@ def main():
         db_conn = get_db()
         logger.info("Services initialized.")
 
-        while True:
-            logger.info(f"Fetching up to {CHUNK_BATCH_SIZE} chunks needing embedding...")
-            # Fetch chunks needing embedding
-            chunks_to_process = crud.get_chunks_needing_embedding(db_conn, limit=CHUNK_BATCH_SIZE)
-            
-            if not chunks_to_process:
-                logger.info("No more chunks found needing embedding.")
-                break # Exit the loop if no more chunks
-
-            logger.info(f"Found {len(chunks_to_process)} chunks to embed.")
-            batch_chunk_ids = [chunk.id for chunk in chunks_to_process]
-            batch_chunk_content = [chunk.content for chunk in chunks_to_process]
-            
-            start_time = time.monotonic()
-            
-            # 1. Get Embeddings
-            try:
-                logger.info("Generating embeddings...")
-                embeddings = embed_service.embed_documents(batch_chunk_content)
-                logger.info(f"Successfully generated {len(embeddings)} embeddings.")
-            except Exception as e:
-                # Log embedding error but potentially continue to next batch?
-                # Or maybe stop if embedding service fails critically.
-                logger.error(f"Error generating embeddings for chunk batch (IDs: {batch_chunk_ids[:5]}...): {e}", exc_info=True)
-                # Decide on error handling: break, continue, or retry?
-                logger.warning("Skipping current batch due to embedding error.")
-                continue # Skip to next batch
-
-            # 2. Add to Vector Store
-            try:
-                logger.info(f"Adding {len(batch_chunk_ids)} chunks and embeddings to vector store...")
-                # Pass chunks and embeddings as required by the interface
-                vector_store.add(
-                    chunks=chunks_to_process, 
-                    embeddings=embeddings
-                )
-                total_added_to_vs += len(chunks_to_process) # Count successful additions
-                logger.info("Successfully added chunks and embeddings to vector store.")
-
-            except Exception as e:
-                logger.error(f"Error adding chunk batch to vector store (Chunk IDs: {batch_chunk_ids[:5]}...): {e}", exc_info=True)
-                # If adding to vector store fails, we probably shouldn't mark as embedded
-                logger.warning("Skipping marking chunks as embedded due to vector store error.")
-                continue # Skip marking and go to next batch
-
-            # 3. Mark Chunks as Embedded in DB
-            try:
-                updated_count = crud.mark_chunks_embedded(db_conn, batch_chunk_ids)
-                processed_chunk_count += updated_count
-                logger.info(f"Successfully marked {updated_count} chunks as embedded in database.")
-            except sqlite3.Error as e:
-                 logger.error(f"Database error marking chunks as embedded (IDs: {batch_chunk_ids[:5]}...): {e}. These chunks might be reprocessed later.", exc_info=True)
-                 # Continue to next batch, but these chunks might be re-fetched
-            
-            end_time = time.monotonic()
-            logger.info(f"Processed batch of {len(chunks_to_process)} chunks in {end_time - start_time:.2f} seconds.")
+        fetch_queue: queue.Queue = queue.Queue(maxsize=QUEUE_MAX_BATCHES)
+        upsert_queue: queue.Queue = queue.Queue(maxsize=QUEUE_MAX_BATCHES)
+        workers = [
+            threading.Thread(
+                target=_fetch_worker, args=(fetch_queue, stop_event), name="fetch"
+            ),
+            threading.Thread(
+                target=_embed_worker, args=(embed_service, fetch_queue, upsert_queue, stop_event), name="embed"
+            ),
+            threading.Thread(
+                target=_upsert_worker, args=(vector_store, db_conn, upsert_queue, stop_event, stats), name="upsert"
+            ),
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
 
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; stopping pipeline workers.")
+        stop_event.set()
+        raise
     except Exception as e:
+        stop_event.set()
         logger.critical(f"Unhandled exception in embedding script: {e}", exc_info=True)
     finally:
         # Close the DB connection obtained via get_db if it was established
@@ -114,8 +292,8 @@ def main():
         #     db_conn.close()
         #     logger.info("Database connection closed.")
         logger.info("--- Chunk Embedding Script Finished ---")
-        logger.info(f"Total chunks successfully processed and marked as embedded: {processed_chunk_count}")
-        # logger.info(f"Total documents added/updated in vector store: {total_added_to_vs}") # Optional detail
+        logger.info(f"Total chunks successfully processed and marked as embedded: {stats['processed']}")
+        # logger.info(f"Total documents added/updated in vector store: {stats['added_to_vs']}") # Optional detail
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,24 +1,22 @@
+"""Command-line entry point for ingesting lifelogs into the database.
+
+Subcommands:
+    api          Stream lifelogs from the Limitless API client (default).
+    incremental  Fetch everything since the newest stored transcript.
+
+Heavy modules (settings, HTTP clients, CRUD) are imported inside the chosen
+subcommand, so a cron-invoked run only pays for what it uses.
+"""
+
 import asyncio
 import argparse
-import os
 import logging
-# No longer need sqlite3 here for timestamp check
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, time, timezone
+from typing import List, Optional
 from pathlib import Path # Add Path
 
-from transcript_engine.core.config import Settings, get_settings # Import get_settings
-from transcript_engine.ingest.ingest import ingest_transcripts # This seems unused now?
-from transcript_engine.database.crud import (
-    get_db,
-    create_transcript,
-    get_latest_limitless_start_time, # Likely also unused if we clear DB
-    initialize_database,
-)
-from transcript_engine.database.models import TranscriptCreate
-# Import the Client instead of the old function
-from transcript_engine.interfaces.limitless import LimitlessAPIClient, TranscriptData 
-
 logger = logging.getLogger(__name__)
 # Use a more specific logger name if desired
 # logger = logging.getLogger("ingest_script") 
@@ -33,33 +31,25 @@ RAW_SAVE_DIR = Path("./data/raw_limitless_responses")
 # Removed old backfill_transcripts function
 # Removed old ingest_recent_transcripts function
 
-async def main_async():
-    parser = argparse.ArgumentParser(description="Ingest lifelogs from Limitless API.")
-    # Keep args, but simplify logic
-    parser.add_argument(
-        "--start-date",
-        type=str,
-        help="Start date (YYYY-MM-DD) to fetch from. Fetches from this date up to now."
-    )
-    # Client uses UTC by default, timezone arg may not be needed unless API supports it differently?
-    # Let's remove it for now for simplicity, relying on UTC.
-    # parser.add_argument(
-    #     "--timezone",
-    #     type=str,
-    #     default="UTC",
-    #     help=f"IANA timezone specifier for API queries (default: UTC)."
-    # )
-
-    args = parser.parse_args()
+async def ingest_from_api(args: argparse.Namespace) -> None:
+    """Streams lifelogs from the Limitless API client into the database."""
+    from transcript_engine.core.config import get_settings
+    from transcript_engine.database.crud import get_db, initialize_database
+    from transcript_engine.ingest.pipeline import ingest_lifelog_stream
+    from transcript_engine.interfaces.limitless import LimitlessAPIClient
 
     db_conn = None
     limitless_client = None
+    # sqlite3 calls block, so they run on one dedicated thread that owns the
+    # connection; the event loop keeps fetching pages while a batch commits
+    db_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-db")
+    loop = asyncio.get_running_loop()
     try:
         # Get settings for API key and save dir
         settings = get_settings()
         
-        # Get DB connection (before client)
-        db_conn = get_db()
+        # Get DB connection (before client), opened on the DB thread
+        db_conn = await loop.run_in_executor(db_executor, get_db)
         
         # --- Initialize Database Schema --- 
         try:
@@ -78,21 +68,19 @@ async def main_async():
             return # Exit if DB init fails
         # ---------------------------------
 
-        # Ensure RAW_SAVE_DIR exists
-        RAW_SAVE_DIR.mkdir(parents=True, exist_ok=True)
-        
         # Instantiate the client
         # The client reads API key from env var LIMITLESS_API_KEY
-        # Pass the save_dir to ensure raw responses are cached
+        # Pass the save_dir to ensure raw responses are cached; the client
+        # creates RAW_SAVE_DIR once in its constructor
         limitless_client = LimitlessAPIClient(save_dir=RAW_SAVE_DIR)
         
         # Determine start_dt for the client call
         start_dt: Optional[datetime] = None
         if args.start_date:
             try:
-                # Parse start date and make it timezone aware UTC
-                start_dt_naive = datetime.strptime(args.start_date, "%Y-%m-%d")
-                start_dt = start_dt_naive.replace(tzinfo=timezone.utc)
+                # Parse start date and make it timezone aware UTC; fromisoformat
+                # skips strptime's format interpreter and locale handling
+                start_dt = datetime.combine(date.fromisoformat(args.start_date), time.min, tzinfo=timezone.utc)
                 logger.info(f"Fetching lifelogs starting from {start_dt.date()} UTC up to now.")
             except ValueError:
                  logger.error(f"Invalid format for --start-date (Use YYYY-MM-DD).")
@@ -102,39 +90,10 @@ async def main_async():
             logger.info(f"No --start-date specified. Fetching default range (likely last 24h).")
             # Pass None to client.fetch_transcripts, it handles the default
         
-        ingested_count = 0
-        
-        # Use the client's fetch_transcripts method (async generator)
-        async for transcript_data in limitless_client.fetch_transcripts(since=start_dt):
-            # transcript_data is already a TranscriptData object
-            
-            # --- Log content for debugging ---
-            if transcript_data.content is None or len(transcript_data.content.strip()) == 0:
-                 logger.warning(f"TranscriptData source_id '{transcript_data.source_id}' has None or empty content.")
-            else:
-                 logger.debug(f"TranscriptData source_id '{transcript_data.source_id}' content length: {len(transcript_data.content)}")
-            # ---------------------------------
-            
-            # We need to convert it to TranscriptCreate for the DB function
-            transcript_to_create = TranscriptCreate(
-                source=transcript_data.source,
-                source_id=transcript_data.source_id,
-                title=transcript_data.title,
-                content=transcript_data.content, 
-                start_time=transcript_data.start_time, 
-                end_time=transcript_data.end_time 
-            )
-            
-            # Attempt to insert into DB
-            try:
-                create_transcript(db_conn, transcript_to_create)
-                ingested_count += 1
-                if ingested_count % 100 == 0:
-                     logger.info(f"Ingested {ingested_count} transcripts so far...")
-            except sqlite3.IntegrityError:
-                logger.debug(f"Lifelog with source_id '{transcript_to_create.source_id}' already exists. Skipping.")
-            except Exception as e:
-                logger.error(f"Failed to create transcript record for source_id '{transcript_to_create.source_id}': {e}", exc_info=True)
+        # Batched writes run on the DB thread while pages keep streaming in
+        ingested_count = await ingest_lifelog_stream(
+            db_conn, limitless_client.fetch_transcripts(since=start_dt), db_executor
+        )
 
         logger.info(f"Finished ingestion. Added {ingested_count} new records.")
                 
@@ -144,11 +103,90 @@ async def main_async():
         # Close the HTTP client gracefully
         if limitless_client:
             await limitless_client.close()
-        # DB connection is managed elsewhere (lifespan)
+        # Close the connection on the thread that owns it
+        if db_conn:
+            await loop.run_in_executor(db_executor, db_conn.close)
+        db_executor.shutdown(wait=True)
         logger.debug("Ingest script finished.")
 
+async def ingest_incremental(args: argparse.Namespace) -> None:
+    """Fetches transcripts created since the newest one already stored."""
+    from transcript_engine.core.config import get_settings
+    from transcript_engine.database import crud
+    from transcript_engine.ingest.ingest import ingest_transcripts
+
+    settings = get_settings()
+
+    # --- WORKAROUND for pydantic-settings/docker-compose run issue ---
+    if settings.limitless_api_key is None:
+        logger.warning("Pydantic-settings failed to load LIMITLESS_API_KEY from env, attempting direct load...")
+        direct_key = os.getenv("LIMITLESS_API_KEY")
+        if direct_key:
+            # A copy: the cached Settings from get_settings() is shared process-wide
+            settings = settings.model_copy(update={"limitless_api_key": direct_key})
+            logger.info("Successfully loaded LIMITLESS_API_KEY directly via os.getenv.")
+        else:
+            logger.error("LIMITLESS_API_KEY not found via os.getenv either.")
+    # --- END WORKAROUND ---
+
+    conn = None
+    try:
+        db_url = settings.database_url
+        crud.initialize_database(Path(db_url[len("sqlite:///"):]).resolve()) # In case API startup hasn't run
+        conn = crud.get_db()
+
+        # Get timestamp of the latest transcript already in DB
+        latest_timestamp = crud.get_latest_transcript_timestamp(conn)
+        since_date: date | None = None
+        if latest_timestamp:
+            since_date = latest_timestamp.date()
+            logger.info(f"Fetching transcripts created since: {since_date}")
+        else:
+            logger.info("No existing transcripts found. Fetching all available transcripts.")
+    except Exception as e:
+        logger.critical(f"An critical error occurred during ingestion: {e}", exc_info=True)
+        return
+    finally:
+        if conn:
+            conn.close()
+            logger.info("Database connection closed.")
+
+    added_count = await ingest_transcripts(
+        settings=settings,
+        start_time_iso=since_date.isoformat() if since_date else None,
+    )
+    logger.info(f"Ingestion process finished. Added={added_count}")
+
+def build_parser() -> argparse.ArgumentParser:
+    """Builds the ingest CLI parser; ``api`` is the default subcommand."""
+    parser = argparse.ArgumentParser(description="Ingest lifelogs from Limitless API.")
+    # Kept on the top-level parser so `ingest.py --start-date ...` still works
+    parser.add_argument(
+        "--start-date",
+        type=str,
+        help="Start date (YYYY-MM-DD) to fetch from. Fetches from this date up to now. (api only)"
+    )
+    # Client uses UTC by default, timezone arg may not be needed unless API supports it differently?
+    # Let's remove it for now for simplicity, relying on UTC.
+    # parser.add_argument(
+    #     "--timezone",
+    #     type=str,
+    #     default="UTC",
+    #     help=f"IANA timezone specifier for API queries (default: UTC)."
+    # )
+    subparsers = parser.add_subparsers(dest="cmd")
+    subparsers.add_parser("api", help="Stream lifelogs from the Limitless API client (default).")
+    subparsers.add_parser("incremental", help="Fetch transcripts since the newest stored one.")
+    parser.set_defaults(cmd="api")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Parses arguments and runs the chosen ingest subcommand."""
+    args = build_parser().parse_args(argv)
+    if args.cmd == "incremental":
+        asyncio.run(ingest_incremental(args))
+    else:
+        asyncio.run(ingest_from_api(args))
+
 if __name__ == "__main__":
-    # Add import for sqlite3 if not already present
-    import sqlite3 
-    # Use the async main function
-    asyncio.run(main_async()) 
\ No newline at end of file
+    main()
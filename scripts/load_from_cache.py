@@ -4,22 +4,48 @@ Reads the latest JSON file found in the cache directory and populates the databa
 Does NOT call the Limitless API.
 """
 
-import asyncio
 import argparse
+import gc
 import logging
 import json
+import mmap
+import os
 import sqlite3
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+try:
+    # Optional: SIMD JSON parser (pysimdjson); fastest decode of a whole cache file
+    import simdjson
+except ImportError:
+    simdjson = None
+
+try:
+    # Optional: streams the cache instead of loading it whole. ijson picks
+    # its fastest available backend itself (yajl2_c when built)
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson # Installed alongside chromadb; decodes bytes directly
+except ImportError:
+    orjson = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_dt # Optional C parser
+except ImportError:
+    # Python 3.11+ fromisoformat accepts the trailing 'Z' itself
+    _parse_dt = datetime.fromisoformat
 
 # Need to adjust path if script is run from root vs. inside scripts/
 # Assuming run from root: poetry run python -m scripts.load_from_cache
 from transcript_engine.database.crud import (
+    TranscriptRow,
+    create_transcripts,
     get_db,
-    add_transcripts_batch,
 )
-from transcript_engine.database.models import TranscriptCreate
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -27,68 +53,123 @@ logger = logging.getLogger(__name__)
 
 # Directory where raw responses are saved
 CACHE_DIR = Path("./data/raw_limitless_responses")
-BATCH_SIZE = 1000 # Process 1000 transcripts at a time
+BATCH_SIZE = 10000 # Transcripts per executemany; all batches share one transaction
+# Larger cache files are decoded from a memory map rather than a read() copy
+MMAP_MIN_BYTES = 512 * 1024 * 1024
+# Parse errors that mean the cache file is corrupted (orjson's subclass JSONDecodeError)
+JSON_ERRORS = (json.JSONDecodeError,) + ((ijson.JSONError,) if ijson else ())
 
 def find_latest_cache_file(directory: Path) -> Path | None:
     """Finds the most recently modified JSON file in the directory."""
     try:
-        json_files = list(directory.glob("limitless_*.json"))
-        if not json_files:
+        # One scandir pass; DirEntry.is_file() uses the d_type from readdir,
+        # so only matching files cost a stat() call
+        with os.scandir(directory) as it:
+            candidates = [
+                (entry.stat().st_mtime, entry.path)
+                for entry in it
+                if entry.name.startswith("limitless_") and entry.name.endswith(".json") and entry.is_file()
+            ]
+        if not candidates:
             return None
-        # Sort by modification time, descending
-        latest_file = max(json_files, key=lambda p: p.stat().st_mtime)
-        return latest_file
+        # Most recently modified wins
+        return Path(max(candidates)[1])
     except FileNotFoundError:
         return None
     except Exception as e:
         logger.error(f"Error finding latest cache file in {directory}: {e}", exc_info=True)
         return None
 
-def prepare_transcripts(lifelogs: List[Dict[str, Any]]) -> tuple[List[TranscriptCreate], int]:
-    """Converts lifelogs into TranscriptCreate objects, skipping invalid ones.
-    
-    Returns: Tuple of (List[TranscriptCreate], skipped_count)
+def iter_cached_lifelogs(cache_file: Path) -> Iterator[Dict[str, Any]]:
+    """Yields the lifelogs of a cache file (a list of API page responses) one at a time.
+
+    With pysimdjson installed the memory-mapped file is parsed into a
+    compact document whose fields are only converted to Python objects
+    when a lifelog reads them. Else, with ijson, the file is stream-parsed,
+    so memory stays bounded by one lifelog rather than the whole file.
+    Otherwise the whole file is decoded at once, from bytes with orjson when
+    available (memory-mapped for files of MMAP_MIN_BYTES or more), else
+    with json.loads.
+
+    Raises:
+        ValueError: If the file is not valid JSON (pysimdjson) or does not
+            contain a list (pysimdjson, orjson and json.loads paths).
+    """
+    if simdjson is not None:
+        parser = simdjson.Parser()
+        with open(cache_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            doc = parser.parse(mm) # Copies into simdjson's padded buffer; mm can close after
+        if not isinstance(doc, simdjson.Array):
+            raise ValueError(f"Cache file {cache_file.name} does not contain a list.")
+        for page_response in doc:
+            yield from page_response.get("data", {}).get("lifelogs", ())
+        return
+
+    if ijson is not None:
+        with open(cache_file, 'rb') as f:
+            yield from ijson.items(f, 'item.data.lifelogs.item')
+        return
+
+    with open(cache_file, 'rb') as f:
+        if orjson is None:
+            raw_page_responses = json.loads(f.read())
+        elif Path(cache_file).stat().st_size >= MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                raw_page_responses = orjson.loads(view)
+        else:
+            raw_page_responses = orjson.loads(f.read())
+    if not isinstance(raw_page_responses, list):
+        raise ValueError(f"Cache file {cache_file.name} does not contain a list.")
+    for page_response in raw_page_responses:
+        yield from page_response.get("data", {}).get("lifelogs", [])
+
+def prepare_transcript(log: Dict[str, Any]) -> Optional[TranscriptRow]:
+    """Converts one cached lifelog into a raw row for crud.create_transcripts.
+
+    Plain tuples skip TranscriptCreate validation, which would otherwise
+    dominate the prepare phase of a bulk load.
+
+    Returns:
+        The row tuple, or None if the lifelog is invalid and skipped.
+    """
+    source_id = log.get("id")
+    transcript_data = log.get("markdown")
+    title = log.get("title", "Untitled Lifelog")
+    start_time_str = log.get("startTime")
+    end_time_str = log.get("endTime")
+
+    if not source_id or transcript_data is None:
+        logger.warning(f"Skipping cached lifelog due to missing ID/markdown: {log.get('id', 'N/A')}")
+        return None
+
+    try:
+        start_time_dt = _parse_dt(start_time_str) if start_time_str else None
+        end_time_dt = _parse_dt(end_time_str) if end_time_str else None
+        # Ensure start_time is present for our date query logic later
+        if start_time_dt is None:
+             logger.warning(f"Skipping cached lifelog {source_id} due to missing startTime.")
+             return None
+    except ValueError:
+         logger.warning(f"Skipping cached lifelog {source_id} due to invalid timestamp format.")
+         return None
+
+    return ("limitless", source_id, title, transcript_data, start_time_dt, end_time_dt)
+
+def iter_transcripts(lifelogs: Iterable[Dict[str, Any]], stats: Dict[str, int]) -> Iterator[TranscriptRow]:
+    """Yields a validated row tuple per lifelog, skipping invalid ones.
+
+    Counts every lifelog seen in ``stats["found"]`` and every skipped one
+    in ``stats["skipped"]``.
     """
-    transcripts_to_create: List[TranscriptCreate] = []
-    skipped_count = 0
     for log in lifelogs:
-        source_id = log.get("id")
-        transcript_data = log.get("markdown")
-        title = log.get("title", "Untitled Lifelog")
-        start_time_str = log.get("startTime")
-        end_time_str = log.get("endTime")
-
-        if not source_id or transcript_data is None:
-            logger.warning(f"Skipping cached lifelog due to missing ID/markdown: {log.get('id', 'N/A')}")
-            skipped_count += 1
+        stats["found"] += 1
+        transcript = prepare_transcript(log)
+        if transcript is None:
+            stats["skipped"] += 1
             continue
+        yield transcript
 
-        try:
-            start_time_dt = datetime.fromisoformat(start_time_str.replace('Z', '+00:00')) if start_time_str else None
-            end_time_dt = datetime.fromisoformat(end_time_str.replace('Z', '+00:00')) if end_time_str else None
-            # Ensure start_time is present for our date query logic later
-            if start_time_dt is None:
-                 logger.warning(f"Skipping cached lifelog {source_id} due to missing startTime.")
-                 skipped_count += 1
-                 continue
-        except ValueError:
-             logger.warning(f"Skipping cached lifelog {source_id} due to invalid timestamp format.")
-             skipped_count += 1
-             continue
-        
-        transcripts_to_create.append(
-             TranscriptCreate(
-                source="limitless",
-                source_id=source_id,
-                title=title,
-                content=transcript_data, 
-                start_time=start_time_dt, 
-                end_time=end_time_dt 
-            )
-        )
-    return transcripts_to_create, skipped_count
-
-async def main_async():
+def main():
     logger.info(f"--- Starting Load from Cache Script (Batch Size: {BATCH_SIZE}) ---")
     
     cache_file = find_latest_cache_file(CACHE_DIR)
@@ -99,74 +180,72 @@ async def main_async():
     logger.info(f"Processing latest cache file: {cache_file.name}")
 
     db_conn = None
-    total_lifelogs_found = 0
+    stats = {"found": 0, "skipped": 0} # Filled in by iter_transcripts
     total_prepared = 0
     total_ingested = 0 # Actual rows inserted (ignoring duplicates)
-    total_skipped_validation = 0
     total_batches_processed = 0
+    gc_was_enabled = gc.isenabled()
 
     try:
         db_conn = get_db() # Get the shared DB connection
         
-        logger.info(f"Reading and parsing cache file: {cache_file}")
-        all_lifelogs = []
-        with open(cache_file, 'r', encoding='utf-8') as f:
-            raw_page_responses = json.load(f)
-            if not isinstance(raw_page_responses, list):
-                 logger.error(f"Cache file {cache_file.name} does not contain a list. Aborting.")
-                 return
-            for page_response in raw_page_responses:
-                 page_lifelogs = page_response.get("data", {}).get("lifelogs", [])
-                 all_lifelogs.extend(page_lifelogs)
-        
-        total_lifelogs_found = len(all_lifelogs)
-        logger.info(f"Found {total_lifelogs_found} total lifelogs in cache file.")
+        logger.info(f"Streaming lifelogs from cache file: {cache_file}")
+        batch: list[TranscriptRow] = []
 
-        if not all_lifelogs:
+        def flush_batch() -> None:
+            nonlocal total_ingested, total_batches_processed
+            total_batches_processed += 1
+            logger.info(f"Processing batch {total_batches_processed} (size: {len(batch)})...")
+            # Joins the open load transaction; nothing is committed here
+            total_ingested += create_transcripts(db_conn, batch)
+            batch.clear()
+
+        # One write transaction for the whole load: a single commit (and WAL
+        # sync) instead of one per batch. Any error rolls the whole load back.
+        # The connection already runs with WAL, synchronous=NORMAL,
+        # temp_store=MEMORY and a 64 MB cache (crud.SQLITE_PRAGMAS).
+        # The load allocates millions of short-lived dicts and row tuples but
+        # creates no reference cycles; pausing the cyclic GC avoids thousands
+        # of gen-0 collections that would only re-scan the live batch
+        gc.disable()
+        with db_conn:
+            db_conn.execute("BEGIN IMMEDIATE")
+            # Parse -> validate -> insert is one streaming pipeline: lifelogs are
+            # prepared and inserted as they are parsed, so the first batch is
+            # written long before the end of a large file is reached
+            for transcript in iter_transcripts(iter_cached_lifelogs(cache_file), stats):
+                batch.append(transcript)
+                total_prepared += 1
+                if len(batch) >= BATCH_SIZE:
+                    flush_batch()
+            if batch:
+                flush_batch()
+
+        if stats["found"] == 0:
              logger.info("No lifelogs to process.")
              return
 
-        logger.info("Preparing transcript objects...")
-        transcripts_to_create, skipped_validation = prepare_transcripts(all_lifelogs)
-        total_skipped_validation = skipped_validation
-        total_prepared = len(transcripts_to_create)
-        logger.info(f"Prepared {total_prepared} valid transcripts for insertion. Skipped {total_skipped_validation} due to validation errors.")
-
-        if not transcripts_to_create:
-            logger.info("No valid transcripts prepared for database insertion.")
-            return
-
-        logger.info("Starting batch insertion into database...")
-        for i in range(0, total_prepared, BATCH_SIZE):
-            batch = transcripts_to_create[i : i + BATCH_SIZE]
-            batch_num = (i // BATCH_SIZE) + 1
-            logger.info(f"Processing batch {batch_num}/{((total_prepared - 1) // BATCH_SIZE) + 1} (size: {len(batch)})...")
-            try:
-                inserted_count = add_transcripts_batch(db_conn, batch)
-                total_ingested += inserted_count
-                total_batches_processed += 1
-            except sqlite3.Error as e:
-                # Log error but continue to next batch if possible, 
-                # as some rows in the failed batch might have been duplicates anyway if using INSERT OR IGNORE
-                logger.error(f"Database error processing batch {batch_num}: {e}", exc_info=True)
-                # Depending on error, might want to stop entirely
-                # For now, we log and continue
-        
         logger.info(f"--- Load from Cache Summary ---")
         logger.info(f"Processed file: {cache_file.name}")
-        logger.info(f"Total lifelogs found: {total_lifelogs_found}")
-        logger.info(f"Skipped during validation: {total_skipped_validation}")
+        logger.info(f"Total lifelogs found: {stats['found']}")
+        logger.info(f"Skipped during validation: {stats['skipped']}")
         logger.info(f"Prepared for insertion: {total_prepared}")
         logger.info(f"Batches processed: {total_batches_processed}")
-        logger.info(f"Rows actually inserted/affected (using INSERT OR IGNORE): {total_ingested}")
+        logger.info(f"Rows actually inserted (existing source_ids skipped): {total_ingested}")
 
     except FileNotFoundError:
         logger.error(f"Cache file {cache_file} not found during processing.")
-    except json.JSONDecodeError:
+    except sqlite3.Error as e:
+        logger.error(f"Database error while loading {cache_file.name}; the load was rolled back: {e}", exc_info=True)
+    except JSON_ERRORS: # Before ValueError, which JSONDecodeError subclasses
         logger.error(f"Error decoding JSON from cache file {cache_file}. Is it corrupted?")
+    except ValueError as e:
+        logger.error(f"{e} Aborting.")
     except Exception as e:
         logger.critical(f"An unexpected error occurred during the cache loading process: {e}", exc_info=True)
     finally:
+        if gc_was_enabled:
+            gc.enable()
         logger.info("Cache loading script finished.")
 
 if __name__ == "__main__":
@@ -195,4 +274,4 @@ if __name__ == "__main__":
         logger.critical(f"Failed to initialize database schema before loading: {init_e}", exc_info=True)
         exit(1) # Stop if DB can't be initialized
 
-    asyncio.run(main_async()) 
\ No newline at end of file
+    main() 
\ No newline at end of file
@@ -2,10 +2,13 @@
 """
 
 import logging
+import queue
 import sqlite3
 import sys
 import os
-from typing import List
+import threading
+from operator import attrgetter
+from typing import List, Optional, Tuple
 
 # Ensure the main package is in the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -17,7 +20,7 @@ from transcript_engine.database import crud
 from transcript_engine.ingest.chunker import chunk_transcript
 from transcript_engine.embeddings.bge_local import BGELocalEmbeddings
 from transcript_engine.vector_stores.chroma_store import ChromaStore
-from transcript_engine.database.models import Transcript, Chunk
+from transcript_engine.database.models import Transcript, Chunk, ChunkCreate
 from transcript_engine.interfaces.embedding_interface import EmbeddingInterface
 from transcript_engine.interfaces.vector_store_interface import VectorStoreInterface
 
@@ -35,64 +38,69 @@ logger = logging.getLogger(__name__)
 # --- Configuration --- (Consider moving defaults to Settings)
 CHUNK_BATCH_SIZE = 10  # Process N transcripts for chunking at a time
 EMBED_BATCH_SIZE = 100 # Process N chunks for embedding at a time
+EMBED_QUEUE_MAX_BATCHES = 4 # Committed chunk batches the chunker may run ahead of the embedder
 # -------------------
 
-def main():
-    """Main function to run the transcript processing pipeline.
+_content_and_id = attrgetter("content", "id")
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    """Opens a connection for one pipeline thread (sqlite3 connections are per-thread).
+
+    Each thread keeps its connection for the whole run. WAL (via the shared
+    PRAGMA set) lets the embedder read while the chunker commits.
+    """
+    conn = crud.configure_connection(
+        sqlite3.connect(db_path, cached_statements=crud.SQLITE_CACHED_STATEMENTS)
+    )
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _run_chunking(db_path: str, chunks_ready: "queue.Queue[Optional[int]]") -> int:
+    """Producer: chunks transcripts batch by batch and signals each commit.
+
+    Every committed batch puts a token on ``chunks_ready`` so the embedding
+    consumer can start on it while the next batch is chunked. A ``None``
+    token is always sent last, also when chunking fails.
+
+    Returns:
+        The number of transcripts chunked.
     """
-    logger.info("Starting transcript processing pipeline (Chunking & Embedding)...")
-    settings = get_settings()
-    
     conn = None
+    processed_transcript_count = 0
+    last_id = 0 # Keyset cursor: highest transcript ID fetched so far
     try:
-        # --- Database Connection ---
-        db_path_relative = settings.database_url.split("///")[-1]
-        db_path_absolute = os.path.join(project_root, db_path_relative)
-        os.makedirs(os.path.dirname(db_path_absolute), exist_ok=True)
-        conn = sqlite3.connect(db_path_absolute)
-        conn.row_factory = sqlite3.Row
-        logger.info(f"Connected to database: {db_path_absolute}")
-        # -------------------------
-        
-        # --- Initialize Services ---
-        embedding_service: EmbeddingInterface = BGELocalEmbeddings(settings)
-        
-        # --- DEBUG: Inspect settings attributes before ChromaStore init ---
-        logger.info(f"DEBUG: Attributes available on settings object: {dir(settings)}")
-        # ----------------------------------------------------------------
-        
-        vector_store: VectorStoreInterface = ChromaStore(settings)
-        # -------------------------
-        
-        # === Chunking Step ===
+        conn = _connect(db_path)
         logger.info("--- Starting Chunking Step ---")
-        processed_transcript_count = 0
         while True:
             logger.info(f"Fetching up to {CHUNK_BATCH_SIZE} transcripts needing chunking...")
             transcripts_to_chunk: List[Transcript] = crud.get_transcripts_needing_chunking(
-                conn, limit=CHUNK_BATCH_SIZE
+                conn, limit=CHUNK_BATCH_SIZE, after_id=last_id
             )
             
             if not transcripts_to_chunk:
                 logger.info("No more transcripts found needing chunking.")
                 break # Exit chunking loop
+            last_id = transcripts_to_chunk[-1].id
             
             logger.info(f"Processing {len(transcripts_to_chunk)} transcripts for chunking.")
+            # Chunks for the whole batch are accumulated and written together
+            # with the is_chunked flags in one transaction (one commit per batch)
+            batch_chunks: List[ChunkCreate] = []
+            chunked_ids: List[int] = []
             for transcript in transcripts_to_chunk:
                 try:
-                    logger.debug(f"Chunking transcript ID: {transcript.id}")
+                    logger.debug("Chunking transcript ID: %s", transcript.id)
                     # TODO: Pass chunk size/overlap from settings if configurable
                     chunks_to_create = chunk_transcript(transcript)
                     
                     if chunks_to_create:
-                        logger.debug(f"Adding {len(chunks_to_create)} chunks for transcript ID: {transcript.id}")
-                        crud.add_chunks(conn, chunks_to_create)
+                        logger.debug("Adding %d chunks for transcript ID: %s", len(chunks_to_create), transcript.id)
+                        batch_chunks.extend(chunks_to_create)
                     else:
                         logger.warning(f"No chunks created for transcript ID: {transcript.id}. Marking as chunked anyway.")
                         
                     # Mark transcript as chunked even if no chunks were made (e.g., empty content)
-                    crud.mark_transcript_chunked(conn, transcript.id)
-                    processed_transcript_count += 1
+                    chunked_ids.append(transcript.id)
                     
                 except Exception as e:
                     logger.error(
@@ -101,85 +109,199 @@ def main():
                     )
                     # Optionally: Add logic to mark transcript as failed_chunking
                     continue # Move to next transcript in batch
+
+            try:
+                crud.add_chunks_and_mark_chunked(conn, batch_chunks, chunked_ids)
+                processed_transcript_count += len(chunked_ids)
+            except sqlite3.Error as e:
+                logger.error(f"Error committing chunks for batch (transcript IDs {chunked_ids}): {e}", exc_info=True)
+                # The batch was rolled back; stop rather than refetch the same transcripts forever
+                break
+            if batch_chunks:
+                # Blocks while the embedder is EMBED_QUEUE_MAX_BATCHES batches behind
+                chunks_ready.put(len(batch_chunks))
             
         logger.info(f"--- Finished Chunking Step. Processed {processed_transcript_count} transcripts. ---")
+    except Exception as e:
+        logger.critical(f"A critical error occurred during the chunking step: {e}", exc_info=True)
+    finally:
+        chunks_ready.put(None) # Always tell the embedder no more chunks are coming
+        if conn:
+            conn.close()
+    return processed_transcript_count
+
+def _embed_pending_chunks(
+    conn: sqlite3.Connection,
+    embedding_service: EmbeddingInterface,
+    vector_store: VectorStoreInterface,
+    after_id: int,
+) -> Tuple[int, bool, int]:
+    """Embeds chunks in EMBED_BATCH_SIZE batches until none are pending.
+
+    Args:
+        conn: The embedding thread's database connection.
+        embedding_service: Service used to embed chunk texts.
+        vector_store: Store the embedded chunks are added to.
+        after_id: Keyset cursor; only chunks with a greater ID are fetched.
+
+    Returns:
+        The number of chunks embedded, whether an error halted embedding,
+        and the updated keyset cursor.
+    """
+    processed_chunk_count = 0
+    while True:
+        logger.info(f"Fetching up to {EMBED_BATCH_SIZE} chunks needing embedding...")
+        chunks_to_embed: List[Chunk] = crud.get_chunks_needing_embedding(
+            conn, limit=EMBED_BATCH_SIZE, after_id=after_id
+        )
         
-        # === Embedding Step ===
-        logger.info("--- Starting Embedding Step ---")
-        processed_chunk_count = 0
-        while True:
-            logger.info(f"Fetching up to {EMBED_BATCH_SIZE} chunks needing embedding...")
-            chunks_to_embed: List[Chunk] = crud.get_chunks_needing_embedding(
-                conn, limit=EMBED_BATCH_SIZE
-            )
+        if not chunks_to_embed:
+            logger.info("No chunks currently pending embedding.")
+            return processed_chunk_count, False, after_id
+        after_id = chunks_to_embed[-1].id
             
-            if not chunks_to_embed:
-                logger.info("No more chunks found needing embedding.")
-                break # Exit embedding loop
-                
-            logger.info(f"Processing {len(chunks_to_embed)} chunks for embedding.")
-            chunk_texts = [chunk.content for chunk in chunks_to_embed]
-            chunk_ids = [chunk.id for chunk in chunks_to_embed]
+        logger.info(f"Processing {len(chunks_to_embed)} chunks for embedding.")
+        # One C-level pass for both columns (chunks_to_embed is non-empty here)
+        chunk_texts, chunk_ids = map(list, zip(*map(_content_and_id, chunks_to_embed)))
+        
+        try:
+            # Generate embeddings
+            logger.debug(f"Generating embeddings for {len(chunk_texts)} chunk texts...")
+            embeddings = embedding_service.embed_documents(chunk_texts)
+            logger.debug(f"Embeddings generated. Shape: ({len(embeddings)}, {len(embeddings[0]) if embeddings else 0})")
             
-            try:
-                # Generate embeddings
-                logger.debug(f"Generating embeddings for {len(chunk_texts)} chunk texts...")
-                embeddings = embedding_service.embed_documents(chunk_texts)
-                logger.debug(f"Embeddings generated. Shape: ({len(embeddings)}, {len(embeddings[0]) if embeddings else 0})")
-                
-                # --- Prepare structured data for ChromaStore.add --- 
-                structured_chunks_to_add = []
-                if len(chunks_to_embed) == len(embeddings):
-                    for chunk, embedding_vector in zip(chunks_to_embed, embeddings):
-                        metadata = {"transcript_id": chunk.transcript_id}
-                        # Add other metadata from chunk if needed (start_time, etc.)
-                        if chunk.start_time is not None:
-                            metadata["start_time"] = chunk.start_time
-                        if chunk.end_time is not None:
-                            metadata["end_time"] = chunk.end_time
-                            
-                        chunk_data = {
-                            "content": chunk.content,
-                            "embedding": embedding_vector,
-                            "metadata": metadata,
-                        }
-                        structured_chunks_to_add.append(chunk_data)
-                else:
-                    logger.error(f"Mismatch between chunks ({len(chunks_to_embed)}) and embeddings ({len(embeddings)}) in batch starting with chunk ID {chunk_ids[0]}. Skipping batch.")
-                    continue # Skip to next batch
-                # ----------------------------------------------------
-
-                # Add to vector store using the new structured format
-                logger.debug(f"Adding {len(structured_chunks_to_add)} structured chunks to vector store...")
-                vector_store.add(structured_chunks_to_add) # Pass the list of dicts
-                logger.debug(f"Chunks added to vector store.")
-                
-                # Mark chunks as embedded in DB
-                logger.debug(f"Marking {len(chunk_ids)} chunks as embedded in database...")
-                updated_count = crud.mark_chunks_embedded(conn, chunk_ids)
-                logger.debug(f"Marked {updated_count} chunks as embedded.")
-                
-                processed_chunk_count += len(chunks_to_embed)
+            # --- Prepare structured data for ChromaStore.add --- 
+            structured_chunks_to_add = []
+            if len(chunks_to_embed) == len(embeddings):
+                for chunk, embedding_vector in zip(chunks_to_embed, embeddings):
+                    metadata = {"transcript_id": chunk.transcript_id}
+                    # Add other metadata from chunk if needed (start_time, etc.)
+                    if chunk.start_time is not None:
+                        metadata["start_time"] = chunk.start_time
+                    if chunk.end_time is not None:
+                        metadata["end_time"] = chunk.end_time
+                        
+                    chunk_data = {
+                        "content": chunk.content,
+                        "embedding": embedding_vector,
+                        "metadata": metadata,
+                    }
+                    structured_chunks_to_add.append(chunk_data)
+            else:
+                logger.error(f"Mismatch between chunks ({len(chunks_to_embed)}) and embeddings ({len(embeddings)}) in batch starting with chunk ID {chunk_ids[0]}. Skipping batch.")
+                continue # Skip to next batch
+            # ----------------------------------------------------
+
+            # Add to vector store using the new structured format
+            logger.debug(f"Adding {len(structured_chunks_to_add)} structured chunks to vector store...")
+            vector_store.add(structured_chunks_to_add) # Pass the list of dicts
+            logger.debug(f"Chunks added to vector store.")
+            
+            # Mark chunks as embedded in DB
+            logger.debug(f"Marking {len(chunk_ids)} chunks as embedded in database...")
+            updated_count = crud.mark_chunks_embedded(conn, chunk_ids)
+            logger.debug(f"Marked {updated_count} chunks as embedded.")
             
-            except Exception as e:
-                logger.error(
-                    f"Error processing batch of chunks (IDs starting {chunk_ids[0]}...) during embedding step: {e}", 
-                    exc_info=True
+            processed_chunk_count += len(chunks_to_embed)
+        
+        except Exception as e:
+            logger.error(
+                f"Error processing batch of chunks (IDs starting {chunk_ids[0]}...) during embedding step: {e}", 
+                exc_info=True
+            )
+            # Depending on severity, might break or continue with next batch
+            # For now, we log and halt embedding to avoid potential cascading failures
+            logger.critical("Halting embedding step due to error.")
+            return processed_chunk_count, True, after_id
+
+def _run_embedding(
+    db_path: str,
+    embedding_service: EmbeddingInterface,
+    vector_store: VectorStoreInterface,
+    chunks_ready: "queue.Queue[Optional[int]]",
+) -> int:
+    """Consumer: embeds pending chunks whenever the chunker commits a batch.
+
+    The database is the hand-off: each token on ``chunks_ready`` only means
+    "new chunks were committed", and the pending chunks are then read back
+    with ``crud.get_chunks_needing_embedding``. Chunks left over from earlier
+    runs are embedded first; after the final ``None`` token one last pass
+    picks up whatever remains.
+
+    Returns:
+        The number of chunks embedded.
+    """
+    conn = None
+    processed_chunk_count = 0
+    last_id = 0 # Keyset cursor: highest chunk ID fetched so far
+    halted = False
+    chunking_done = False
+    try:
+        conn = _connect(db_path)
+        logger.info("--- Starting Embedding Step ---")
+        while True:
+            if not halted:
+                embedded_count, halted, last_id = _embed_pending_chunks(
+                    conn, embedding_service, vector_store, last_id
                 )
-                # Depending on severity, might break or continue with next batch
-                # For now, we log and break the loop to avoid potential cascading failures
-                logger.critical("Halting embedding step due to error.")
-                break 
-                
+                processed_chunk_count += embedded_count
+            if chunking_done:
+                break
+            chunking_done = chunks_ready.get() is None
         logger.info(f"--- Finished Embedding Step. Processed {processed_chunk_count} chunks. ---")
+    finally:
+        # Keep consuming tokens so the chunker never blocks on a full queue
+        while not chunking_done:
+            chunking_done = chunks_ready.get() is None
+        if conn:
+            conn.close()
+    return processed_chunk_count
+
+def main():
+    """Main function to run the transcript processing pipeline.
+
+    Chunking and embedding run concurrently: a producer thread chunks
+    transcripts while the main thread embeds the chunks already committed,
+    so the embedding model is not idle during chunking. A bounded queue of
+    batch tokens keeps the chunker at most EMBED_QUEUE_MAX_BATCHES batches
+    ahead. Each thread uses its own SQLite connection.
+    """
+    logger.info("Starting transcript processing pipeline (Chunking & Embedding)...")
+    settings = get_settings()
+    
+    chunking_thread = None
+    try:
+        # --- Database Path ---
+        db_path_relative = settings.database_url.split("///")[-1]
+        db_path_absolute = os.path.join(project_root, db_path_relative)
+        os.makedirs(os.path.dirname(db_path_absolute), exist_ok=True)
+        logger.info(f"Using database: {db_path_absolute}")
+        # -------------------------
+        
+        # --- Initialize Services ---
+        embedding_service: EmbeddingInterface = BGELocalEmbeddings(settings)
+        
+        # --- DEBUG: Inspect settings attributes before ChromaStore init ---
+        logger.info(f"DEBUG: Attributes available on settings object: {dir(settings)}")
+        # ----------------------------------------------------------------
+        
+        vector_store: VectorStoreInterface = ChromaStore(settings)
+        # -------------------------
+        
+        chunks_ready: "queue.Queue[Optional[int]]" = queue.Queue(maxsize=EMBED_QUEUE_MAX_BATCHES)
+        chunking_thread = threading.Thread(
+            target=_run_chunking, args=(db_path_absolute, chunks_ready), name="chunker"
+        )
+        chunking_thread.start()
+        _run_embedding(db_path_absolute, embedding_service, vector_store, chunks_ready)
         logger.info("Transcript processing pipeline finished.")
 
     except Exception as e:
         logger.critical(f"A critical error occurred during the processing pipeline: {e}", exc_info=True)
     finally:
-        if conn:
-            conn.close()
-            logger.info("Database connection closed.")
+        if chunking_thread:
+            chunking_thread.join()
+            logger.info("Database connections closed.")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""Shared fixtures for the whole test suite."""
+
+import pytest
+
+from transcript_engine.core.config import get_settings
+
+
+@pytest.fixture(autouse=True)
+def clear_settings_cache():
+    """Gives every test freshly loaded settings.
+
+    get_settings is cached for the lifetime of the process, so a test that
+    changes the environment or UI overrides would otherwise leak into later tests.
+    """
+    get_settings.cache_clear()
+    yield
+    get_settings.cache_clear()
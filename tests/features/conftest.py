@@ -0,0 +1,48 @@
+"""Shared fixtures for the feature tests."""
+
+from typing import Any, Dict, List, Optional
+
+import pytest
+
+from transcript_engine.core.config import Settings
+from transcript_engine.features.actionables_service import clear_scan_cache
+
+
+class FakeLLM:
+    """Minimal stand-in for an LLMInterface implementation.
+
+    Set ``response`` to the text ``generate`` should return, or ``error`` to
+    an exception it should raise. Each call's arguments are recorded in
+    ``calls``. Much cheaper to build per test than ``MagicMock(spec=...)``.
+    """
+
+    def __init__(self) -> None:
+        self.response: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self.calls: List[Dict[str, Any]] = []
+
+    def generate(self, prompt: str, model: str | None = None, **kwargs: Any) -> Optional[str]:
+        self.calls.append({"prompt": prompt, "model": model, **kwargs})
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+@pytest.fixture(scope="session")
+def base_settings() -> Settings:
+    """Settings loaded once per session; tests take a ``model_copy`` to modify."""
+    return Settings()
+
+
+@pytest.fixture
+def fake_llm() -> FakeLLM:
+    """A fresh FakeLLM per test."""
+    return FakeLLM()
+
+
+@pytest.fixture(autouse=True)
+def empty_scan_cache():
+    """Keeps cached scan results from leaking between tests."""
+    clear_scan_cache()
+    yield
+    clear_scan_cache()
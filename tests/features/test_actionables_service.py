@@ -5,30 +5,29 @@ from unittest.mock import MagicMock, patch
 from datetime import date
 import json
 
-from transcript_engine.features.actionables_service import scan_transcript_for_actionables, extract_structured_data_for_item
+from transcript_engine.features.actionables_service import (
+    _get_openai_client,
+    extract_structured_data_batch,
+    extract_structured_data_for_item,
+    scan_transcript_for_actionables,
+)
 from transcript_engine.features.actionables_models import CandidateActionableItem
-from transcript_engine.interfaces.llm_interface import LLMInterface
-from transcript_engine.core.config import Settings
 from openai import OpenAI
 
-@pytest.fixture
-def mock_llm_service():
-    """Fixture for a mocked LLMInterface."""
-    return MagicMock(spec=LLMInterface)
-
 @pytest.fixture
 def mock_openai_client():
     with patch('transcript_engine.features.actionables_service.OpenAI') as mock_client_constructor:
         mock_instance = MagicMock(spec=OpenAI)
         mock_client_constructor.return_value = mock_instance
+        _get_openai_client.cache_clear() # Build the client from the patched constructor
         yield mock_instance
+    _get_openai_client.cache_clear() # Don't leak the mock into later tests
 
 @pytest.fixture
-def mock_settings_openai(monkeypatch):
-    settings = Settings() # Load actual settings to modify
-    settings.OPENAI_API_KEY = "fake_api_key"
-    settings.OPENAI_CHAT_MODEL_NAME = "gpt-test"
-    
+def mock_settings_openai(monkeypatch, base_settings):
+    # Copy instead of re-reading the environment for every test
+    settings = base_settings.model_copy(update={"OPENAI_API_KEY": "fake_api_key", "OPENAI_CHAT_MODEL_NAME": "gpt-test"})
+
     # Use monkeypatch to replace get_settings in the service module
     monkeypatch.setattr('transcript_engine.features.actionables_service.get_settings', lambda: settings)
     return settings
@@ -54,32 +53,29 @@ class MockChatCompletion:
     def __init__(self, choices):
         self.choices = choices
 
-def test_scan_transcript_for_actionables_success_single_item(mock_llm_service):
-    transcript_segment = "User A: Remind me to call John tomorrow. User B: Okay."
-    target_d = date(2023, 10, 27)
-    timeframe_k = "morning"
-    
-    llm_response = """
+def _mk_tool_response(function_name, arguments):
+    """Builds a completion with a single tool call; dict arguments are JSON-encoded."""
+    arguments_json_string = arguments if isinstance(arguments, str) else json.dumps(arguments)
+    return MockChatCompletion(choices=[MockChoice(message=MockMessage(
+        tool_calls=[MockToolCall(function_name, arguments_json_string)]
+    ))])
+
+def _candidate(snippet, category, entities=None):
+    return CandidateActionableItem(snippet=snippet, suggested_category=category, raw_entities=entities)
+
+# (LLM response, expected candidates) for the line-format and JSON scan parsers
+SCAN_CASES = [
+    pytest.param(
+        """
 - Snippet: Remind me to call John tomorrow.
   Category: REMINDER
   Entities: John, tomorrow
-"""
-    mock_llm_service.generate.return_value = llm_response
-
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-
-    assert len(result) == 1
-    assert result[0].snippet == "Remind me to call John tomorrow."
-    assert result[0].suggested_category == "REMINDER"
-    assert result[0].raw_entities == "john, tomorrow"
-    mock_llm_service.generate.assert_called_once()
-
-def test_scan_transcript_for_actionables_success_multiple_items(mock_llm_service):
-    transcript_segment = "Lots of discussion here."
-    target_d = date(2023, 10, 27)
-    timeframe_k = "afternoon"
-
-    llm_response = """
+""",
+        [_candidate("Remind me to call John tomorrow.", "REMINDER", "john, tomorrow")],
+        id="single_item",
+    ),
+    pytest.param(
+        """
 - Snippet: We need to schedule a meeting for next Monday.
   Category: EVENT
   Entities: next Monday
@@ -89,97 +85,39 @@ def test_scan_transcript_for_actionables_success_multiple_items(mock_llm_service
 - Snippet: Don't forget the dry cleaning.
   Category: REMINDER
   Entities: dry cleaning
-"""
-    mock_llm_service.generate.return_value = llm_response
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-
-    assert len(result) == 3
-    assert result[0].snippet == "We need to schedule a meeting for next Monday."
-    assert result[0].suggested_category == "EVENT"
-    assert result[0].raw_entities == "next monday"
-    assert result[1].snippet == "Add 'buy milk' to the shopping list."
-    assert result[1].suggested_category == "TASK"
-    assert result[1].raw_entities == "buy milk"
-    assert result[2].snippet == "Don't forget the dry cleaning."
-    assert result[2].suggested_category == "REMINDER"
-    assert result[2].raw_entities == "dry cleaning"
-
-def test_scan_transcript_for_actionables_no_items_found_explicit(mock_llm_service):
-    transcript_segment = "A quiet day."
-    target_d = date(2023, 10, 27)
-    timeframe_k = "evening"
-    mock_llm_service.generate.return_value = "No actionable items found."
-
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-    assert len(result) == 0
-
-def test_scan_transcript_for_actionables_no_items_found_implicit(mock_llm_service):
-    transcript_segment = "More quietness."
-    target_d = date(2023, 10, 27)
-    timeframe_k = "morning"
-    mock_llm_service.generate.return_value = "Well, I looked and there is nothing here."
+""",
+        [
+            _candidate("We need to schedule a meeting for next Monday.", "EVENT", "next monday"),
+            _candidate("Add 'buy milk' to the shopping list.", "TASK", "buy milk"),
+            _candidate("Don't forget the dry cleaning.", "REMINDER", "dry cleaning"),
+        ],
+        id="multiple_items",
+    ),
+    pytest.param("No actionable items found.", [], id="no_items_found_explicit"),
     # Relies on the parsing failing to find structured items, and final check
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-    assert len(result) == 0
-
-def test_scan_transcript_for_actionables_empty_transcript_segment(mock_llm_service):
-    result = scan_transcript_for_actionables("", mock_llm_service, date(2023,1,1), "morning")
-    assert len(result) == 0
-    mock_llm_service.generate.assert_not_called()
-
-    result_space = scan_transcript_for_actionables("   ", mock_llm_service, date(2023,1,1), "morning")
-    assert len(result_space) == 0
-    mock_llm_service.generate.assert_not_called()
-
-def test_scan_transcript_for_actionables_llm_error(mock_llm_service):
-    transcript_segment = "This will cause an error."
-    target_d = date(2023, 10, 27)
-    timeframe_k = "afternoon"
-    mock_llm_service.generate.side_effect = Exception("LLM unavailable")
-
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-    assert len(result) == 0
-
-def test_scan_transcript_for_actionables_malformed_category(mock_llm_service):
-    transcript_segment = "Test malformed category."
-    target_d = date(2023, 10, 27)
-    timeframe_k = "morning"
-    llm_response = """
+    pytest.param("Well, I looked and there is nothing here.", [], id="no_items_found_implicit"),
+    pytest.param(
+        """
 - Snippet: This is a task.
   Category: TAAASK
   Entities: something
 - Snippet: This is an event.
   Category: EVENT
   Entities: an event
-"""
-    mock_llm_service.generate.return_value = llm_response
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-    
-    assert len(result) == 1 # Only the valid EVENT item should be parsed
-    assert result[0].suggested_category == "EVENT"
-    assert result[0].snippet == "This is an event."
-
-def test_scan_transcript_for_actionables_missing_entities(mock_llm_service):
-    transcript_segment = "Test missing entities."
-    target_d = date(2023, 10, 27)
-    timeframe_k = "evening"
-    llm_response = """
+""",
+        [_candidate("This is an event.", "EVENT", "an event")], # Only the valid EVENT item should be parsed
+        id="malformed_category",
+    ),
+    pytest.param(
+        """
 - Snippet: Remind me about the thing.
   Category: REMINDER
-"""
-    mock_llm_service.generate.return_value = llm_response
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-
-    assert len(result) == 1
-    assert result[0].snippet == "Remind me about the thing."
-    assert result[0].suggested_category == "REMINDER"
-    assert result[0].raw_entities is None
-
-def test_scan_transcript_for_actionables_multiline_snippet_and_entities(mock_llm_service):
-    transcript_segment = "Complex discussion."
-    target_d = date(2023, 10, 28)
-    timeframe_k = "morning"
-    llm_response = """
+""",
+        [_candidate("Remind me about the thing.", "REMINDER")],
+        id="missing_entities",
+    ),
+    pytest.param(
+        """
 - Snippet: Let's plan the project kickoff.
   It should be next week.
   Category: EVENT
@@ -191,24 +129,15 @@ def test_scan_transcript_for_actionables_multiline_snippet_and_entities(mock_llm
   Category: TASK
   Entities: finish report
   prepare slides
-"""
-    mock_llm_service.generate.return_value = llm_response
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-
-    assert len(result) == 2
-    assert result[0].snippet == "Let's plan the project kickoff.\nIt should be next week."
-    assert result[0].suggested_category == "EVENT"
-    assert result[0].raw_entities == "project kickoff\nnext week"
-    
-    assert result[1].snippet == "My main task for today is:\nFinish the report.\nAnd also prepare slides."
-    assert result[1].suggested_category == "TASK"
-    assert result[1].raw_entities == "finish report\nprepare slides"
-
-def test_scan_transcript_for_actionables_extra_whitespace_robustness(mock_llm_service):
-    transcript_segment = "Test extra whitespace."
-    target_d = date(2023,10,27)
-    timeframe_k = "afternoon"
-    llm_response = """
+""",
+        [
+            _candidate("Let's plan the project kickoff.\nIt should be next week.", "EVENT", "project kickoff\nnext week"),
+            _candidate("My main task for today is:\nFinish the report.\nAnd also prepare slides.", "TASK", "finish report\nprepare slides"),
+        ],
+        id="multiline_snippet_and_entities",
+    ),
+    pytest.param(
+        """
     -   Snippet:   Call Mom for her birthday.   
       Category:  REMINDER  
        Entities:   Mom, birthday   
@@ -217,39 +146,107 @@ def test_scan_transcript_for_actionables_extra_whitespace_robustness(mock_llm_se
   Category:EVENT
   Entities: Team outing
 
-"""
-    mock_llm_service.generate.return_value = llm_response
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-
-    assert len(result) == 2
-    assert result[0].snippet == "Call Mom for her birthday."
-    assert result[0].suggested_category == "REMINDER"
-    assert result[0].raw_entities == "mom, birthday"
-
-    assert result[1].snippet == "Plan the team outing."
-    assert result[1].suggested_category == "EVENT"
-    assert result[1].raw_entities == "team outing"
-
-def test_scan_transcript_for_actionables_item_without_category(mock_llm_service):
-    transcript_segment = "Testing item without category."
-    target_d = date(2023, 10, 27)
-    timeframe_k = "morning"
-    llm_response = """
+""",
+        [
+            _candidate("Call Mom for her birthday.", "REMINDER", "mom, birthday"),
+            _candidate("Plan the team outing.", "EVENT", "team outing"),
+        ],
+        id="extra_whitespace_robustness",
+    ),
+    pytest.param(
+        """
 - Snippet: This is a test snippet.
   Entities: test entity
 - Snippet: This is another test snippet with category.
   Category: TASK
   Entities: another test entity
+""",
+        [_candidate("This is another test snippet with category.", "TASK", "another test entity")], # Should only parse the item with a category
+        id="item_without_category",
+    ),
+    pytest.param(
+        json.dumps({"items": [
+            {"snippet": "call mom", "suggested_category": "task"},
+            {"snippet": "team lunch", "suggested_category": " Event "},
+        ]}),
+        [_candidate("call mom", "TASK"), _candidate("team lunch", "EVENT")],
+        id="json_category_case_and_padding",
+    ),
+]
+
+@pytest.mark.parametrize("llm_response, expected_items", SCAN_CASES)
+def test_scan_transcript_for_actionables_cases(fake_llm, llm_response, expected_items):
+    fake_llm.response = llm_response
+
+    result = scan_transcript_for_actionables("Some transcript segment.", fake_llm, date(2023, 10, 27), "morning")
+
+    assert result == expected_items
+    assert len(fake_llm.calls) == 1
+
+def test_scan_transcript_for_actionables_json_response(fake_llm):
+    transcript_segment = "User A: Book the dentist for Friday. User B: And pay the rent."
+    target_d = date(2023, 10, 27)
+    timeframe_k = "morning"
+
+    fake_llm.response = json.dumps({"items": [
+        {"snippet": "Book the dentist for Friday.", "suggested_category": "EVENT", "raw_entities": "Dentist, Friday"},
+        {"snippet": "Pay the rent.", "suggested_category": "TAAASK", "raw_entities": None},
+        {"snippet": "And pay the rent.", "suggested_category": "TASK", "raw_entities": None},
+    ]})
+
+    result = scan_transcript_for_actionables(transcript_segment, fake_llm, target_d, timeframe_k)
+
+    assert len(result) == 2 # The item with an invalid category is dropped
+    assert result[0].snippet == "Book the dentist for Friday."
+    assert result[0].suggested_category == "EVENT"
+    assert result[0].raw_entities == "dentist, friday"
+    assert result[1].snippet == "And pay the rent."
+    assert result[1].suggested_category == "TASK"
+    assert result[1].raw_entities is None
+    assert fake_llm.calls[-1]["format"] == "json"
+
+def test_scan_transcript_for_actionables_empty_transcript_segment(fake_llm):
+    result = scan_transcript_for_actionables("", fake_llm, date(2023,1,1), "morning")
+    assert len(result) == 0
+    assert not fake_llm.calls
+
+    result_space = scan_transcript_for_actionables("   ", fake_llm, date(2023,1,1), "morning")
+    assert len(result_space) == 0
+    assert not fake_llm.calls
+
+def test_scan_transcript_for_actionables_llm_error(fake_llm):
+    transcript_segment = "This will cause an error."
+    target_d = date(2023, 10, 27)
+    timeframe_k = "afternoon"
+    fake_llm.error = Exception("LLM unavailable")
+
+    result = scan_transcript_for_actionables(transcript_segment, fake_llm, target_d, timeframe_k)
+    assert len(result) == 0
+
+def test_scan_transcript_for_actionables_cached(fake_llm):
+    transcript_segment = "User A: Remind me to call John tomorrow."
+    target_d = date(2023, 10, 27)
+    fake_llm.error = Exception("LLM unavailable")
+    assert scan_transcript_for_actionables(transcript_segment, fake_llm, target_d, "morning") == []
+
+    # The failure was not cached: the next scan asks the LLM again
+    fake_llm.error = None
+    fake_llm.response = """
+- Snippet: Remind me to call John tomorrow.
+  Category: REMINDER
+  Entities: John, tomorrow
 """
-    mock_llm_service.generate.return_value = llm_response
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
+    first = scan_transcript_for_actionables(transcript_segment, fake_llm, target_d, "morning")
+    second = scan_transcript_for_actionables(transcript_segment, fake_llm, target_d, "morning")
+    assert len(first) == 1
+    assert second == first
+    assert len(fake_llm.calls) == 2
 
-    assert len(result) == 1 # Should only parse the item with a category
-    assert result[0].snippet == "This is another test snippet with category."
-    assert result[0].suggested_category == "TASK"
-    assert result[0].raw_entities == "another test entity"
+    # A different timeframe is a different cache entry
+    scan_transcript_for_actionables(transcript_segment, fake_llm, target_d, "evening")
+    assert len(fake_llm.calls) == 3
 
-def test_scan_transcript_for_actionables_item_block_with_only_snippet(mock_llm_service):
+def test_scan_transcript_for_actionables_item_block_with_only_snippet(fake_llm):
     transcript_segment = "Testing item block with only snippet."
     target_d = date(2023, 10, 27)
     timeframe_k = "evening"
@@ -259,12 +256,8 @@ def test_scan_transcript_for_actionables_item_block_with_only_snippet(mock_llm_s
   Category: EVENT
   Entities: Marketing team, Meeting
 """
-    mock_llm_service.generate.return_value = llm_response
-    result = scan_transcript_for_actionables(transcript_segment, mock_llm_service, target_d, timeframe_k)
-    assert len(result) == 1
-    assert result[0].snippet == "Setup meeting with Marketing."
-    assert result[0].suggested_category == "EVENT"
-
+    fake_llm.response = llm_response
+    result = scan_transcript_for_actionables(transcript_segment, fake_llm, target_d, timeframe_k)
     assert len(result) == 1
     assert result[0].snippet == "Setup meeting with Marketing."
     assert result[0].suggested_category == "EVENT"
@@ -281,11 +274,7 @@ def test_extract_structured_data_event_success(mock_openai_client, mock_settings
         "location": "The Coffee Shop",
         "description": "Discuss the project"
     }
-    mock_response = MockChatCompletion(
-        choices=[MockChoice(message=MockMessage(
-            tool_calls=[MockToolCall(function_name=expected_function_name, arguments_json_string=json.dumps(mock_args))]
-        ))]
-    )
+    mock_response = _mk_tool_response(expected_function_name, mock_args)
     mock_openai_client.chat.completions.create.return_value = mock_response
 
     result = extract_structured_data_for_item(item_snippet, item_category, target_d)
@@ -308,11 +297,7 @@ def test_extract_structured_data_task_success(mock_openai_client, mock_settings_
         "due_date": "2024-07-19", # Friday
         "notes": "Report due by Friday. Also send email update."
     }
-    mock_response = MockChatCompletion(
-        choices=[MockChoice(message=MockMessage(
-            tool_calls=[MockToolCall(function_name=expected_function_name, arguments_json_string=json.dumps(mock_args))]
-        ))]
-    )
+    mock_response = _mk_tool_response(expected_function_name, mock_args)
     mock_openai_client.chat.completions.create.return_value = mock_response
 
     result = extract_structured_data_for_item(item_snippet, item_category, target_d)
@@ -322,15 +307,63 @@ def test_extract_structured_data_task_success(mock_openai_client, mock_settings_
     assert result["due_date"] == "2024-07-19"
     assert result["notes"] == "Report due by Friday. Also send email update."
 
-def test_extract_structured_data_no_api_key(monkeypatch):
-    settings_no_key = Settings()
-    settings_no_key.OPENAI_API_KEY = None
+def test_extract_structured_data_batch_single_request(mock_openai_client, mock_settings_openai):
+    items = [
+        ("Lunch with Sam on Friday at noon", "EVENT"),
+        ("", "TASK"), # Empty snippet: never sent
+        ("Renew passport", "TASK"),
+        ("Water the plants", "REMINDER"),
+    ]
+    mock_response = MockChatCompletion(
+        choices=[MockChoice(message=MockMessage(tool_calls=[
+            MockToolCall("create_google_event", json.dumps({"title": "Lunch with Sam", "start_datetime": "2024-07-19T12:00:00"})),
+            MockToolCall("create_google_task", json.dumps({"title": "Renew passport"})),
+            MockToolCall("create_google_reminder", "not valid json"),
+        ]))]
+    )
+    mock_openai_client.chat.completions.create.return_value = mock_response
+
+    results = extract_structured_data_batch(items, date(2024, 7, 15))
+
+    assert len(results) == 4
+    assert results[0]["title"] == "Lunch with Sam"
+    assert results[1] is None
+    assert results[2]["title"] == "Renew passport"
+    assert results[3] is None
+    mock_openai_client.chat.completions.create.assert_called_once()
+    call_kwargs = mock_openai_client.chat.completions.create.call_args.kwargs
+    assert call_kwargs["parallel_tool_calls"] is True
+    assert [tool["function"]["name"] for tool in call_kwargs["tools"]] == [
+        "create_google_event", "create_google_task", "create_google_reminder"
+    ]
+
+def test_extract_structured_data_batch_call_count_mismatch_falls_back(mock_openai_client, mock_settings_openai):
+    items = [("Buy milk", "TASK"), ("Call the bank", "TASK")]
+    # The batch skips the first item, so its only call would match the wrong item
+    mock_openai_client.chat.completions.create.side_effect = [
+        _mk_tool_response("create_google_task", {"title": "Call the bank"}),
+        _mk_tool_response("create_google_task", {"title": "Buy milk"}),
+        _mk_tool_response("create_google_task", {"title": "Call the bank"}),
+    ]
+
+    results = extract_structured_data_batch(items, date(2024, 7, 15))
+
+    assert [result["title"] for result in results] == ["Buy milk", "Call the bank"]
+    assert mock_openai_client.chat.completions.create.call_count == 3
+
+def test_extract_structured_data_no_api_key(monkeypatch, base_settings):
+    settings_no_key = base_settings.model_copy(update={"OPENAI_API_KEY": None})
     monkeypatch.setattr('transcript_engine.features.actionables_service.get_settings', lambda: settings_no_key)
     
     result = extract_structured_data_for_item("test snippet", "EVENT", date.today())
     assert result is None
 
-def test_extract_structured_data_invalid_category(mock_settings_openai):
+def test_extract_structured_data_invalid_category(monkeypatch):
+    # Rejected before settings are read or a client is built
+    def fail(*args, **kwargs):
+        raise AssertionError("invalid category must not reach settings or OpenAI")
+    monkeypatch.setattr('transcript_engine.features.actionables_service.get_settings', fail)
+    monkeypatch.setattr('transcript_engine.features.actionables_service._get_openai_client', fail)
     result = extract_structured_data_for_item("test snippet", "INVALID_CATEGORY", date.today())
     assert result is None
 
@@ -347,21 +380,14 @@ def test_extract_structured_data_no_tool_call_returned(mock_openai_client, mock_
 
 def test_extract_structured_data_wrong_function_name(mock_openai_client, mock_settings_openai):
     mock_args = {"title": "Test"}
-    mock_response = MockChatCompletion(
-        choices=[MockChoice(message=MockMessage(
-            tool_calls=[MockToolCall(function_name="wrong_function", arguments_json_string=json.dumps(mock_args))]
-        ))]
-    )
+    mock_response = _mk_tool_response("wrong_function", mock_args)
     mock_openai_client.chat.completions.create.return_value = mock_response
     result = extract_structured_data_for_item("test snippet", "REMINDER", date.today())
     assert result is None
 
 def test_extract_structured_data_json_decode_error(mock_openai_client, mock_settings_openai):
     expected_function_name = "create_google_task"
-    mock_response = MockChatCompletion(
-        choices=[MockChoice(message=MockMessage(
-            tool_calls=[MockToolCall(function_name=expected_function_name, arguments_json_string="not valid json")]))]
-    )
+    mock_response = _mk_tool_response(expected_function_name, "not valid json")
     mock_openai_client.chat.completions.create.return_value = mock_response
     result = extract_structured_data_for_item("test snippet", "TASK", date.today())
     assert result is None
@@ -370,10 +396,7 @@ def test_extract_structured_data_pydantic_validation_error(mock_openai_client, m
     expected_function_name = "create_google_event"
     # Missing required 'title' field for GoogleCalendarEventSchema
     mock_args = {"start_datetime": "2024-07-16T09:00:00"} 
-    mock_response = MockChatCompletion(
-        choices=[MockChoice(message=MockMessage(
-            tool_calls=[MockToolCall(function_name=expected_function_name, arguments_json_string=json.dumps(mock_args))]))]
-    )
+    mock_response = _mk_tool_response(expected_function_name, mock_args)
     mock_openai_client.chat.completions.create.return_value = mock_response
     result = extract_structured_data_for_item("test snippet", "EVENT", date.today())
     assert result is None 
\ No newline at end of file
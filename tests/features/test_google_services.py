@@ -7,7 +7,12 @@ from datetime import datetime
 from google.oauth2.credentials import Credentials
 from googleapiclient.errors import HttpError
 
-from transcript_engine.features.google_services import add_to_google_calendar, add_to_google_tasks
+from transcript_engine.features.google_services import (
+    add_to_google_calendar,
+    add_to_google_tasks,
+    clear_service_cache,
+    GOOGLE_API_NUM_RETRIES,
+)
 from transcript_engine.features.actionables_models import GoogleCalendarEventSchema, GoogleTaskSchema
 
 @pytest.fixture
@@ -18,8 +23,10 @@ def mock_google_credentials():
 @pytest.fixture
 def mock_google_build_service():
     """Fixture to mock googleapiclient.discovery.build."""
+    clear_service_cache() # Services built with the real build() must not be reused
     with patch('transcript_engine.features.google_services.build') as mock_build:
         yield mock_build
+    clear_service_cache()
 
 # --- Tests for add_to_google_calendar ---
 def test_add_to_google_calendar_success(mock_google_credentials, mock_google_build_service):
@@ -82,6 +89,22 @@ def test_add_to_google_calendar_minimal_data(mock_google_credentials, mock_googl
     }
     mock_events_resource.insert.assert_called_once_with(calendarId='primary', body=expected_body)
 
+def test_add_to_google_calendar_reuses_built_service(mock_google_credentials, mock_google_build_service):
+    mock_google_credentials.token = "access-token-1"
+    event_details = GoogleCalendarEventSchema(title="Repeat Event", start_datetime="2024-08-01T14:00:00Z")
+
+    add_to_google_calendar(mock_google_credentials, event_details)
+    # Credentials are reloaded per request; the same access token reuses the service
+    reloaded_credentials = MagicMock(spec=Credentials)
+    reloaded_credentials.token = "access-token-1"
+    add_to_google_calendar(reloaded_credentials, event_details)
+    mock_google_build_service.assert_called_once_with('calendar', 'v3', credentials=mock_google_credentials)
+
+    # A refreshed token builds a new one
+    reloaded_credentials.token = "access-token-2"
+    add_to_google_calendar(reloaded_credentials, event_details)
+    assert mock_google_build_service.call_count == 2
+
 def test_add_to_google_calendar_http_error(mock_google_credentials, mock_google_build_service):
     event_details = GoogleCalendarEventSchema(title="Error Event", start_datetime="2024-01-01T00:00:00Z")
     mock_service_instance = MagicMock()
@@ -96,7 +119,6 @@ def test_add_to_google_calendar_http_error(mock_google_credentials, mock_google_
     result = add_to_google_calendar(mock_google_credentials, event_details)
     assert result is None
 
-# --- Tests for add_to_google_tasks ---
 def test_add_to_google_tasks_success(mock_google_credentials, mock_google_build_service):
     task_details = GoogleTaskSchema(
         title="Test Task",
@@ -152,13 +174,28 @@ def test_add_to_google_tasks_due_date_already_datetime_str(mock_google_credentia
     mock_service_instance.tasks().insert.assert_called_once_with(tasklist='@default', body=expected_body)
 
 def test_add_to_google_tasks_http_error(mock_google_credentials, mock_google_build_service):
+    task_details = GoogleTaskSchema(title="Error Task")
+    mock_service_instance = MagicMock()
+    mock_google_build_service.return_value = mock_service_instance
+    mock_resp = MagicMock()
+    mock_resp.status = 404
+    mock_resp.reason = "Not Found"
+    mock_service_instance.tasks().insert().execute.side_effect = HttpError(resp=mock_resp, content=b'error content')
+
+    result = add_to_google_tasks(mock_google_credentials, task_details)
+    assert result is None
+
+def test_add_to_google_tasks_server_error_raises(mock_google_credentials, mock_google_build_service):
     task_details = GoogleTaskSchema(title="Error Task")
     mock_service_instance = MagicMock()
     mock_google_build_service.return_value = mock_service_instance
     mock_resp = MagicMock()
     mock_resp.status = 500
     mock_resp.reason = "Server Error"
-    mock_service_instance.tasks().insert().execute.side_effect = HttpError(resp=mock_resp, content=b'server error content')
+    mock_execute = mock_service_instance.tasks().insert().execute
+    mock_execute.side_effect = HttpError(resp=mock_resp, content=b'server error content')
 
-    result = add_to_google_tasks(mock_google_credentials, task_details)
-    assert result is None 
\ No newline at end of file
+    # Transient errors are retried by the client, then surface to the caller
+    with pytest.raises(HttpError):
+        add_to_google_tasks(mock_google_credentials, task_details)
+    mock_execute.assert_called_once_with(num_retries=GOOGLE_API_NUM_RETRIES) 
\ No newline at end of file
@@ -0,0 +1,70 @@
+"""Unit tests for the shared lifelog ingest path."""
+
+import asyncio
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import pytest
+
+from transcript_engine.database.schema import ALL_INDEXES, ALL_TABLES
+from transcript_engine.ingest.pipeline import ingest_lifelog_stream
+from transcript_engine.interfaces.limitless import TranscriptData
+
+@pytest.fixture
+def db():
+    """In-memory database with the app schema."""
+    conn = sqlite3.connect(":memory:")
+    for sql in ALL_TABLES + ALL_INDEXES:
+        conn.execute(sql)
+    yield conn
+    conn.close()
+
+def _lifelog(n: int) -> TranscriptData:
+    return TranscriptData(
+        source="limitless",
+        source_id=f"log-{n}",
+        title=None,
+        content=f"content {n}",
+        start_time=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        end_time=None,
+    )
+
+def test_ingest_lifelog_stream_commits_queued_rows_before_producer_error(db):
+    async def failing_stream():
+        for n in range(5):
+            yield _lifelog(n)
+        raise RuntimeError("fetch failed")
+
+    async def ingest_and_count():
+        with pytest.raises(RuntimeError, match="fetch failed"):
+            await ingest_lifelog_stream(db, failing_stream())
+        # Checked inside the loop: no later scheduling may finish the writer
+        return db.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    assert asyncio.run(ingest_and_count()) == 5
+
+def test_ingest_lifelog_stream_raises_when_a_batch_fails(db, monkeypatch):
+    def locked(conn, rows):
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr("transcript_engine.ingest.pipeline.create_transcripts", locked)
+
+    with pytest.raises(sqlite3.OperationalError, match="database is locked"):
+        asyncio.run(ingest_lifelog_stream(db, [_lifelog(n) for n in range(5)]))
+
+def test_ingest_lifelog_stream_failed_writer_does_not_block_a_full_queue(db, monkeypatch):
+    def slow_locked(conn, rows):
+        time.sleep(0.2) # The producer refills the queue meanwhile
+        raise sqlite3.OperationalError("database is locked")
+    monkeypatch.setattr("transcript_engine.ingest.pipeline.create_transcripts", slow_locked)
+    monkeypatch.setattr("transcript_engine.ingest.pipeline.WRITE_QUEUE_MAX_SIZE", 2)
+
+    async def slow_stream():
+        for n in range(50):
+            await asyncio.sleep(0)
+            yield _lifelog(n)
+
+    with ThreadPoolExecutor(max_workers=1) as db_executor:
+        with pytest.raises(sqlite3.OperationalError):
+            asyncio.run(asyncio.wait_for(ingest_lifelog_stream(db, slow_stream(), db_executor), timeout=5))
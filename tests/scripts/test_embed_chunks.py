@@ -0,0 +1,106 @@
+"""Unit tests for the chunk embedding script's store stage."""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+import scripts.embed_chunks as embed_chunks
+from scripts.embed_chunks import _embed_worker, _store_batch
+from transcript_engine.database import crud
+from transcript_engine.database.schema import ALL_INDEXES, ALL_TABLES
+
+class FakeVectorStore:
+    """Records what is added, with the same add() signature as ChromaStore."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.added: List[Dict[str, Any]] = []
+
+    def add(self, chunks_data: List[Dict[str, Any]]) -> None:
+        if self.fail:
+            raise RuntimeError("vector store unavailable")
+        self.added.extend(chunks_data)
+
+@pytest.fixture
+def db():
+    """In-memory database with the app schema and two unembedded chunks."""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    for sql in ALL_TABLES + ALL_INDEXES:
+        conn.execute(sql)
+    crud.create_transcripts(conn, [("test", "t1", None, "content", datetime(2024, 1, 1, tzinfo=timezone.utc), None)])
+    crud.add_chunks(conn, [(1, "first chunk", 0, 30), (1, "second chunk", 30, None)])
+    yield conn
+    conn.close()
+
+def _embedded_flags(conn):
+    return [row[0] for row in conn.execute("SELECT is_embedded FROM chunks ORDER BY id")]
+
+class FakeEmbeddings:
+    """Returns a fixed vector per text and records what it was asked to embed."""
+
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(texts)
+        return [[float(len(text)), 0.5] for text in texts]
+
+def test_store_batch_adds_chunk_dicts_and_marks_embedded(db):
+    chunks = crud.get_chunks_needing_embedding(db)
+    vector_store = FakeVectorStore()
+    stats = {"processed": 0, "added_to_vs": 0}
+
+    _store_batch(vector_store, db, chunks, [[0.5, 0.25], [0.75, 1.0]], stats)
+
+    assert vector_store.added == [
+        {"id": str(chunks[0].id), "content": "first chunk", "embedding": [0.5, 0.25],
+         "metadata": {"transcript_id": 1, "start_time": 0, "end_time": 30}},
+        {"id": str(chunks[1].id), "content": "second chunk", "embedding": [0.75, 1.0],
+         "metadata": {"transcript_id": 1, "start_time": 30}},
+    ]
+    assert stats == {"processed": 2, "added_to_vs": 2}
+    assert _embedded_flags(db) == [1, 1]
+    # Vectors are stored for reuse by later chunks with the same text
+    assert crud.get_embeddings_by_content_hash(db, [crud.chunk_content_hash("second chunk")]) == {
+        crud.chunk_content_hash("second chunk"): [0.75, 1.0]
+    }
+
+def test_embed_worker_reuses_stored_embeddings(db, monkeypatch):
+    chunks = crud.get_chunks_needing_embedding(db)
+    _store_batch(FakeVectorStore(), db, chunks[:1], [[0.5, 0.25]], {"processed": 0, "added_to_vs": 0})
+    # A later run sees the same text again
+    crud.add_chunks(db, [(1, "first chunk", 60, None)])
+
+    @contextmanager
+    def reader():
+        yield db
+    monkeypatch.setattr(embed_chunks, "get_db_reader", reader)
+
+    fetch_queue, upsert_queue = queue.Queue(), queue.Queue()
+    fetch_queue.put(crud.get_chunks_needing_embedding(db))
+    fetch_queue.put(None)
+    embed_service = FakeEmbeddings()
+
+    _embed_worker(embed_service, fetch_queue, upsert_queue, threading.Event())
+
+    reused_chunks, reused_embeddings = upsert_queue.get_nowait()
+    assert [chunk.content for chunk in reused_chunks] == ["first chunk"]
+    assert reused_embeddings == [[0.5, 0.25]]
+    embedded_chunks, _ = upsert_queue.get_nowait()
+    assert [chunk.content for chunk in embedded_chunks] == ["second chunk"]
+    assert embed_service.calls == [["second chunk"]]
+
+def test_store_batch_failed_add_leaves_chunks_unembedded(db):
+    chunks = crud.get_chunks_needing_embedding(db)
+    stats = {"processed": 0, "added_to_vs": 0}
+
+    _store_batch(FakeVectorStore(fail=True), db, chunks, [[0.1, 0.2], [0.3, 0.4]], stats)
+
+    assert stats == {"processed": 0, "added_to_vs": 0}
+    assert _embedded_flags(db) == [0, 0]
@@ -57,4 +57,13 @@ def test_settings_defaults():
     assert settings.environment == "development" # Default value
     assert settings.debug is False # Default value
     assert settings.database_url == "sqlite:///./data/transcript_engine.db" # Default
-    # Check other defaults... 
\ No newline at end of file
+    # Check other defaults... 
+
+
+def test_get_settings_is_cached():
+    """Test that get_settings returns the same cached instance until cleared."""
+    first = get_settings()
+    assert get_settings() is first
+
+    get_settings.cache_clear()
+    assert get_settings() is not first
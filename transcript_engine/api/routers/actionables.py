@@ -1,5 +1,6 @@
 """API Router for Actionable Items feature."""
 
+import asyncio
 import sqlite3
 import logging
 from datetime import date
@@ -11,12 +12,17 @@ from pydantic import BaseModel, validator, Field
 from enum import Enum
 
 from transcript_engine.features.actionables_utils import get_transcript_for_timeframe
-from transcript_engine.features.actionables_service import scan_transcript_for_actionables
+from transcript_engine.features.actionables_service import (
+    extract_structured_data_batch,
+    scan_transcript_for_actionables,
+)
 from transcript_engine.features.actionables_models import CandidateActionableItem, GoogleCalendarEventSchema, GoogleTaskSchema
 from transcript_engine.interfaces.llm_interface import LLMInterface
+from transcript_engine.core.config import Settings, get_settings
 from transcript_engine.core.dependencies import get_db, get_llm_service
 from transcript_engine.api.routers.auth_google import get_google_credentials
 from google.oauth2.credentials import Credentials
+from googleapiclient.errors import HttpError
 from transcript_engine.features import google_services
 import json
 
@@ -184,42 +190,63 @@ async def extract_structured_actionables_endpoint(
     """Backend endpoint to take confirmed items and extract structured data using a cloud LLM."""
     logger.info(f"Received request to extract structured data for {len(request_payload.confirmed_items)} items.")
     
-    processed_items_response: List[ExtractedItemDetail] = []
-
-    for item_payload in request_payload.confirmed_items:
-        logger.debug(f"Processing item for structured extraction: Category '{item_payload.final_category}', Snippet '{item_payload.user_snippet[:50]}...'")
-        try:
-            # Ensure target_date is passed to the service function
-            structured_details = await run_in_threadpool(
-                extract_structured_data_for_item, 
-                item_snippet=item_payload.user_snippet, 
-                item_category=item_payload.final_category,
-                target_date=item_payload.target_date
+    confirmed_items = request_payload.confirmed_items
+    # Items sharing a target date go to the cloud LLM in one batched request
+    positions_by_date: Dict[date, List[int]] = {}
+    for position, item_payload in enumerate(confirmed_items):
+        positions_by_date.setdefault(item_payload.target_date, []).append(position)
+
+    # The per-date requests are network-bound; run them concurrently so the
+    # total latency is the slowest request, not the sum of all of them
+    batch_outcomes = await asyncio.gather(
+        *(
+            run_in_threadpool(
+                extract_structured_data_batch,
+                items=[(confirmed_items[p].user_snippet, confirmed_items[p].final_category) for p in positions],
+                target_date=target_date # Ensure target_date is passed to the service function
             )
-            
-            if structured_details:
-                processed_items_response.append(ExtractedItemDetail(
-                    type=item_payload.final_category,
-                    details=structured_details,
-                    user_snippet=item_payload.user_snippet
-                ))
-                logger.info(f"Successfully extracted structured data for item: {item_payload.user_snippet[:30]}...")
-            else:
-                logger.warning(f"Failed to extract structured data for item (snippet: '{item_payload.user_snippet[:50]}...', category: {item_payload.final_category}). Service returned None.")
-                processed_items_response.append(ExtractedItemDetail(
-                    type=item_payload.final_category,
-                    user_snippet=item_payload.user_snippet,
-                    details=None, # Explicitly None
-                    error_message=f"Could not extract structured details. OpenAI API key might be missing or extraction failed."
-                ))
+            for target_date, positions in positions_by_date.items()
+        ),
+        return_exceptions=True, # One failed date must not discard the others
+    )
+
+    structured_by_position: Dict[int, Optional[Dict[str, Any]]] = {}
+    errors_by_position: Dict[int, str] = {}
+    for (target_date, positions), batch_outcome in zip(positions_by_date.items(), batch_outcomes):
+        if isinstance(batch_outcome, Exception):
+            logger.error(
+                f"Unexpected error during structured extraction for {len(positions)} items dated {target_date}: {batch_outcome}",
+                exc_info=batch_outcome,
+            )
+            for p in positions:
+                errors_by_position[p] = f"An unexpected server error occurred during extraction: {str(batch_outcome)[:100]}"
+        else:
+            structured_by_position.update(zip(positions, batch_outcome))
 
-        except Exception as e:
-            logger.error(f"Unexpected error during structured extraction for item '{item_payload.user_snippet[:50]}...': {e}", exc_info=True)
+    processed_items_response: List[ExtractedItemDetail] = []
+    for position, item_payload in enumerate(confirmed_items):
+        structured_details = structured_by_position.get(position)
+        if position in errors_by_position:
             processed_items_response.append(ExtractedItemDetail(
                 type=item_payload.final_category,
                 user_snippet=item_payload.user_snippet,
                 details=None,
-                error_message=f"An unexpected server error occurred during extraction: {str(e)[:100]}"
+                error_message=errors_by_position[position]
+            ))
+        elif structured_details:
+            processed_items_response.append(ExtractedItemDetail(
+                type=item_payload.final_category,
+                details=structured_details,
+                user_snippet=item_payload.user_snippet
+            ))
+            logger.info(f"Successfully extracted structured data for item: {item_payload.user_snippet[:30]}...")
+        else:
+            logger.warning(f"Failed to extract structured data for item (snippet: '{item_payload.user_snippet[:50]}...', category: {item_payload.final_category}). Service returned None.")
+            processed_items_response.append(ExtractedItemDetail(
+                type=item_payload.final_category,
+                user_snippet=item_payload.user_snippet,
+                details=None, # Explicitly None
+                error_message=f"Could not extract structured details. OpenAI API key might be missing or extraction failed."
             ))
             
     logger.info(f"Finished structured data extraction. Processed {len(request_payload.confirmed_items)} items resulting in {len(processed_items_response)} output items.")
@@ -6,6 +6,7 @@ with support for persistent UI overrides via a JSON file.
 
 import logging
 import json
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -46,6 +47,8 @@ def _save_ui_overrides(overrides: Dict[str, Any]):
         with open(UI_SETTINGS_PATH, 'w') as f:
             json.dump(overrides, f, indent=2)
         logger.debug(f"Saved UI overrides to {UI_SETTINGS_PATH}: {overrides}")
+        # Drop the cached settings so the new overrides are picked up on next access
+        get_settings.cache_clear()
     except IOError as e:
         logger.error(f"Error writing UI settings file {UI_SETTINGS_PATH}: {e}", exc_info=True)
 # -----------------------------
@@ -82,6 +85,8 @@ class Settings(BaseSettings):
     
     # Embedding settings
     embedding_model: str = Field(default="BAAI/bge-small-en-v1.5", description="Name or path of the Sentence Transformer model for embeddings.")
+    embedding_backend: str = Field(default="torch", description="Embedding runtime on CPU-only machines: 'torch', 'torch-int8' (dynamically quantized torch), 'onnx', or 'onnx-int8' (ONNX Runtime, dynamically quantized). GPUs always use torch with FP16 weights.")
+    embedding_onnx_dir: str = Field(default="./data/onnx", description="Directory where exported ONNX embedding models are cached.")
     
     # --- Feature: Actionable Items Timeframes ---
     TIMEFRAME_BOUNDARIES: Dict[str, tuple[int, int]] = Field(
@@ -217,11 +222,13 @@ def set_ui_context_target_tokens(value: int | None):
     elif value is not None: # Log invalid input but don't save
         logger.warning(f"Attempted to set invalid Context Target Tokens override: {value}")
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Get application settings, applying persisted UI overrides.
     
     Loads base settings from environment/.env, then applies overrides
-    found in data/ui_settings.json.
+    found in data/ui_settings.json. The result is cached for the lifetime
+    of the process; saving UI overrides clears the cache.
     
     Returns:
         Settings: The application settings instance with overrides applied.
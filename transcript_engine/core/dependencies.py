@@ -4,17 +4,23 @@ This module defines FastAPI dependencies used throughout the application.
 """
 
 from fastapi import Depends, Request
-from typing import Generator
+from typing import Generator, Iterator
+import queue
 import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 import logging # Import logging
-from functools import lru_cache
 
 from fastapi.templating import Jinja2Templates
 from markdown_it import MarkdownIt # Import Markdown library
 
 from transcript_engine.core.config import Settings, get_settings
-from transcript_engine.database.crud import initialize_database
+from transcript_engine.database.crud import (
+    SQLITE_CACHED_STATEMENTS,
+    configure_connection,
+    initialize_database,
+)
 from transcript_engine.embeddings.bge_local import BGELocalEmbeddings
 from transcript_engine.vector_stores.chroma_store import ChromaStore
 from transcript_engine.llms.ollama_client import OllamaClient
@@ -42,11 +48,8 @@ _limitless_client: LimitlessInterface | None = None # Singleton instance
 
 # --- Basic Configurations & Templates ---
 
-# Remove LRU cache as it prevents settings updates from being picked up reliably
-# The underlying pydantic-settings loader is generally efficient enough.
-# @lru_cache()
-# def get_cached_settings() -> Settings:
-#     return get_settings()
+# get_settings() is cached in core.config; the cache is cleared whenever UI
+# overrides are saved, so settings updates are still picked up.
 
 # --- Markdown Filter --- 
 def markdown_filter(text):
@@ -96,8 +99,9 @@ def get_db() -> sqlite3.Connection:
         logger.warning(f"Database connection was None in get_db. Attempting fallback connection to {db_path}.")
         db_path.parent.mkdir(parents=True, exist_ok=True)
         try:
-            _db_connection = sqlite3.connect(str(db_path), check_same_thread=False)
+            _db_connection = sqlite3.connect(str(db_path), check_same_thread=False, cached_statements=SQLITE_CACHED_STATEMENTS)
             _db_connection.row_factory = sqlite3.Row
+            configure_connection(_db_connection)
             logger.info(f"Fallback DB connection established by get_db.")
         except Exception as e:
             logger.critical(f"Failed to establish fallback DB connection in get_db: {e}", exc_info=True)
@@ -113,8 +117,9 @@ def get_db() -> sqlite3.Connection:
          db_url = settings.database_url
          db_path_str = db_url[len("sqlite:///"):]
          db_path = Path(db_path_str).resolve()
-         _db_connection = sqlite3.connect(str(db_path), check_same_thread=False)
+         _db_connection = sqlite3.connect(str(db_path), check_same_thread=False, cached_statements=SQLITE_CACHED_STATEMENTS)
          _db_connection.row_factory = sqlite3.Row
+         configure_connection(_db_connection)
          logger.info(f"Re-established DB connection in get_db.")
          if _db_connection is None: # If reconnect failed
              raise RuntimeError("Failed to re-establish database connection.")
@@ -122,6 +127,53 @@ def get_db() -> sqlite3.Connection:
     return _db_connection
 
 
+# --- Read-only Connection Pool ---
+
+# Readers get their own connections so they never share transaction state
+# with the writer connection above; WAL mode lets them run concurrently.
+DB_READER_POOL_SIZE = 4
+_db_reader_pool: queue.Queue | None = None
+_db_reader_pool_lock = threading.Lock()
+
+def _open_db_reader() -> sqlite3.Connection:
+    """Opens a read-only connection to the configured SQLite database."""
+    db_url = get_settings().database_url
+    if not db_url.startswith("sqlite:///"):
+        raise ValueError(f"Invalid database_url format: {db_url}")
+    db_path = Path(db_url[len("sqlite:///"):]).resolve()
+    conn = sqlite3.connect(str(db_path), check_same_thread=False, cached_statements=SQLITE_CACHED_STATEMENTS)
+    conn.row_factory = sqlite3.Row
+    configure_connection(conn)
+    conn.execute("PRAGMA query_only=1")
+    return conn
+
+@contextmanager
+def get_db_reader() -> Iterator[sqlite3.Connection]:
+    """Borrows a read-only connection from a small pool.
+
+    The pool is created on first use. Connections are not health-checked
+    on checkout; local WAL-mode SQLite connections do not go stale.
+
+    Yields:
+        A sqlite3 connection with ``query_only`` enabled.
+    """
+    global _db_reader_pool
+    if _db_reader_pool is None:
+        with _db_reader_pool_lock:
+            if _db_reader_pool is None:
+                pool: queue.Queue = queue.Queue(maxsize=DB_READER_POOL_SIZE)
+                for _ in range(DB_READER_POOL_SIZE):
+                    pool.put(_open_db_reader())
+                logger.info(f"Opened {DB_READER_POOL_SIZE} read-only DB connections.")
+                _db_reader_pool = pool
+
+    conn = _db_reader_pool.get()
+    try:
+        yield conn
+    finally:
+        _db_reader_pool.put(conn)
+
+
 # --- Service Dependencies (Manual Singleton Pattern with Injected Settings) ---
 
 def get_embedding_service(settings: Settings = Depends(get_settings)) -> EmbeddingInterface:
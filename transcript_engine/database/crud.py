@@ -3,18 +3,56 @@
 This module contains functions for interacting with the database tables.
 """
 
+import hashlib
 import sqlite3
+from array import array
 import logging
-from typing import List, Optional
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
 from datetime import datetime, timezone, date
 from pathlib import Path
-from transcript_engine.core.config import Settings
+from transcript_engine.core.config import get_settings
 
-from transcript_engine.database.schema import ALL_TABLES
+from transcript_engine.database.schema import ADDED_COLUMNS, ALL_INDEXES, ALL_TABLES
 from transcript_engine.database.models import Transcript, TranscriptCreate, Chunk, ChunkCreate, ChatMessage
 
+try:
+    import zstandard
+except ImportError: # Optional: without it, content is stored as plain TEXT
+    zstandard = None
+
 logger = logging.getLogger(__name__)
 
+CONTENT_ZSTD_LEVEL = 3 # zstd level for stored transcript content
+CONTENT_COMPRESS_MIN_BYTES = 512 # Shorter content is stored as TEXT; frame overhead isn't worth it
+
+def _encode_content(content: Optional[str]) -> Union[str, bytes, None]:
+    """Encodes transcript content for storage.
+
+    Long content is stored as a zstd-compressed BLOB when zstandard is
+    installed, which cuts bytes written to the WAL and the file size by
+    several times for markdown transcripts. Otherwise it stays TEXT.
+    """
+    if content is None or zstandard is None:
+        return content
+    raw = content.encode("utf-8")
+    if len(raw) < CONTENT_COMPRESS_MIN_BYTES:
+        return content
+    return zstandard.compress(raw, CONTENT_ZSTD_LEVEL)
+
+def _decode_content(value: Union[str, bytes, None]) -> Optional[str]:
+    """Decodes a stored content value; TEXT rows are returned unchanged.
+
+    Raises:
+        RuntimeError: If the row is compressed and zstandard is not installed.
+    """
+    if not isinstance(value, bytes):
+        return value
+    if zstandard is None:
+        raise RuntimeError("Transcript content is zstd-compressed but the 'zstandard' package is not installed.")
+    return zstandard.decompress(value).decode("utf-8")
+
 def initialize_database(db_path: str | Path) -> None:
     """Initializes the database by creating tables if they don't exist.
 
@@ -27,12 +65,20 @@ def initialize_database(db_path: str | Path) -> None:
     
     try:
         # Connect, setup, disconnect
-        conn = sqlite3.connect(str(db_path))
+        # Configured here too so a new database file is created in WAL mode
+        conn = configure_connection(sqlite3.connect(str(db_path)))
         try:
             with conn:
                 cursor = conn.cursor()
                 for table_sql in ALL_TABLES:
                     cursor.execute(table_sql)
+                for table, column, definition in ADDED_COLUMNS:
+                    existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+                    if column not in existing:
+                        cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+                        logger.info(f"Added column '{column}' to table '{table}'.")
+                for index_sql in ALL_INDEXES:
+                    cursor.execute(index_sql)
                 logger.info(f"Database tables initialized successfully at {db_path}.")
         finally:
             conn.close()
@@ -40,6 +86,48 @@ def initialize_database(db_path: str | Path) -> None:
         logger.error(f"Error initializing database tables at {db_path}: {e}", exc_info=True)
         raise
 
+# Per-connection compiled statement cache size (sqlite3 defaults to 128)
+SQLITE_CACHED_STATEMENTS = 256
+
+# Connection tuning applied to every connection opened by the app and scripts.
+# WAL lets readers run alongside the writer and, with synchronous=NORMAL,
+# only fsyncs at checkpoints instead of on every commit.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+def configure_connection(conn: sqlite3.Connection) -> sqlite3.Connection:
+    """Applies the standard PRAGMA set to a freshly opened connection.
+
+    Args:
+        conn: The sqlite3 connection to configure.
+
+    Returns:
+        The same connection, for chaining.
+    """
+    for pragma in SQLITE_PRAGMAS:
+        result = conn.execute(pragma).fetchone()
+        # journal_mode reports the mode actually in effect; WAL is refused on
+        # some filesystems (e.g. network mounts) and SQLite keeps the old mode
+        if pragma.startswith("PRAGMA journal_mode") and result and result[0].lower() not in ("wal", "memory"):
+            logger.warning(f"SQLite refused WAL mode; journal_mode is '{result[0]}'.")
+    return conn
+
+# Statements reused on every call are module constants, so each connection's
+# statement cache keeps hitting the same compiled statement
+_INSERT_TRANSCRIPT_SQL = """INSERT INTO transcripts (source, source_id, title, content, start_time, end_time)
+             VALUES (?, ?, ?, ?, ?, ?)"""
+# Duplicates hit the source_id UNIQUE constraint and are skipped in SQL,
+# counted through rowcount, instead of raising IntegrityError per row
+_INSERT_NEW_TRANSCRIPT_SQL = """INSERT INTO transcripts 
+                          (source, source_id, title, content, start_time, end_time)
+                          VALUES (?, ?, ?, ?, ?, ?)
+                          ON CONFLICT(source_id) DO NOTHING"""
+
 # Placeholder CRUD functions - to be implemented later
 
 def create_transcript(conn: sqlite3.Connection, transcript: TranscriptCreate) -> Optional[int]:
@@ -56,8 +144,7 @@ def create_transcript(conn: sqlite3.Connection, transcript: TranscriptCreate) ->
         sqlite3.IntegrityError: If a transcript with the same source_id already exists.
         sqlite3.Error: For other database errors during insertion.
     """
-    sql = """INSERT INTO transcripts (source, source_id, title, content, start_time, end_time)
-             VALUES (?, ?, ?, ?, ?, ?)"""
+    sql = _INSERT_TRANSCRIPT_SQL
     
     try:
         # Convert datetime objects to ISO 8601 string format for SQLite
@@ -73,7 +160,7 @@ def create_transcript(conn: sqlite3.Connection, transcript: TranscriptCreate) ->
                     transcript.source,
                     transcript.source_id,
                     transcript.title,
-                    transcript.content,
+                    _encode_content(transcript.content),
                     start_time_iso, # Pass start_time
                     end_time_iso    # Pass end_time
                 ),
@@ -114,7 +201,9 @@ def get_transcript_by_source_id(conn: sqlite3.Connection, source_id: str) -> Opt
             row = cursor.execute(sql, (source_id,)).fetchone()
             if row:
                 logger.debug(f"Retrieved transcript with source_id '{source_id}'")
-                return Transcript.model_validate(dict(row))
+                transcript_data = dict(row)
+                transcript_data["content"] = _decode_content(transcript_data["content"])
+                return Transcript.model_validate(transcript_data)
             else:
                 logger.debug(f"Transcript with source_id '{source_id}' not found.")
                 return None
@@ -149,15 +238,17 @@ def get_transcript_by_id(conn: sqlite3.Connection, transcript_id: int) -> Option
         try:
             row = cursor.execute(sql, (transcript_id,)).fetchone()
             if row:
-                logger.debug(f"Retrieved transcript with id {transcript_id}")
+                logger.debug("Retrieved transcript with id %s", transcript_id)
                 # Convert row to dict before validation if using sqlite3.Row
                 transcript_data = dict(row)
+                transcript_data["content"] = _decode_content(transcript_data["content"])
                 # Manually parse datetime strings back to objects for Pydantic
                 # Pydantic's from_attributes=True expects objects, not strings for datetime
                 for key in ['start_time', 'end_time', 'created_at', 'updated_at']:
                     if key in transcript_data and transcript_data[key] and isinstance(transcript_data[key], str):
                         try:
-                            dt_obj = datetime.fromisoformat(transcript_data[key].replace('Z', '+00:00'))
+                            # Python 3.11+ fromisoformat accepts a trailing 'Z' directly
+                            dt_obj = datetime.fromisoformat(transcript_data[key])
                             # Ensure timezone aware (UTC)
                             if dt_obj.tzinfo is None:
                                 dt_obj = dt_obj.replace(tzinfo=timezone.utc)
@@ -171,7 +262,7 @@ def get_transcript_by_id(conn: sqlite3.Connection, transcript_id: int) -> Option
                      
                 return Transcript.model_validate(transcript_data)
             else:
-                logger.debug(f"Transcript with id {transcript_id} not found.")
+                logger.debug("Transcript with id %s not found.", transcript_id)
                 return None
         finally:
              # Restore original row factory if changed
@@ -201,13 +292,8 @@ def get_latest_transcript_timestamp(conn: sqlite3.Connection) -> Optional[dateti
             if result and result[0]:
                 # SQLite timestamp might be string, attempt to parse
                 try:
-                    # Use fromisoformat which handles standard formats
-                    timestamp_str = result[0]
-                    # Replace Z with +00:00 if necessary, though fromisoformat might handle it
-                    if timestamp_str.endswith('Z'):
-                         timestamp_str = timestamp_str[:-1] + '+00:00'
-                         
-                    latest_time = datetime.fromisoformat(timestamp_str)
+                    # fromisoformat handles standard formats, including a trailing 'Z' (3.11+)
+                    latest_time = datetime.fromisoformat(result[0])
                     # Ensure timezone awareness (assume UTC if naive)
                     if latest_time.tzinfo is None:
                         latest_time = latest_time.replace(tzinfo=timezone.utc)
@@ -262,14 +348,45 @@ def get_latest_limitless_start_time(conn: sqlite3.Connection) -> Optional[dateti
         logger.error(f"Error retrieving latest Limitless transcript start_time: {e}", exc_info=True)
         raise
 
+def get_max_transcript_id(conn: sqlite3.Connection) -> int:
+    """Returns the highest transcript ID, or 0 if the table is empty.
+
+    Raises:
+        sqlite3.Error: For database errors during query.
+    """
+    try:
+        row = conn.execute("SELECT MAX(id) FROM transcripts").fetchone()
+        return row[0] or 0
+    except sqlite3.Error as e:
+        logger.error(f"Error retrieving max transcript id: {e}", exc_info=True)
+        raise
+
+def get_transcript_ids_after(conn: sqlite3.Connection, after_id: int) -> List[int]:
+    """Returns the IDs of transcripts inserted after ``after_id``, in order.
+
+    Raises:
+        sqlite3.Error: For database errors during query.
+    """
+    try:
+        rows = conn.execute("SELECT id FROM transcripts WHERE id > ? ORDER BY id ASC", (after_id,)).fetchall()
+        return [row[0] for row in rows]
+    except sqlite3.Error as e:
+        logger.error(f"Error retrieving transcript ids after {after_id}: {e}", exc_info=True)
+        raise
+
 # Add more CRUD functions for transcripts and chunks as needed
 
-def get_transcripts_needing_chunking(conn: sqlite3.Connection, limit: int = 10) -> List[Transcript]:
+def get_transcripts_needing_chunking(conn: sqlite3.Connection, limit: int = 10, after_id: int = 0) -> List[Transcript]:
     """Retrieves transcripts that have not yet been chunked.
 
+    Uses keyset pagination on the primary key (backed by the partial
+    ``idx_transcripts_unchunked`` index), so each call costs O(limit)
+    regardless of how far through the table the caller is.
+
     Args:
         conn: An active sqlite3 database connection.
         limit: The maximum number of transcripts to retrieve.
+        after_id: Only return transcripts with an ID greater than this.
 
     Returns:
         A list of Transcript objects that need chunking.
@@ -277,66 +394,148 @@ def get_transcripts_needing_chunking(conn: sqlite3.Connection, limit: int = 10)
     Raises:
         sqlite3.Error: For database errors during query.
     """
-    sql = "SELECT * FROM transcripts WHERE is_chunked = FALSE ORDER BY created_at ASC LIMIT ?"
+    sql = "SELECT * FROM transcripts WHERE is_chunked = FALSE AND id > ? ORDER BY id ASC LIMIT ?"
     transcripts: List[Transcript] = []
     try:
         with conn:
             cursor = conn.cursor()
-            rows = cursor.execute(sql, (limit,)).fetchall()
+            rows = cursor.execute(sql, (after_id, limit)).fetchall()
             for row in rows:
-                transcripts.append(Transcript.model_validate(dict(row)))
+                transcript_data = dict(row)
+                transcript_data["content"] = _decode_content(transcript_data["content"])
+                transcripts.append(Transcript.model_validate(transcript_data))
             logger.debug(f"Retrieved {len(transcripts)} transcripts needing chunking.")
             return transcripts
     except sqlite3.Error as e:
         logger.error(f"Error retrieving transcripts needing chunking: {e}", exc_info=True)
         raise
 
-def add_chunks(conn: sqlite3.Connection, chunks: List[ChunkCreate]) -> bool:
+# SQLite builds before 3.32 cap bound parameters per statement at 999
+SQLITE_MAX_VARIABLES = 999
+_CHUNK_COLUMNS = 5
+_CHUNK_ROWS_PER_INSERT = SQLITE_MAX_VARIABLES // _CHUNK_COLUMNS
+
+def _insert_chunks_sql(row_count: int) -> str:
+    """Builds a multi-row chunk INSERT with row_count VALUES groups."""
+    return (
+        "INSERT INTO chunks (transcript_id, content, start_time, end_time, content_hash) VALUES "
+        + ", ".join(["(?, ?, ?, ?, ?)"] * row_count)
+    )
+
+# Statement for full-size groups, built once; only a batch's tail needs its own
+_INSERT_CHUNKS_FULL_SQL = _insert_chunks_sql(_CHUNK_ROWS_PER_INSERT)
+
+_MARK_TRANSCRIPTS_CHUNKED_SQL = "UPDATE transcripts SET is_chunked = TRUE WHERE id IN ({placeholders})"
+_MARK_CHUNKS_EMBEDDED_SQL = "UPDATE chunks SET is_embedded = TRUE WHERE id IN ({placeholders})"
+_STORE_CHUNK_EMBEDDING_SQL = "UPDATE chunks SET is_embedded = TRUE, embedding = ? WHERE id = ?"
+_EMBEDDINGS_BY_CONTENT_HASH_SQL = (
+    "SELECT content_hash, embedding FROM chunks "
+    "WHERE content_hash IN ({placeholders}) AND embedding IS NOT NULL"
+)
+
+# Positional chunk row for bulk inserts: (transcript_id, content, start_time, end_time).
+# Bulk callers can pass these instead of ChunkCreate to skip per-row model validation.
+ChunkRow = Tuple[int, str, Optional[float], Optional[float]]
+
+def chunk_content_hash(content: str) -> bytes:
+    """Returns the digest stored in ``chunks.content_hash`` for a chunk's text.
+
+    Args:
+        content: The chunk text.
+
+    Returns:
+        A 16-byte blake2b digest of the UTF-8 encoded content.
+    """
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+def encode_embedding(embedding: Sequence[float]) -> bytes:
+    """Packs an embedding vector into the float32 bytes stored in ``chunks.embedding``."""
+    return array("f", embedding).tobytes()
+
+def decode_embedding(blob: bytes) -> List[float]:
+    """Unpacks a ``chunks.embedding`` BLOB written by encode_embedding."""
+    vector = array("f")
+    vector.frombytes(blob)
+    return vector.tolist()
+
+def _insert_chunk_rows(cursor: sqlite3.Cursor, chunks: Sequence[Union[ChunkCreate, ChunkRow]]) -> None:
+    """Inserts chunks using multi-row VALUES statements.
+
+    Each statement carries as many rows as the SQLite bound-parameter limit
+    allows, so a batch is parsed and stepped a handful of times instead of
+    once per row.
+
+    Args:
+        cursor: A cursor on a connection with an open transaction.
+        chunks: ChunkCreate objects or ChunkRow tuples to insert.
+    """
+    for offset in range(0, len(chunks), _CHUNK_ROWS_PER_INSERT):
+        group = chunks[offset:offset + _CHUNK_ROWS_PER_INSERT]
+        sql = _INSERT_CHUNKS_FULL_SQL if len(group) == _CHUNK_ROWS_PER_INSERT else _insert_chunks_sql(len(group))
+        params = []
+        for chunk in group:
+            if isinstance(chunk, ChunkCreate):
+                chunk = (chunk.transcript_id, chunk.content, chunk.start_time, chunk.end_time)
+            params.extend(chunk)
+            params.append(chunk_content_hash(chunk[1]))
+        cursor.execute(sql, params)
+
+def _update_ids_in_batches(cursor: sqlite3.Cursor, sql_template: str, ids: List[int]) -> int:
+    """Runs an ``UPDATE ... WHERE id IN (...)`` over ids in parameter-limit sized groups.
+
+    Args:
+        cursor: A cursor on a connection with an open transaction.
+        sql_template: UPDATE statement with a ``{placeholders}`` slot for the IN list.
+        ids: The row IDs to update.
+
+    Returns:
+        The total number of rows updated.
+    """
+    updated = 0
+    for offset in range(0, len(ids), SQLITE_MAX_VARIABLES):
+        group = ids[offset:offset + SQLITE_MAX_VARIABLES]
+        placeholders = ', '.join('?' * len(group))
+        cursor.execute(sql_template.format(placeholders=placeholders), group)
+        updated += cursor.rowcount
+    return updated
+
+def add_chunks(conn: sqlite3.Connection, chunks: Sequence[Union[ChunkCreate, ChunkRow]]) -> bool:
     """Adds multiple chunk records to the database in a single transaction.
 
     Args:
         conn: An active sqlite3 database connection.
-        chunks: A list of ChunkCreate objects to insert.
+        chunks: ChunkCreate objects, or ChunkRow tuples for bulk callers.
 
     Returns:
         True if the insertion was attempted successfully, False otherwise.
-        Note: Doesn't guarantee insertion if DB constraints fail silently in executemany.
         
     Raises:
         sqlite3.Error: If any database error occurs during the transaction.
     """
     if not chunks:
         return True # Nothing to add
-        
-    sql = "INSERT INTO chunks (transcript_id, content, start_time, end_time) VALUES (?, ?, ?, ?)"
-    chunk_data = [
-        (
-            chunk.transcript_id, 
-            chunk.content, 
-            chunk.start_time, 
-            chunk.end_time
-        ) 
-        for chunk in chunks
-    ]
     
     try:
         with conn: # Ensures transactionality
-            cursor = conn.cursor()
-            cursor.executemany(sql, chunk_data)
-            # Avoid cursor.lastrowid after executemany as it can be unreliable/None
-            logger.info(f"Executed insert for {len(chunks)} chunks (first transcript ID: {chunks[0].transcript_id}).")
+            _insert_chunk_rows(conn.cursor(), chunks)
+            logger.info(f"Executed insert for {len(chunks)} chunks.")
         return True # Indicate successful execution attempt
     except sqlite3.Error as e:
         logger.error(f"Error adding chunks to database: {e}", exc_info=True)
         # The transaction will be rolled back automatically by the context manager
         raise # Re-raise the error
         
-def get_chunks_needing_embedding(conn: sqlite3.Connection, limit: int = 100) -> List[Chunk]:
+def get_chunks_needing_embedding(conn: sqlite3.Connection, limit: int = 100, after_id: int = 0) -> List[Chunk]:
     """Retrieves chunks that have not yet been embedded.
 
+    Keyset-paginated like get_transcripts_needing_chunking, backed by the
+    partial ``idx_chunks_unembedded`` index.
+
     Args:
         conn: An active sqlite3 database connection.
         limit: The maximum number of chunks to retrieve for batch processing.
+        after_id: Only return chunks with an ID greater than this. Lets callers
+            page forward past chunks that are still being processed.
 
     Returns:
         A list of Chunk objects that need embedding.
@@ -344,12 +543,12 @@ def get_chunks_needing_embedding(conn: sqlite3.Connection, limit: int = 100) ->
     Raises:
         sqlite3.Error: For database errors during query.
     """
-    sql = "SELECT * FROM chunks WHERE is_embedded = FALSE ORDER BY created_at ASC LIMIT ?"
+    sql = "SELECT * FROM chunks WHERE is_embedded = FALSE AND id > ? ORDER BY id ASC LIMIT ?"
     chunks_to_embed: List[Chunk] = []
     try:
         with conn:
             cursor = conn.cursor()
-            rows = cursor.execute(sql, (limit,)).fetchall()
+            rows = cursor.execute(sql, (after_id, limit)).fetchall()
             for row in rows:
                 chunks_to_embed.append(Chunk.model_validate(dict(row)))
             logger.debug(f"Retrieved {len(chunks_to_embed)} chunks needing embedding.")
@@ -387,6 +586,61 @@ def mark_transcript_chunked(conn: sqlite3.Connection, transcript_id: int) -> boo
         logger.error(f"Error marking transcript {transcript_id} as chunked: {e}", exc_info=True)
         raise
 
+def add_chunks_and_mark_chunked(
+    conn: sqlite3.Connection, chunks: Sequence[Union[ChunkCreate, ChunkRow]], transcript_ids: List[int]
+) -> None:
+    """Inserts chunks and marks their transcripts as chunked in one transaction.
+
+    Uses ``BEGIN IMMEDIATE`` so the write lock is taken up front and the
+    whole batch is committed with a single fsync.
+
+    Args:
+        conn: An active sqlite3 database connection.
+        chunks: ChunkCreate objects or ChunkRow tuples to insert.
+        transcript_ids: IDs of the transcripts to mark as chunked.
+
+    Raises:
+        sqlite3.Error: If any database error occurs; the transaction is rolled back.
+    """
+    if not chunks and not transcript_ids:
+        return
+
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.cursor()
+            _insert_chunk_rows(cursor, chunks)
+            _update_ids_in_batches(cursor, _MARK_TRANSCRIPTS_CHUNKED_SQL, transcript_ids)
+        logger.info(f"Committed {len(chunks)} chunks for {len(transcript_ids)} transcripts.")
+    except sqlite3.Error as e:
+        logger.error(f"Error adding chunks for transcripts {transcript_ids}: {e}", exc_info=True)
+        raise
+
+def mark_transcripts_chunked(conn: sqlite3.Connection, transcript_ids: List[int]) -> int:
+    """Marks a list of transcripts as chunked with a single UPDATE per ID group.
+
+    Args:
+        conn: An active sqlite3 database connection.
+        transcript_ids: A list of IDs of the transcripts to mark as chunked.
+
+    Returns:
+        The number of rows updated.
+        
+    Raises:
+        sqlite3.Error: For database errors during update.
+    """
+    if not transcript_ids:
+        return 0
+
+    try:
+        with conn:
+            updated_count = _update_ids_in_batches(conn.cursor(), _MARK_TRANSCRIPTS_CHUNKED_SQL, transcript_ids)
+            logger.debug("Marked %d transcripts as chunked (IDs: %s).", updated_count, transcript_ids)
+            return updated_count
+    except sqlite3.Error as e:
+        logger.error(f"Error marking transcripts {transcript_ids} as chunked: {e}", exc_info=True)
+        raise
+
 def mark_chunks_embedded(conn: sqlite3.Connection, chunk_ids: List[int]) -> int:
     """Marks a list of chunks as embedded in the database.
 
@@ -402,22 +656,94 @@ def mark_chunks_embedded(conn: sqlite3.Connection, chunk_ids: List[int]) -> int:
     """
     if not chunk_ids:
         return 0
-        
-    # Create placeholders for the IN clause
-    placeholders = ', '.join('?' * len(chunk_ids))
-    sql = f"UPDATE chunks SET is_embedded = TRUE WHERE id IN ({placeholders})"
     
     try:
         with conn:
-            cursor = conn.cursor()
-            cursor.execute(sql, chunk_ids)
-            updated_count = cursor.rowcount
-            logger.debug(f"Marked {updated_count} chunks as embedded (IDs: {chunk_ids}).")
+            updated_count = _update_ids_in_batches(conn.cursor(), _MARK_CHUNKS_EMBEDDED_SQL, chunk_ids)
+            logger.debug("Marked %d chunks as embedded (IDs: %s).", updated_count, chunk_ids)
             return updated_count
     except sqlite3.Error as e:
         logger.error(f"Error marking chunks {chunk_ids} as embedded: {e}", exc_info=True)
         raise 
 
+def get_embeddings_by_content_hash(conn: sqlite3.Connection, content_hashes: Sequence[bytes]) -> Dict[bytes, List[float]]:
+    """Looks up stored embeddings for chunk texts that were already embedded.
+
+    Backed by ``idx_chunks_content_hash``, so the embed stage can reuse the
+    vector of any earlier chunk with identical content instead of running
+    the model again.
+
+    Args:
+        conn: An active sqlite3 database connection.
+        content_hashes: Digests from chunk_content_hash.
+
+    Returns:
+        A mapping from each hash that has a stored embedding to its vector;
+        hashes without one are left out.
+
+    Raises:
+        sqlite3.Error: For database errors during query.
+    """
+    embeddings: Dict[bytes, List[float]] = {}
+    try:
+        for offset in range(0, len(content_hashes), SQLITE_MAX_VARIABLES):
+            group = content_hashes[offset:offset + SQLITE_MAX_VARIABLES]
+            placeholders = ', '.join('?' * len(group))
+            for content_hash, blob in conn.execute(_EMBEDDINGS_BY_CONTENT_HASH_SQL.format(placeholders=placeholders), group):
+                if content_hash not in embeddings:
+                    embeddings[content_hash] = decode_embedding(blob)
+        return embeddings
+    except sqlite3.Error as e:
+        logger.error(f"Error looking up embeddings by content hash: {e}", exc_info=True)
+        raise
+
+@contextmanager
+def chunks_embedded_transaction(
+    conn: sqlite3.Connection,
+    chunk_ids: List[int],
+    embeddings: Optional[Sequence[Sequence[float]]] = None,
+) -> Iterator[int]:
+    """Marks chunks as embedded inside a transaction that stays open for the caller.
+
+    The UPDATE runs first and is only committed when the ``with`` block exits
+    cleanly. That way the vector store write inside the block and the
+    is_embedded flag succeed or fail together. When ``embeddings`` are given,
+    each chunk's vector is stored with it so later duplicates can reuse it
+    (see get_embeddings_by_content_hash).
+
+    Example:
+        with crud.chunks_embedded_transaction(conn, ids):
+            vector_store.add(...)
+
+    Args:
+        conn: An active sqlite3 database connection.
+        chunk_ids: A list of IDs of the chunks to mark as embedded.
+        embeddings: Optional vectors, one per chunk ID, to store alongside.
+
+    Yields:
+        The number of rows updated (not yet committed).
+        
+    Raises:
+        sqlite3.Error: For database errors during update or commit.
+        Exception: Anything raised inside the block; the update is rolled back.
+    """
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if embeddings is None:
+                updated_count = _update_ids_in_batches(conn.cursor(), _MARK_CHUNKS_EMBEDDED_SQL, chunk_ids)
+            else:
+                cursor = conn.executemany(
+                    _STORE_CHUNK_EMBEDDING_SQL,
+                    ((encode_embedding(embedding), chunk_id) for chunk_id, embedding in zip(chunk_ids, embeddings)),
+                )
+                updated_count = cursor.rowcount
+            yield updated_count
+        logger.debug("Committed %d chunks as embedded (IDs: %s).", updated_count, chunk_ids)
+    except sqlite3.Error as e:
+        logger.error(f"Error marking chunks {chunk_ids} as embedded: {e}", exc_info=True)
+        raise
+
 def add_chat_message(conn: sqlite3.Connection, session_id: str, message: ChatMessage) -> Optional[int]:
     """Adds a chat message to the database.
 
@@ -567,76 +893,190 @@ def get_transcript_ids_by_date_range(conn: sqlite3.Connection, start_dt: datetim
 
     return ids
 
+# Transcript start_time as integer epoch seconds (UTC offsets normalized,
+# fractional seconds dropped); unixepoch() needs SQLite 3.38+
+_TRANSCRIPT_START_EPOCH_SQL = (
+    "unixepoch(t.start_time)" if sqlite3.sqlite_version_info >= (3, 38, 0)
+    else "CAST(strftime('%s', t.start_time) AS INTEGER)"
+)
+# Chunk offsets stay alone on one side, so each row costs one epoch conversion
+# and two numeric comparisons
+_FETCH_CHUNKS_IN_TIMEFRAME_SQL = f"""SELECT c.content
+             FROM transcripts t
+             JOIN chunks c ON c.transcript_id = t.id
+             WHERE t.start_time < ? AND (t.end_time IS NULL OR t.end_time >= ?)
+               AND c.start_time >= ? - {_TRANSCRIPT_START_EPOCH_SQL}
+               AND c.start_time < ? - {_TRANSCRIPT_START_EPOCH_SQL}
+             ORDER BY t.start_time, c.id"""
+
+def fetch_chunks_in_timeframe(
+    conn: sqlite3.Connection, window_start: datetime, window_end: datetime
+) -> List[str]:
+    """Fetches the content of chunks whose absolute start falls in a time window.
+
+    A chunk's absolute start is its transcript's start_time plus the chunk's
+    start_time offset in seconds. Only transcripts that start before the
+    window ends and have not ended before it starts are joined, and the join
+    and the filter run in a single query, comparing chunk offsets against
+    the window in integer epoch seconds.
+
+    Assumes start_time/end_time are stored as ISO 8601 strings of UTC datetimes.
+
+    Args:
+        conn: An active sqlite3 database connection.
+        window_start: Start of the window (UTC, inclusive).
+        window_end: End of the window (UTC, exclusive).
+
+    Returns:
+        Chunk contents ordered by transcript start_time, then chunk ID.
+
+    Raises:
+        sqlite3.Error: For database errors during querying.
+    """
+    window_start_utc = window_start.astimezone(timezone.utc)
+    window_end_utc = window_end.astimezone(timezone.utc)
+    params = (
+        window_end_utc.isoformat(),
+        window_start_utc.isoformat(),
+        int(window_start_utc.timestamp()),
+        int(window_end_utc.timestamp()),
+    )
+    try:
+        with conn:
+            contents = [row[0] for row in conn.execute(_FETCH_CHUNKS_IN_TIMEFRAME_SQL, params)]
+        logger.debug(f"Found {len(contents)} chunks between {window_start_utc} and {window_end_utc}.")
+    except sqlite3.Error as e:
+        logger.error(f"Error fetching chunks between {window_start_utc} and {window_end_utc}: {e}", exc_info=True)
+        raise
+    return contents
+
+@lru_cache(maxsize=None)
+def _database_path(database_url: str) -> Path:
+    """Resolves the SQLite file path for a URL, creating its directory once.
+
+    Cached per URL so repeated get_db() calls skip the path handling and
+    the mkdir syscall.
+    """
+    db_path = Path(database_url.replace("sqlite:///", ""))
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    return db_path
+
 def get_db():
     """Get a database connection.
 
     Returns:
         sqlite3.Connection: A connection to the SQLite database.
     """
-    settings = Settings()
-    db_path = Path(settings.database_url.replace("sqlite:///", ""))
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    return sqlite3.connect(db_path)
+    db_path = _database_path(get_settings().database_url)
+    return configure_connection(sqlite3.connect(db_path, cached_statements=SQLITE_CACHED_STATEMENTS))
 
-def add_transcripts_batch(conn: sqlite3.Connection, transcripts: List[TranscriptCreate]) -> int:
-    """Adds multiple transcript records to the database in a single transaction.
+# Raw transcript row: (source, source_id, title, content, start_time, end_time)
+TranscriptRow = Tuple[str, str, Optional[str], Optional[str], Optional[datetime], Optional[datetime]]
+
+def _existing_source_ids(cursor: sqlite3.Cursor, source_ids: List[str]) -> set[str]:
+    """Returns which of source_ids are already stored, in parameter-limit sized groups."""
+    existing: set[str] = set()
+    for offset in range(0, len(source_ids), SQLITE_MAX_VARIABLES):
+        group = source_ids[offset:offset + SQLITE_MAX_VARIABLES]
+        placeholders = ', '.join('?' * len(group))
+        cursor.execute(f"SELECT source_id FROM transcripts WHERE source_id IN ({placeholders})", group)
+        existing.update(row[0] for row in cursor.fetchall())
+    return existing
+
+def _insert_transcript_rows(cursor: sqlite3.Cursor, rows: Sequence[TranscriptRow]) -> int:
+    """Inserts raw transcript rows within the cursor's open transaction.
+
+    Returns:
+        The number of rows actually inserted.
+    """
+    # Checked under the write lock, so no row can appear in between
+    source_ids = [row[1] for row in rows]
+    existing = _existing_source_ids(cursor, source_ids)
+    if existing.issuperset(source_ids):
+        logger.info(f"All {len(rows)} transcripts in batch already exist. Nothing to insert.")
+        return 0
+    # Encoded lazily: executemany pulls each row from the generator as it
+    # steps the prepared statement, so no second list of rows is built
+    new_rows = (
+        (
+            source,
+            source_id,
+            title,
+            _encode_content(content),
+            start_time.isoformat() if start_time else None,
+            end_time.isoformat() if end_time else None,
+        )
+        for source, source_id, title, content, start_time, end_time in rows
+        if source_id not in existing
+    )
+    # ON CONFLICT(source_id) DO NOTHING skips duplicates without raising;
+    # other constraint violations still fail the batch
+    cursor.execute("PRAGMA query_only = OFF") # Ensure INSERT is allowed
+    changes_before = cursor.connection.total_changes
+    cursor.executemany(_INSERT_NEW_TRANSCRIPT_SQL, new_rows)
+    # total_changes counts only rows actually inserted, unlike rowcount
+    inserted_count = cursor.connection.total_changes - changes_before
+    logger.info(f"Executed batch insert for {len(rows) - len(existing)} new transcripts. Rows inserted: {inserted_count}.")
+    return inserted_count
+
+def create_transcripts(conn: sqlite3.Connection, rows: Sequence[TranscriptRow]) -> int:
+    """Bulk-inserts raw transcript tuples in a single transaction.
+
+    The bulk ingest path builds these tuples directly instead of going
+    through TranscriptCreate, so no per-row model validation is paid.
+    Existing source_ids are looked up first and dropped before the INSERT,
+    so their (often large) content is never bound; duplicates within the
+    batch itself are still skipped by ON CONFLICT DO NOTHING. If ``conn``
+    already has an open transaction the rows join it, uncommitted.
 
     Args:
         conn: An active sqlite3 database connection.
-        transcripts: A list of TranscriptCreate objects to insert.
+        rows: Tuples of (source, source_id, title, content, start_time, end_time);
+            the times are datetimes or None.
 
     Returns:
-        The number of transcripts successfully prepared for insertion.
-        Note: Due to sqlite3 limitations, `executemany` might not report 
-              per-row errors (like IntegrityError) without extra handling.
-        
+        The number of rows actually inserted.
+
     Raises:
         sqlite3.Error: If a database error occurs during the transaction.
     """
-    if not transcripts:
+    if not rows:
         return 0
 
-    sql = """INSERT INTO transcripts (source, source_id, title, content, start_time, end_time)
-             VALUES (?, ?, ?, ?, ?, ?)"""
-    
-    transcript_data = []
-    for t in transcripts:
-        start_time_iso = t.start_time.isoformat() if t.start_time else None
-        end_time_iso = t.end_time.isoformat() if t.end_time else None
-        transcript_data.append(
-            (
-                t.source,
-                t.source_id,
-                t.title,
-                t.content,
-                start_time_iso,
-                end_time_iso
-            )
-        )
-
     try:
+        if conn.in_transaction:
+            # The caller owns the transaction (e.g. a bulk load spanning many
+            # batches); join it and leave the commit to the caller
+            return _insert_transcript_rows(conn.cursor(), rows)
         with conn: # Ensures transactionality
             cursor = conn.cursor()
-            # Using INSERT OR IGNORE to gracefully handle duplicates within the batch
-            # Change to INSERT if strict error checking on duplicates is needed
-            cursor.execute("PRAGMA query_only = OFF") # Ensure INSERT is allowed
-            insert_sql = """INSERT OR IGNORE INTO transcripts 
-                          (source, source_id, title, content, start_time, end_time)
-                          VALUES (?, ?, ?, ?, ?, ?)"""
-            cursor.executemany(insert_sql, transcript_data)
-            inserted_count = cursor.rowcount # rowcount after executemany might be -1 or actual count
-            if inserted_count == -1:
-                 logger.warning(f"Executed INSERT OR IGNORE for {len(transcript_data)} transcripts batch. Rowcount unreliable (-1).")
-                 # Assume all were attempted; duplicates ignored silently
-                 return len(transcript_data)
-            else:
-                 logger.info(f"Executed INSERT OR IGNORE for {len(transcript_data)} transcripts batch. Rows affected: {inserted_count}. (This counts actual insertions, ignoring duplicates).")
-                 return inserted_count # Return actual number inserted if available
+            # Take the write lock up front so a concurrent reader cannot make
+            # a deferred transaction fail with SQLITE_BUSY when it upgrades
+            cursor.execute("BEGIN IMMEDIATE")
+            return _insert_transcript_rows(cursor, rows)
                  
     except sqlite3.Error as e:
         logger.error(f"Error adding transcript batch to database: {e}", exc_info=True)
         raise # Re-raise the error 
 
+def add_transcripts_batch(conn: sqlite3.Connection, transcripts: List[TranscriptCreate]) -> int:
+    """Adds multiple transcript records to the database in a single transaction.
+
+    Args:
+        conn: An active sqlite3 database connection.
+        transcripts: A list of TranscriptCreate objects to insert.
+
+    Returns:
+        The number of rows actually inserted (duplicates are ignored).
+        
+    Raises:
+        sqlite3.Error: If a database error occurs during the transaction.
+    """
+    return create_transcripts(
+        conn,
+        [(t.source, t.source_id, t.title, t.content, t.start_time, t.end_time) for t in transcripts],
+    )
+
 def get_latest_transcript_id_for_today(conn: sqlite3.Connection) -> Optional[int]:
     """Fetches the ID of the transcript with the latest start_time for today (UTC).
 
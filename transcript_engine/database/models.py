@@ -69,6 +69,7 @@ class Chunk(ChunkBase):
     """
     id: int
     is_embedded: bool = False
+    content_hash: Optional[bytes] = None # NULL for chunks stored before hashing was added
     # embedding is not included by default, loaded separately if needed
     created_at: datetime
     updated_at: datetime
@@ -9,7 +9,7 @@ CREATE TABLE IF NOT EXISTS transcripts (
     source TEXT NOT NULL,
     source_id TEXT UNIQUE NOT NULL,
     title TEXT,
-    content TEXT,
+    content TEXT, -- Long content is stored as a zstd BLOB when zstandard is installed
     is_chunked BOOLEAN DEFAULT FALSE NOT NULL,
     start_time TIMESTAMP,
     end_time TIMESTAMP,
@@ -27,6 +27,7 @@ CREATE TABLE IF NOT EXISTS chunks (
     end_time REAL,
     embedding BLOB DEFAULT NULL, -- Store embedding optionally, track status separately
     is_embedded BOOLEAN DEFAULT FALSE NOT NULL, 
+    content_hash BLOB, -- blake2b digest of content, used to embed duplicate chunks once
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (transcript_id) REFERENCES transcripts (id)
@@ -43,6 +44,30 @@ CREATE TABLE IF NOT EXISTS chat_messages (
 );
 """
 
+# Partial index covering only transcripts still waiting to be chunked, so the
+# chunking scan stays small as the table grows
+CREATE_TRANSCRIPTS_UNCHUNKED_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_transcripts_unchunked ON transcripts (id) WHERE is_chunked = FALSE;
+"""
+
+# Same for chunks still waiting to be embedded
+CREATE_CHUNKS_UNEMBEDDED_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_chunks_unembedded ON chunks (id) WHERE is_embedded = FALSE;
+"""
+
+CREATE_CHUNKS_CONTENT_HASH_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_chunks_content_hash ON chunks (content_hash);
+"""
+
+# Date-range lookups on transcripts and the chunks-by-transcript join
+CREATE_TRANSCRIPTS_START_TIME_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_transcripts_start_time ON transcripts (start_time);
+"""
+
+CREATE_CHUNKS_TRANSCRIPT_ID_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_chunks_transcript_id ON chunks (transcript_id);
+"""
+
 # Add more table creation statements as needed (e.g., for chat history, metadata)
 
 ALL_TABLES = [
@@ -51,6 +76,22 @@ ALL_TABLES = [
     CREATE_CHAT_MESSAGES_TABLE,
 ]
 
+# Columns added after a table was first released. CREATE TABLE IF NOT EXISTS
+# leaves existing databases untouched, so these are added with ALTER TABLE
+# when missing: (table, column, column definition)
+ADDED_COLUMNS = [
+    ("chunks", "content_hash", "BLOB"),
+]
+
+# Created after ADDED_COLUMNS are applied, since they may index those columns
+ALL_INDEXES = [
+    CREATE_TRANSCRIPTS_UNCHUNKED_INDEX,
+    CREATE_CHUNKS_UNEMBEDDED_INDEX,
+    CREATE_CHUNKS_CONTENT_HASH_INDEX,
+    CREATE_TRANSCRIPTS_START_TIME_INDEX,
+    CREATE_CHUNKS_TRANSCRIPT_ID_INDEX,
+]
+
 def init_db():
     """Initialize the database with required tables."""
     with get_db() as conn:
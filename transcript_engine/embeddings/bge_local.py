@@ -2,6 +2,8 @@
 """
 
 import logging
+import re
+from pathlib import Path
 from typing import List
 import torch
 
@@ -13,6 +15,13 @@ from transcript_engine.core.config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Number of texts tokenized and run through the model per forward pass
+ENCODE_BATCH_SIZE = 64
+
+ONNX_BACKENDS = ("onnx", "onnx-int8")
+TORCH_INT8_BACKEND = "torch-int8"
+ONNX_OPSET = 17
+
 class BGELocalEmbeddings(EmbeddingInterface):
     """Embedding client using local Sentence Transformer models (like BAAI/bge-*).
 
@@ -37,11 +46,37 @@ class BGELocalEmbeddings(EmbeddingInterface):
             # trust_remote_code=True might be needed for some models like newer BGE versions
             # TODO: Consider adding trust_remote_code=True based on model requirements
             self.model = SentenceTransformer(self.model_name, device=self.device)
+            if self.device == 'cuda':
+                # Embeddings are normalized, so FP16 costs negligible recall
+                # while halving memory traffic and using tensor cores
+                self.model.half()
+                logger.info("Using FP16 weights for CUDA inference.")
             logger.info(f"Successfully loaded Sentence Transformer model: {self.model_name}")
         except Exception as e:
             logger.error(f"Failed to load Sentence Transformer model '{self.model_name}': {e}", exc_info=True)
             raise
 
+        # ONNX Runtime session replacing the transformer forward pass, if enabled
+        self.onnx_session = None
+        backend = getattr(settings, "embedding_backend", "torch")
+        if backend == TORCH_INT8_BACKEND and self.device == 'cpu':
+            try:
+                # int8 weights for every Linear layer; runs on oneDNN/VNNI int8 GEMMs
+                self.model = torch.ao.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                logger.info("Using dynamically int8-quantized torch model for CPU embeddings.")
+            except Exception as e:
+                logger.warning(f"Could not quantize embedding model, keeping FP32 weights: {e}", exc_info=True)
+        if backend in ONNX_BACKENDS and self.device == 'cpu':
+            try:
+                self.onnx_session = self._load_onnx_session(
+                    Path(settings.embedding_onnx_dir), quantize=backend == "onnx-int8"
+                )
+                logger.info(f"Using ONNX Runtime ({backend}) for CPU embeddings.")
+            except Exception as e:
+                logger.warning(f"Could not set up ONNX Runtime backend, falling back to torch: {e}", exc_info=True)
+
     def _get_optimal_device(self) -> str:
         """Determines the best available device for computations.
         
@@ -60,6 +95,120 @@ class BGELocalEmbeddings(EmbeddingInterface):
             logger.info("No GPU detected. Using CPU for embeddings.")
             return 'cpu'
 
+    def _load_onnx_session(self, cache_dir: Path, quantize: bool):
+        """Exports the model's transformer to ONNX (once) and opens a CPU session.
+
+        Only the transformer runs in ONNX Runtime; tokenization, pooling and
+        normalization still use the SentenceTransformer modules, so outputs
+        match the torch path. The export is cached per model under cache_dir.
+
+        Args:
+            cache_dir: Directory for exported model files.
+            quantize: If True, use a dynamically int8-quantized copy.
+
+        Returns:
+            An onnxruntime.InferenceSession on the CPUExecutionProvider.
+
+        Raises:
+            ImportError: If onnxruntime is not installed.
+        """
+        # onnxruntime ships with chromadb; imported lazily since only CPU deployments need it
+        import onnxruntime
+
+        model_stem = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.model_name)
+        onnx_path = cache_dir / f"{model_stem}.onnx"
+        features = self.model.tokenize(["warmup"])
+        input_names = list(features.keys())
+        if not onnx_path.exists():
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            logger.info(f"Exporting {self.model_name} to ONNX at {onnx_path}...")
+
+            class _TokenEmbeddings(torch.nn.Module):
+                def __init__(self, auto_model: torch.nn.Module):
+                    super().__init__()
+                    self.auto_model = auto_model
+
+                def forward(self, *inputs):
+                    return self.auto_model(**dict(zip(input_names, inputs)), return_dict=True).last_hidden_state
+
+            dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+            dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+            with torch.no_grad():
+                torch.onnx.export(
+                    _TokenEmbeddings(self.model[0].auto_model).eval(),
+                    tuple(features[name] for name in input_names),
+                    str(onnx_path),
+                    input_names=input_names,
+                    output_names=["token_embeddings"],
+                    dynamic_axes=dynamic_axes,
+                    opset_version=ONNX_OPSET,
+                )
+        if quantize:
+            quantized_path = onnx_path.with_name(f"{model_stem}.int8.onnx")
+            if not quantized_path.exists():
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                logger.info(f"Quantizing ONNX model to int8 at {quantized_path}...")
+                quantize_dynamic(str(onnx_path), str(quantized_path), weight_type=QuantType.QInt8)
+            onnx_path = quantized_path
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        return onnxruntime.InferenceSession(
+            str(onnx_path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+
+    def _forward(self, features: dict) -> torch.Tensor:
+        """Runs one tokenized batch through the model, returning sentence embeddings."""
+        if self.onnx_session is None:
+            return self.model(features)['sentence_embedding']
+        onnx_inputs = {i.name: features[i.name].numpy() for i in self.onnx_session.get_inputs()}
+        token_embeddings = self.onnx_session.run(["token_embeddings"], onnx_inputs)[0]
+        features['token_embeddings'] = torch.from_numpy(token_embeddings)
+        # Remaining SentenceTransformer modules: pooling, normalization, ...
+        for module in list(self.model)[1:]:
+            features = module(features)
+        return features['sentence_embedding']
+
+    def _encode_batches(self, texts: List[str]) -> torch.Tensor:
+        """Encodes texts in length-sorted, pre-tokenized batches.
+
+        Texts are sorted by length so each batch pads to a similar length,
+        wasting fewer tokens. On CUDA, token tensors are copied from pinned
+        memory with ``non_blocking=True`` on a dedicated copy stream and
+        results stay on the device until the end, so tokenizing and copying
+        batch N+1 overlaps with the forward pass of batch N.
+
+        Args:
+            texts: The strings to encode.
+
+        Returns:
+            A CPU float tensor of shape (len(texts), dim) in input order.
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        # H2D copies on their own stream, so they don't queue behind the previous forward pass
+        copy_stream = torch.cuda.Stream() if self.device == 'cuda' else None
+        outputs = []
+        with torch.inference_mode():
+            for offset in range(0, len(order), ENCODE_BATCH_SIZE):
+                batch_texts = [texts[i] for i in order[offset:offset + ENCODE_BATCH_SIZE]]
+                features = self.model.tokenize(batch_texts)
+                if copy_stream is not None:
+                    with torch.cuda.stream(copy_stream):
+                        features = {k: v.pin_memory().to(self.device, non_blocking=True) for k, v in features.items()}
+                    compute_stream = torch.cuda.current_stream()
+                    compute_stream.wait_stream(copy_stream)
+                    for tensor in features.values():
+                        # Keep the allocator from reusing the buffers while compute reads them
+                        tensor.record_stream(compute_stream)
+                else:
+                    features = {k: v.to(self.device) for k, v in features.items()}
+                outputs.append(self._forward(features))
+        # Single device->host sync for the whole call; return FP32 for the vector store
+        sorted_embeddings = torch.cat(outputs).float().cpu()
+        embeddings = torch.empty_like(sorted_embeddings)
+        embeddings[torch.tensor(order)] = sorted_embeddings
+        return embeddings
+
     def embed_documents(self, texts: List[str]) -> List[EmbeddingVector]:
         """Generates embeddings for a list of documents.
 
@@ -72,14 +221,14 @@ class BGELocalEmbeddings(EmbeddingInterface):
         Raises:
             Exception: If the embedding model fails.
         """
+        if not texts:
+            return []
         logger.debug(f"Generating embeddings for {len(texts)} documents using {self.model_name}.")
         try:
-            # The model.encode method handles batching internally
-            # Convert result to list of lists of floats for type consistency
-            embeddings = self.model.encode(texts, convert_to_tensor=False, device=self.device)
+            embeddings = self._encode_batches(texts)
             logger.info(f"Successfully generated embeddings for {len(texts)} documents.")
             # Ensure the output is List[List[float]]
-            return [embedding.tolist() for embedding in embeddings]
+            return embeddings.tolist()
         except Exception as e:
             logger.error(f"Failed to generate document embeddings with {self.model_name}: {e}", exc_info=True)
             raise
@@ -98,7 +247,11 @@ class BGELocalEmbeddings(EmbeddingInterface):
         """
         logger.debug(f"Generating embedding for query using {self.model_name}.")
         try:
-            embedding = self.model.encode(text, convert_to_tensor=False, device=self.device)
+            if self.onnx_session is not None:
+                embedding = self._encode_batches([text])[0].numpy()
+            else:
+                with torch.inference_mode():
+                    embedding = self.model.encode(text, convert_to_tensor=False, device=self.device)
             logger.info("Successfully generated embedding for query.")
             # Ensure the output is List[float]
             return embedding.tolist()
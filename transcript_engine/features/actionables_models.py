@@ -1,7 +1,7 @@
 """Pydantic models for the Actionable Items feature."""
 
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, field_validator
+from typing import Any, Dict, Literal, Optional, List
 
 class CandidateActionableItem(BaseModel):
     """Represents a candidate actionable item identified by the local LLM."""
@@ -9,6 +9,18 @@ class CandidateActionableItem(BaseModel):
     suggested_category: str # E.g., "REMINDER", "EVENT", "TASK"
     raw_entities: Optional[str] = None # Raw text of any identified entities
 
+class ScanItem(BaseModel):
+    """One item of the local LLM's JSON scan output; invalid categories fail validation."""
+    snippet: str
+    suggested_category: Literal["REMINDER", "EVENT", "TASK"]
+    raw_entities: Optional[str] = None
+
+    @field_validator("suggested_category", mode="before")
+    @classmethod
+    def normalize_category(cls, value: Any) -> Any:
+        """Accepts categories in any case or padding, as the line parser did."""
+        return value.strip().upper() if isinstance(value, str) else value
+
 # --- Schemas for Structured Data Extraction (for Google Services) ---
 
 class GoogleCalendarEventSchema(BaseModel):
@@ -19,6 +31,19 @@ class GoogleCalendarEventSchema(BaseModel):
     location: Optional[str] = None
     attendees: Optional[List[str]] = None # List of email addresses
 
+    def to_calendar_body(self) -> Dict[str, Any]:
+        """Builds the Calendar API event body directly, leaving out unset optional fields."""
+        body: Dict[str, Any] = {"summary": self.title, "start": {"dateTime": self.start_datetime}}
+        if self.end_datetime is not None:
+            body["end"] = {"dateTime": self.end_datetime}
+        if self.description is not None:
+            body["description"] = self.description
+        if self.location is not None:
+            body["location"] = self.location
+        if self.attendees:
+            body["attendees"] = [{"email": email} for email in self.attendees]
+        return body
+
 class GoogleTaskSchema(BaseModel):
     title: str
     due_date: Optional[str] = None # ISO 8601 date format, e.g., "2024-07-15"
@@ -4,23 +4,221 @@ This service will contain the core logic for identifying candidates
 from transcript segments using an LLM and parsing the results.
 """
 
+import hashlib
+import json
 import logging
+import sys
+import threading
+from collections import OrderedDict
 from datetime import date
-from typing import List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 import re # For parsing LLM output
 
+from pydantic import ValidationError
+
+try:
+    import orjson # Installed alongside chromadb; C parser, raises a json.JSONDecodeError subclass
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from transcript_engine.interfaces.llm_interface import LLMInterface
 from transcript_engine.features.actionables_models import (
     CandidateActionableItem, 
     GoogleCalendarEventSchema, 
     GoogleTaskSchema, 
-    GoogleReminderSchema
+    GoogleReminderSchema,
+    ScanItem,
 )
 from transcript_engine.core.config import get_settings
 from transcript_engine.features.actionables_models import CandidateActionableItem
 
 logger = logging.getLogger(__name__)
 
+# Line markers in the scan response; compiled once and tolerant of extra
+# whitespace and case (e.g. "  -   snippet:" or "Category:EVENT")
+_ITEM_START_RE = re.compile(r"^[ \t]*-[ \t]*Snippet[ \t]*:", re.IGNORECASE)
+_CATEGORY_RE = re.compile(r"^\s*Category\s*:\s*(.*)$", re.IGNORECASE)
+_ENTITIES_RE = re.compile(r"^\s*Entities\s*:\s*(.*)$", re.IGNORECASE)
+# Interned, so a parsed category that passes the check is the same shared string object
+_VALID_CATEGORIES = frozenset(map(sys.intern, ("REMINDER", "EVENT", "TASK")))
+
+# Static part of the scan prompt. It comes first and never varies, so the
+# backend can reuse the cached prefix across scans (Ollama keeps the KV
+# cache of a matching prompt prefix; hosted APIs cache long static prefixes)
+_SCAN_PROMPT_PREAMBLE = """System: You are an AI assistant helping to extract actionable items from conversation transcripts. Analyze the transcript segment given at the end of this prompt. Identify any phrases or sentences that suggest a reminder, a calendar event/meeting, or a task.
+
+For each item found, provide:
+1. The exact text snippet.
+2. Your suggested category (must be one of: REMINDER, EVENT, TASK).
+3. Any people, specific times, or dates mentioned in the snippet, as heard.
+
+Respond with JSON only, in the form {"items": [{"snippet": "...", "suggested_category": "REMINDER", "raw_entities": "..."}]}, where suggested_category is one of REMINDER, EVENT, TASK and raw_entities may be null. If no items are found, respond with {"items": []}.
+"""
+
+# Scan results kept in memory, so re-scanning the same window (UI refresh,
+# retries) skips the LLM call
+SCAN_CACHE_MAX_ENTRIES = 256 # Least recently used entries are evicted first
+
+# (segment digest, date ordinal, timeframe) -> candidates, in LRU order
+_scan_cache: "OrderedDict[Tuple[bytes, int, str], List[CandidateActionableItem]]" = OrderedDict()
+_scan_cache_lock = threading.Lock() # Scans run in the threadpool
+
+# States of the scan response parser: which field unmarked lines continue
+_IDLE, _IN_SNIPPET, _IN_ENTITIES = range(3)
+
+def _build_candidate(
+    snippet_lines: List[str],
+    category_text: Optional[str],
+    entities_lines: List[str],
+) -> Optional[CandidateActionableItem]:
+    """Builds a candidate from one parsed item's accumulated lines.
+
+    Returns:
+        The CandidateActionableItem, or None if the item has no snippet or
+        no valid category.
+    """
+    snippet_text = "\n".join(snippet_lines).strip()
+    if not snippet_text: # If snippet is empty after processing, skip
+        logger.warning("Parsed an item block but snippet was empty.")
+        return None
+    if not category_text: # Category is mandatory along with snippet
+        logger.warning(f"Found snippet '{snippet_text[:50]}...' but no valid category. Skipping item.")
+        return None
+
+    # None when no "Entities:" line was found for this item; entities are
+    # normalized to lowercase with one lower() over the joined text
+    entities_text = "\n".join(entities_lines).strip().lower() if entities_lines else None
+    try:
+        candidate = CandidateActionableItem(
+            snippet=snippet_text,
+            suggested_category=category_text,
+            raw_entities=entities_text
+        )
+    except Exception as e:
+        logger.error(f"Error creating CandidateActionableItem for snippet '{snippet_text[:50]}...': {e}", exc_info=True)
+        return None
+    logger.debug(f"Parsed actionable candidate: {candidate}")
+    return candidate
+
+def _parse_json_scan_response(raw_llm_response: str) -> Optional[List[CandidateActionableItem]]:
+    """Parses a JSON scan response ({"items": [...]}) into candidates.
+
+    Each item is validated against ScanItem, so items with an invalid
+    category or a missing snippet are dropped individually.
+
+    Args:
+        raw_llm_response: The LLM's scan response text.
+
+    Returns:
+        The valid candidates, or None if the response is not a JSON object
+        with an "items" list (the caller then falls back to the line format).
+    """
+    try:
+        payload = _json_loads(raw_llm_response)
+    except json.JSONDecodeError:
+        return None
+    items = payload.get("items") if isinstance(payload, dict) else None
+    if not isinstance(items, list):
+        return None
+
+    candidates: List[CandidateActionableItem] = []
+    for item in items:
+        try:
+            scan_item = ScanItem.model_validate(item)
+        except ValidationError as e:
+            logger.warning(f"Skipping invalid scan item {item!r}: {e}")
+            continue
+        if not scan_item.snippet.strip():
+            logger.warning("Parsed a scan item but snippet was empty.")
+            continue
+        raw_entities = scan_item.raw_entities.strip().lower() if scan_item.raw_entities else None
+        candidates.append(CandidateActionableItem(
+            snippet=scan_item.snippet.strip(),
+            suggested_category=scan_item.suggested_category,
+            raw_entities=raw_entities or None,
+        ))
+    return candidates
+
+def _parse_scan_response(raw_llm_response: str) -> List[CandidateActionableItem]:
+    """Parses a line-format scan response in a single pass over its lines.
+
+    A "- Snippet:" line starts an item; its text and any following unmarked
+    lines form the snippet. "Category:" sets the category and "Entities:"
+    starts the entities, which may also continue over several lines. Each
+    item is emitted when the next one starts or the response ends. Lines
+    before the first item and blank lines are ignored.
+
+    Args:
+        raw_llm_response: The LLM's scan response text.
+
+    Returns:
+        The candidates with a snippet and a valid category, in order.
+    """
+    candidates: List[CandidateActionableItem] = []
+    state = _IDLE
+    in_item = False
+    snippet_lines: List[str] = []
+    entities_lines: List[str] = []
+    category_text: Optional[str] = None
+
+    for line in raw_llm_response.splitlines():
+        item_start = _ITEM_START_RE.match(line)
+        if item_start:
+            if in_item:
+                candidate = _build_candidate(snippet_lines, category_text, entities_lines)
+                if candidate is not None:
+                    candidates.append(candidate)
+            in_item = True
+            state = _IN_SNIPPET
+            snippet_lines = [line[item_start.end():].strip()]
+            entities_lines = []
+            category_text = None
+            continue
+        if not in_item:
+            continue # Preamble before the first item
+
+        category_match = _CATEGORY_RE.match(line)
+        if category_match:
+            state = _IDLE
+            category_text = sys.intern(category_match.group(1).strip().upper())
+            # Validate category - simple check for now
+            if category_text not in _VALID_CATEGORIES:
+                logger.warning(f"LLM returned invalid category '{category_text}'. Skipping this part of item.")
+                category_text = None
+            continue
+        entities_match = _ENTITIES_RE.match(line)
+        if entities_match:
+            state = _IN_ENTITIES
+            entities_lines.append(entities_match.group(1).strip()) # Start of entities
+            continue
+
+        # Continue accumulating multiline content based on current field
+        line_stripped = line.strip()
+        if not line_stripped:
+            continue
+        if state == _IN_SNIPPET:
+            snippet_lines.append(line_stripped)
+        elif state == _IN_ENTITIES:
+            entities_lines.append(line_stripped)
+
+    if in_item:
+        candidate = _build_candidate(snippet_lines, category_text, entities_lines)
+        if candidate is not None:
+            candidates.append(candidate)
+    return candidates
+
+def _scan_cache_key(transcript_segment: str, target_date: date, timeframe_key: str) -> Tuple[bytes, int, str]:
+    """Builds the scan cache key; a 16-byte digest stands in for the segment text."""
+    digest = hashlib.blake2b(transcript_segment.encode("utf-8"), digest_size=16).digest()
+    return (digest, target_date.toordinal(), timeframe_key)
+
+def clear_scan_cache() -> None:
+    """Drops all cached scan results."""
+    with _scan_cache_lock:
+        _scan_cache.clear()
+
 def scan_transcript_for_actionables(
     transcript_segment: str,
     llm_service: LLMInterface,
@@ -29,6 +227,10 @@ def scan_transcript_for_actionables(
 ) -> List[CandidateActionableItem]:
     """Scans a transcript segment for actionable items using an LLM.
 
+    Results are cached in memory (LRU, SCAN_CACHE_MAX_ENTRIES entries) by
+    segment digest, date and timeframe, so a repeated scan of the same
+    window returns without calling the LLM. Failed LLM calls are not cached.
+
     Args:
         transcript_segment: The text content of the transcript for the timeframe.
         llm_service: An instance of an LLM service (conforming to LLMInterface).
@@ -42,126 +244,73 @@ def scan_transcript_for_actionables(
         logger.info("Transcript segment is empty. No actionables to scan.")
         return []
 
-    # Construct the prompt for the LLM
+    cache_key = _scan_cache_key(transcript_segment, target_date, timeframe_key)
+    with _scan_cache_lock:
+        cached = _scan_cache.get(cache_key)
+        if cached is not None:
+            _scan_cache.move_to_end(cache_key)
+    if cached is not None:
+        logger.info(f"Using cached scan result for the {timeframe_key} of {target_date} ({len(cached)} items).")
+        return list(cached)
+
+    candidates = _scan_with_llm(transcript_segment, llm_service, target_date, timeframe_key)
+    if candidates is None:
+        return [] # Not cached, so a retry asks the LLM again
+
+    with _scan_cache_lock:
+        _scan_cache[cache_key] = candidates
+        _scan_cache.move_to_end(cache_key)
+        if len(_scan_cache) > SCAN_CACHE_MAX_ENTRIES:
+            _scan_cache.popitem(last=False)
+    return list(candidates)
+
+def _scan_with_llm(
+    transcript_segment: str,
+    llm_service: LLMInterface,
+    target_date: date,
+    timeframe_key: str,
+) -> Optional[List[CandidateActionableItem]]:
+    """Asks the LLM for the segment's actionable items and parses its reply.
+
+    Returns:
+        The parsed candidates (possibly empty), or None if the LLM call failed.
+    """
+    # Construct the prompt for the LLM: the shared preamble first, then the
+    # per-call date, timeframe and segment
     # Ensure date is formatted to string for the prompt
     formatted_date = target_date.strftime('%Y-%m-%d')
-    system_prompt = f"""System: You are an AI assistant helping to extract actionable items from conversation transcripts. Analyze the following transcript segment from the {timeframe_key} of {formatted_date}. Identify any phrases or sentences that suggest a reminder, a calendar event/meeting, or a task.
-
-For each item found, provide:
-1. The exact text snippet.
-2. Your suggested category (must be one of: REMINDER, EVENT, TASK).
-3. Any people, specific times, or dates mentioned in the snippet, as heard.
-
-Transcript Segment:
+    system_prompt = f"""{_SCAN_PROMPT_PREAMBLE}
+Transcript Segment (from the {timeframe_key} of {formatted_date}):
 ---
 {transcript_segment}
 ---
 
-Identified Items (provide as a list, each item starting with '- Snippet:', then '  Category:', then '  Entities:', each on a new line. If no items are found, respond with "No actionable items found."):
+Identified Items:
 """
 
     logger.debug(f"Sending prompt to LLM for actionable items scan:\n{system_prompt}")
 
     try:
-        raw_llm_response = llm_service.generate(prompt=system_prompt)
+        # JSON mode constrains the output to valid JSON for the schema in the prompt
+        raw_llm_response = llm_service.generate(prompt=system_prompt, format="json")
         logger.debug(f"Raw LLM response:\n{raw_llm_response}")
     except Exception as e:
         logger.error(f"Error calling LLM service: {e}", exc_info=True)
-        return []
+        return None
 
-    if not raw_llm_response or raw_llm_response.strip().lower() == "no actionable items found." or "no actionable items found" in raw_llm_response.lower():
+    # The substring test also covers an exact "No actionable items found." reply
+    if not raw_llm_response or "no actionable items found" in raw_llm_response.lower():
         logger.info("LLM indicated no actionable items found.")
         return []
 
-    # Parse the LLM output
-    # This parsing logic assumes the LLM follows the specified format reasonably well.
-    # It looks for items starting with "- Snippet:"
-    # Each item is expected to have "Category:" and "Entities:" on subsequent lines.
-    
-    candidates: List[CandidateActionableItem] = []
-    # Split the response into potential items. Each item starts with "- Snippet:"
-    # Using a regex that captures content after markers and handles optional multiline snippets.
-    # This regex is a bit more robust to variations in spacing and newlines.
-    # It looks for "- Snippet:" then captures everything until "Category:", etc.
-    
-    # Regex to find blocks: starts with "- Snippet:", then "Category:", then "Entities:"
-    # It allows for multiline content in snippet and entities.
-    # (?s) is for DOTALL mode, making . match newlines.
-    # item_pattern = re.compile(r"- Snippet:(.*?)(?:\n\s*Category:(.*?))?(?:\n\s*Entities:(.*?))?(?=\n- Snippet:|$)", re.DOTALL | re.IGNORECASE)
-
-    # Simpler line-by-line parsing might be more robust initially if LLM output is clean item per item.
-    # Let's try splitting by "- Snippet:" first, then processing each block.
-    
-    raw_items = raw_llm_response.split("- Snippet:")
-    
-    for raw_item_block in raw_items:
-        if not raw_item_block.strip(): # Skip empty blocks (e.g., from the first split if response starts with "- Snippet:")
-            continue
-
-        snippet_text: Optional[str] = None
-        category_text: Optional[str] = None
-        entities_text: Optional[str] = None
-
-        lines = raw_item_block.strip().split('\n')
-        
-        # The first line of the block (after "- Snippet:") is the snippet itself.
-        # It might be multiline, so we need to reconstruct it carefully if parsing line by line.
-        current_parsing_field = "snippet" # Default to snippet
-        current_snippet_lines = []
-        current_entities_lines = []
-
-        # First line is snippet content (or start of it)
-        if lines:
-            first_line_content = lines.pop(0).strip()
-            current_snippet_lines.append(first_line_content)
-
-        for line in lines:
-            line_stripped = line.strip()
-            if line_stripped.lower().startswith("category:"):
-                current_parsing_field = "category"
-                category_text = line_stripped.lower().replace("category:", "", 1).strip().upper()
-                # Validate category - simple check for now
-                if category_text not in ["REMINDER", "EVENT", "TASK"]:
-                    logger.warning(f"LLM returned invalid category '{category_text}'. Skipping this part of item.")
-                    category_text = None # Or a default, or skip item
-                continue
-            elif line_stripped.lower().startswith("entities:"):
-                current_parsing_field = "entities"
-                entities_text = line_stripped.lower().replace("entities:", "", 1).strip()
-                current_entities_lines.append(entities_text) # Start of entities
-                continue
-            
-            # Continue accumulating multiline content based on current field
-            if current_parsing_field == "snippet":
-                current_snippet_lines.append(line.strip()) # Keep original spacing for snippet lines
-            elif current_parsing_field == "entities":
-                current_entities_lines.append(line.strip())
-        
-        snippet_text = "\n".join(current_snippet_lines).strip()
-        if not snippet_text: # If snippet is empty after processing, skip
-            logger.warning(f"Parsed an item block but snippet was empty. Block: {raw_item_block}")
-            continue
-            
-        if current_entities_lines: # If entities parsing started
-             entities_text = "\n".join(current_entities_lines).strip()
-        elif entities_text: # If entities was single line and already captured
-            pass # entities_text is already set
-        else: # No entities found for this item
-            entities_text = None
-
-        if snippet_text and category_text: # Category is mandatory along with snippet
-            try:
-                candidate = CandidateActionableItem(
-                    snippet=snippet_text,
-                    suggested_category=category_text,
-                    raw_entities=entities_text
-                )
-                candidates.append(candidate)
-                logger.debug(f"Parsed actionable candidate: {candidate}")
-            except Exception as e:
-                logger.error(f"Error creating CandidateActionableItem for snippet '{snippet_text[:50]}...': {e}", exc_info=True)
-        elif snippet_text and not category_text:
-             logger.warning(f"Found snippet '{snippet_text[:50]}...' but no valid category. Skipping item.")
+    # Parse the LLM output: JSON as requested; backends or models that ignore
+    # JSON mode may still answer in the "- Snippet:/Category:/Entities:" line format
+    candidates = _parse_json_scan_response(raw_llm_response)
+    if candidates is None:
+        candidates = _parse_scan_response(raw_llm_response)
+    elif not candidates:
+        logger.info("LLM indicated no actionable items found.")
+        return []
 
     if not candidates and raw_llm_response and raw_llm_response.strip():
         logger.warning(f"LLM response was not empty but no actionable items could be parsed. Response: {raw_llm_response}")
@@ -170,7 +319,6 @@ Identified Items (provide as a list, each item starting with '- Snippet:', then
 
 # New function starts here
 from openai import OpenAI # Added
-import json # Added
 from transcript_engine.core.config import get_settings # Added
 from transcript_engine.features.actionables_models import (
     GoogleCalendarEventSchema, 
@@ -178,99 +326,198 @@ from transcript_engine.features.actionables_models import (
     GoogleReminderSchema
 ) # Specific models for this function
 
-def extract_structured_data_for_item(
-    item_snippet: str, 
-    item_category: str, 
-    target_date: date # Added to provide context for relative dates like "tomorrow"
-) -> Optional[dict]:
-    """Extracts structured data from a snippet using a cloud LLM (OpenAI) with function calling.
+@lru_cache(maxsize=4)
+def _get_openai_client(api_key: str) -> OpenAI:
+    """Returns a shared OpenAI client per API key, reusing its pooled connections."""
+    return OpenAI(api_key=api_key)
+
+# Target schema per confirmed category
+_SCHEMA_MAP = {
+    "EVENT": GoogleCalendarEventSchema,
+    "TASK": GoogleTaskSchema,
+    "REMINDER": GoogleReminderSchema,
+}
+
+def _function_name(item_category: str) -> str:
+    """Returns the tool name used for a category, e.g. "create_google_event"."""
+    return f"create_google_{item_category.lower()}"
+
+# Tool definition per category, built once at import: model_json_schema()
+# walks the model's fields and would otherwise run on every request
+_TOOLS: Dict[str, Dict[str, Any]] = {
+    item_category: {
+        "type": "function",
+        "function": {
+            "name": _function_name(item_category),
+            "description": f"Extract details for a {item_category.lower()} from the text and populate the fields.",
+            "parameters": TargetSchema.model_json_schema()
+        }
+    }
+    for item_category, TargetSchema in _SCHEMA_MAP.items()
+}
+
+def _validate_tool_call(tool_call: Any, item_category: str) -> Optional[dict]:
+    """Parses and validates one tool call's arguments against the category's schema.
+
+    Returns:
+        The validated data as a dict, or None if the call is for another
+        function or its arguments do not parse or validate.
+    """
+    function_name = _function_name(item_category)
+    if tool_call.function.name != function_name:
+        logger.warning(f"OpenAI called '{tool_call.function.name}' where '{function_name}' was expected.")
+        return None
+    TargetSchema = _SCHEMA_MAP[item_category]
+    function_args_json = tool_call.function.arguments
+    logger.debug(f"OpenAI returned function call with arguments: {function_args_json}")
+    try:
+        extracted_data_dict = _json_loads(function_args_json)
+        validated_data = TargetSchema(**extracted_data_dict)
+        logger.info(f"Successfully extracted and validated structured data for {item_category}: {validated_data.model_dump()}")
+        return validated_data.model_dump() # Return as dict
+    except json.JSONDecodeError as json_err:
+        logger.error(f"Failed to parse JSON arguments from OpenAI: {json_err}. Raw args: {function_args_json}", exc_info=True)
+        return None
+    except Exception as pydantic_err: # Catches Pydantic validation errors
+        logger.error(f"Failed to validate extracted data against {TargetSchema.__name__}: {pydantic_err}. Raw data: {function_args_json}", exc_info=True)
+        return None
+
+def extract_structured_data_batch(
+    items: List[Tuple[str, str]],
+    target_date: date, # Provides context for relative dates like "tomorrow"
+) -> List[Optional[dict]]:
+    """Extracts structured data for several snippets with one OpenAI request.
+
+    All valid items go into a single chat completion that offers one tool
+    per category involved; the model is asked for exactly one tool call
+    per item, in order (parallel tool calls), and the calls are matched back
+    to the items by position. If the number of calls does not match the
+    number of items, the batch result is discarded and each item is
+    extracted with its own request. A single item forces its tool instead.
 
     Args:
-        item_snippet: The text snippet of the confirmed actionable item.
-        item_category: The final category ("EVENT", "TASK", "REMINDER") of the item.
+        items: (snippet, category) pairs; category is "EVENT", "TASK" or "REMINDER".
         target_date: The date the original transcript segment was for, to help resolve relative dates.
 
     Returns:
-        A dictionary representing the structured data (validated against the Pydantic schema),
-        or None if extraction fails or API key is not configured.
+        One entry per input item, in order: the structured data (validated
+        against the category's Pydantic schema) as a dict, or None if the
+        item is invalid, extraction failed or the API key is not configured.
     """
+    results: List[Optional[dict]] = [None] * len(items)
+    # (position in items, snippet, category) of the items worth a request
+    pending: List[Tuple[int, str, str]] = []
+    for position, (item_snippet, item_category) in enumerate(items):
+        # Cheap local guards first: malformed items never cost a settings
+        # lookup or a network round trip
+        if item_category not in _TOOLS:
+            logger.error(f"Invalid item_category: {item_category} for structured extraction.")
+        elif not item_snippet or item_snippet.isspace():
+            logger.info("Item snippet is empty. Skipping structured data extraction.")
+        else:
+            pending.append((position, item_snippet, item_category))
+    if not pending:
+        return results
+
     settings = get_settings()
     if not settings.OPENAI_API_KEY:
         logger.warning("OpenAI API key is not configured. Skipping structured data extraction.")
-        return None
+        return results
 
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    client = _get_openai_client(settings.OPENAI_API_KEY)
 
-    schema_map = {
-        "EVENT": GoogleCalendarEventSchema,
-        "TASK": GoogleTaskSchema,
-        "REMINDER": GoogleReminderSchema,
-    }
+    # One tool per distinct category, in first-seen order
+    categories = list(dict.fromkeys(item_category for _, _, item_category in pending))
+    tools = [_TOOLS[item_category] for item_category in categories]
 
-    if item_category not in schema_map:
-        logger.error(f"Invalid item_category: {item_category} for structured extraction.")
-        return None
-
-    TargetSchema = schema_map[item_category]
-    function_name = f"create_google_{item_category.lower()}"
-    
-    tools = [
-        {
-            "type": "function",
-            "function": {
-                "name": function_name,
-                "description": f"Extract details for a {item_category.lower()} from the text and populate the fields.",
-                "parameters": TargetSchema.model_json_schema()
-            }
+    if len(pending) == 1:
+        _, item_snippet, item_category = pending[0]
+        user_content = f"Based on the following text, extract the details to populate the {item_category.lower()} structure: '{item_snippet}'"
+        tool_options: Dict[str, Any] = {
+            "tool_choice": {"type": "function", "function": {"name": _function_name(item_category)}} # Force call this function
         }
-    ]
+    else:
+        numbered_items = "\n".join(
+            f"{number}. [{item_category}] '{item_snippet}'"
+            for number, (_, item_snippet, item_category) in enumerate(pending, start=1)
+        )
+        user_content = (
+            f"For each of the following {len(pending)} items, emit exactly one tool call, in the same order, "
+            f"using the create_google_<category> function for the item's category, and extract the details to populate it:\n{numbered_items}"
+        )
+        tool_options = {"tool_choice": "required", "parallel_tool_calls": True}
 
     current_date_for_context = target_date.strftime("%Y-%m-%d")
     
     prompt_messages = [
         {
             "role": "system", 
-            "content": f"You are an expert assistant that extracts structured information from text. Today's date for context is {current_date_for_context}. When extracting datetimes, provide them in ISO 8601 format. For calendar events, if no end time is specified but a start time is, assume a 1-hour duration if reasonable for the context, otherwise leave end_datetime null. For tasks, if no due date is specified, leave due_date null."
+            # Static instructions first and the date last, keeping the prefix cacheable
+            "content": f"You are an expert assistant that extracts structured information from text. When extracting datetimes, provide them in ISO 8601 format. For calendar events, if no end time is specified but a start time is, assume a 1-hour duration if reasonable for the context, otherwise leave end_datetime null. For tasks, if no due date is specified, leave due_date null. Today's date for context is {current_date_for_context}."
         },
         {
             "role": "user", 
-            "content": f"Based on the following text, extract the details to populate the {item_category.lower()} structure: '{item_snippet}'"
+            "content": user_content
         }
     ]
 
-    logger.debug(f"Sending request to OpenAI for structured extraction. Model: {settings.OPENAI_CHAT_MODEL_NAME}, Function: {function_name}")
+    logger.debug(f"Sending request to OpenAI for structured extraction of {len(pending)} items. Model: {settings.OPENAI_CHAT_MODEL_NAME}, Categories: {categories}")
     logger.debug(f"Prompt messages: {prompt_messages}")
-    logger.debug(f"Tool definition (parameters schema): {tools[0]['function']['parameters']}")
 
     try:
         response = client.chat.completions.create(
             model=settings.OPENAI_CHAT_MODEL_NAME,
             messages=prompt_messages,
             tools=tools,
-            tool_choice={"type": "function", "function": {"name": function_name}} # Force call this function
+            **tool_options,
         )
         
-        message = response.choices[0].message
-        if message.tool_calls and message.tool_calls[0].function.name == function_name:
-            function_args_json = message.tool_calls[0].function.arguments
-            logger.debug(f"OpenAI returned function call with arguments: {function_args_json}")
-            try:
-                extracted_data_dict = json.loads(function_args_json)
-                validated_data = TargetSchema(**extracted_data_dict)
-                logger.info(f"Successfully extracted and validated structured data for {item_category}: {validated_data.model_dump()}")
-                return validated_data.model_dump() # Return as dict
-            except json.JSONDecodeError as json_err:
-                logger.error(f"Failed to parse JSON arguments from OpenAI: {json_err}. Raw args: {function_args_json}", exc_info=True)
-                return None
-            except Exception as pydantic_err: # Catches Pydantic validation errors
-                logger.error(f"Failed to validate extracted data against {TargetSchema.__name__}: {pydantic_err}. Raw data: {function_args_json}", exc_info=True)
-                return None
-        else:
-            logger.warning(f"OpenAI did not return the expected function call. Response message: {message}")
-            return None
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            prompt_details = getattr(usage, "prompt_tokens_details", None)
+            logger.debug(
+                "OpenAI prompt tokens: %s (cached: %s)",
+                usage.prompt_tokens,
+                getattr(prompt_details, "cached_tokens", 0),
+            )
 
+        message = response.choices[0].message
+        tool_calls = message.tool_calls or []
     except Exception as e:
         logger.error(f"Error calling OpenAI API for structured extraction: {e}", exc_info=True)
-        return None
+        return results
+
+    if len(tool_calls) != len(pending):
+        logger.warning(f"OpenAI returned {len(tool_calls)} function calls for {len(pending)} items. Response message: {message}")
+        if len(pending) > 1:
+            # A skipped or extra call shifts every later match, so positions
+            # cannot be trusted: extract each item on its own instead
+            for position, item_snippet, item_category in pending:
+                results[position] = extract_structured_data_batch([(item_snippet, item_category)], target_date)[0]
+        return results
+
+    # Calls are matched to items by position
+    for (position, _, item_category), tool_call in zip(pending, tool_calls):
+        results[position] = _validate_tool_call(tool_call, item_category)
 
-# Removed the duplicate TODO comment line that was at the end of the file previously 
\ No newline at end of file
+    return results
+
+def extract_structured_data_for_item(
+    item_snippet: str, 
+    item_category: str, 
+    target_date: date # Added to provide context for relative dates like "tomorrow"
+) -> Optional[dict]:
+    """Extracts structured data from a snippet using a cloud LLM (OpenAI) with function calling.
+
+    Single-item form of extract_structured_data_batch.
+
+    Args:
+        item_snippet: The text snippet of the confirmed actionable item.
+        item_category: The final category ("EVENT", "TASK", "REMINDER") of the item.
+        target_date: The date the original transcript segment was for, to help resolve relative dates.
+
+    Returns:
+        A dictionary representing the structured data (validated against the Pydantic schema),
+        or None if extraction fails or API key is not configured.
+    """
+    return extract_structured_data_batch([(item_snippet, item_category)], target_date)[0]
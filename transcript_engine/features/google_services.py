@@ -1,7 +1,8 @@
 """Service functions for interacting with Google Calendar and Google Tasks APIs."""
 
 import logging
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime
 
 from google.oauth2.credentials import Credentials
@@ -12,6 +13,51 @@ from transcript_engine.features.actionables_models import GoogleCalendarEventSch
 
 logger = logging.getLogger(__name__)
 
+SERVICE_CACHE_SIZE = 8 # Built services kept per thread before the cache is reset
+GOOGLE_API_NUM_RETRIES = 5 # Retries with exponential backoff on 5xx/429 responses
+
+# Built service objects per thread: httplib2 connections are not thread-safe,
+# but threadpool threads are reused, so each one builds a service only once
+_thread_services = threading.local()
+
+def _get_service(service_name: str, version: str, credentials: Credentials) -> Resource:
+    """Returns a service object for the API, reusing this thread's earlier build.
+
+    Credentials are reloaded from the token file on every request, so cached
+    services are keyed by the access token rather than the Credentials
+    object; a refreshed token builds a new service.
+
+    Args:
+        service_name: The API name, e.g. 'calendar'.
+        version: The API version, e.g. 'v3'.
+        credentials: Authenticated Google OAuth2 credentials.
+
+    Returns:
+        The googleapiclient Resource for the API.
+    """
+    token = getattr(credentials, "token", None)
+    if not token:
+        return build(service_name, version, credentials=credentials) # Nothing to key on yet
+    services: Optional[Dict[Tuple[str, str, str], Resource]] = getattr(_thread_services, "by_key", None)
+    if services is None:
+        services = _thread_services.by_key = {}
+    key = (service_name, version, token)
+    service = services.get(key)
+    if service is None:
+        if len(services) >= SERVICE_CACHE_SIZE:
+            services.clear() # Mostly services for expired tokens
+        service = services[key] = build(service_name, version, credentials=credentials)
+    return service
+
+def _is_transient(error: HttpError) -> bool:
+    """Whether the error is a rate limit or server error that may succeed later."""
+    status = error.resp.status
+    return status == 429 or status >= 500
+
+def clear_service_cache() -> None:
+    """Drops the calling thread's cached service objects."""
+    _thread_services.by_key = {}
+
 def add_to_google_calendar(credentials: Credentials, event_details: GoogleCalendarEventSchema) -> Optional[str]:
     """Adds an event to the user's primary Google Calendar.
 
@@ -22,58 +68,32 @@ def add_to_google_calendar(credentials: Credentials, event_details: GoogleCalend
 
     Returns:
         The HTML link to the created event, or None if creation failed.
+
+    Raises:
+        HttpError: For rate-limit or server errors that persist after
+            GOOGLE_API_NUM_RETRIES retries.
     """
     try:
-        service: Resource = build('calendar', 'v3', credentials=credentials)
+        service: Resource = _get_service('calendar', 'v3', credentials)
         
-        event_body = {
-            'summary': event_details.title,
-            'location': event_details.location,
-            'description': event_details.description,
-            'start': {
-                'dateTime': event_details.start_datetime,
-                # 'timeZone': 'America/Los_Angeles', # Optional: Consider user's timezone or UTC
-            },
-            'end': {
-                'dateTime': event_details.end_datetime,
-                # 'timeZone': 'America/Los_Angeles', # Optional
-            },
-            # 'recurrence': [
-            #     'RRULE:FREQ=DAILY;COUNT=2'
-            # ],
-            'attendees': [{'email': email} for email in event_details.attendees] if event_details.attendees else [],
-            # 'reminders': {
-            #     'useDefault': False,
-            #     'overrides': [
-            #         {'method': 'email', 'minutes': 24 * 60},
-            #         {'method': 'popup', 'minutes': 10},
-            #     ],
-            # },
-        }
-        # Filter out None values from event_body to avoid API errors for optional fields
-        event_body_cleaned = {k: v for k, v in event_body.items() if v is not None}
-        if 'start' in event_body_cleaned and event_body_cleaned['start'].get('dateTime') is None:
-            del event_body_cleaned['start'] # Or handle as error if start time is mandatory
-        if 'end' in event_body_cleaned and event_body_cleaned['end'].get('dateTime') is None:
-            del event_body_cleaned['end']
-        # Ensure start and end are present if their sub-fields were populated
-        if event_details.start_datetime and 'start' not in event_body_cleaned:
-             event_body_cleaned['start'] = {'dateTime': event_details.start_datetime}
-        if event_details.end_datetime and 'end' not in event_body_cleaned:
-             event_body_cleaned['end'] = {'dateTime': event_details.end_datetime}
-
-        logger.debug(f"Attempting to create Google Calendar event: {event_body_cleaned}")
+        # Optional fields are only added when set, so there is nothing to filter
+        # afterwards. Not sent yet: timeZone (start/end), recurrence, reminders
+        event_body = event_details.to_calendar_body()
+
+        logger.debug(f"Attempting to create Google Calendar event: {event_body}")
         
         created_event = service.events().insert(
             calendarId='primary', 
-            body=event_body_cleaned
-        ).execute()
+            body=event_body
+        ).execute(num_retries=GOOGLE_API_NUM_RETRIES)
         
         event_link = created_event.get('htmlLink')
         logger.info(f"Successfully created Google Calendar event. ID: {created_event['id']}, Link: {event_link}")
         return event_link
 
     except HttpError as error:
+        if _is_transient(error):
+            raise # Still failing after the retries; the caller can report or requeue it
         logger.error(f"An HTTP error occurred while creating Google Calendar event: {error}", exc_info=True)
         # You could parse error.content for more specific messages
         # error_details = error.resp.reason or error._get_reason()
@@ -95,9 +115,13 @@ def add_to_google_tasks(credentials: Credentials, task_details: GoogleTaskSchema
         The ID of the created task, or None if creation failed.
         (Google Tasks API v1 does not directly return an HTML link for a task,
          but returns the task resource which includes an ID).
+
+    Raises:
+        HttpError: For rate-limit or server errors that persist after
+            GOOGLE_API_NUM_RETRIES retries.
     """
     try:
-        service: Resource = build('tasks', 'v1', credentials=credentials)
+        service: Resource = _get_service('tasks', 'v1', credentials)
 
         task_body = {
             'title': task_details.title,
@@ -135,7 +159,7 @@ def add_to_google_tasks(credentials: Credentials, task_details: GoogleTaskSchema
         created_task = service.tasks().insert(
             tasklist='@default', 
             body=task_body_cleaned
-        ).execute()
+        ).execute(num_retries=GOOGLE_API_NUM_RETRIES)
 
         task_id = created_task.get('id')
         logger.info(f"Successfully created Google Task. ID: {task_id}")
@@ -145,6 +169,8 @@ def add_to_google_tasks(credentials: Credentials, task_details: GoogleTaskSchema
         return task_id 
 
     except HttpError as error:
+        if _is_transient(error):
+            raise # Still failing after the retries; the caller can report or requeue it
         logger.error(f"An HTTP error occurred while creating Google Task: {error}", exc_info=True)
         return None
     except Exception as e:
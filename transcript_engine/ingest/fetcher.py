@@ -4,11 +4,12 @@
 import logging
 import httpx
 import asyncio # Import asyncio for sleep
-from typing import List, Optional, Dict, Any
-from datetime import datetime, date, timezone
+from typing import Optional
+from datetime import datetime, date, timedelta, timezone, tzinfo
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from transcript_engine.database.models import TranscriptCreate
-from transcript_engine.core.config import Settings
 
 logger = logging.getLogger(__name__)
 
@@ -20,17 +21,23 @@ RATE_LIMIT_DELAY = 0.5 # Small delay between requests to be safe
 MAX_RETRIES = 10 # Increased retries
 INITIAL_RETRY_DELAY_SECONDS = 5 # Initial delay
 MAX_RETRY_DELAY_SECONDS = 60 # Cap delay at 1 minute
+TIMESTAMP_CACHE_SIZE = 4096 # Distinct timestamp strings memoized by _parse_iso_datetime
+DAY_FETCH_CONCURRENCY = 4 # Max per-day windows fetched at once by fetch_transcripts_by_day
+TIMEZONE_CACHE_SIZE = 8 # Distinct IANA zones kept loaded by _get_zone
 
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
 def _parse_iso_datetime(timestamp_str: Optional[str]) -> Optional[datetime]:
     """Safely parses an ISO 8601 timestamp string, handling potential None values.
     
-    Converts to timezone-aware UTC datetime.
+    Converts to timezone-aware UTC datetime. Memoized on the input string,
+    since lifelogs frequently share start/end timestamps.
     """
     if not timestamp_str:
         return None
     try:
-        # datetime.fromisoformat handles common ISO 8601 formats including Z for UTC
-        dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
+        # datetime.fromisoformat handles common ISO 8601 formats including Z
+        # for UTC on Python 3.11+, so no intermediate replaced string is needed
+        dt = datetime.fromisoformat(timestamp_str)
         # Ensure it's timezone-aware (make naive UTC if not)
         if dt.tzinfo is None:
              dt = dt.replace(tzinfo=timezone.utc)
@@ -39,6 +46,26 @@ def _parse_iso_datetime(timestamp_str: Optional[str]) -> Optional[datetime]:
         logger.warning(f"Could not parse timestamp string '{timestamp_str}': {e}")
         return None
 
+@lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
+def _get_zone(tz_name: str) -> tzinfo:
+    """Returns the tzinfo for an IANA timezone name, loaded once per name.
+
+    Unknown names fall back to UTC with a warning.
+    """
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        logger.warning(f"Unknown timezone '{tz_name}' ({e}); using UTC.")
+        return timezone.utc
+
+def today_in_timezone(tz_name: str) -> date:
+    """Returns the current calendar date in the given IANA timezone.
+
+    The Limitless API interprets date-only ranges in the requested
+    timezone, so "today" must be computed there rather than locally.
+    """
+    return datetime.now(_get_zone(tz_name)).date()
+
 async def fetch_transcripts(
     api_key: str,
     # Accept start/end times (ISO format strings) instead of target_date
@@ -173,4 +200,52 @@ async def fetch_transcripts(
                 break
 
     logger.info(f"Finished fetching for range {fetch_range_log}. Total transcripts retrieved: {len(transcripts)}")
-    return transcripts 
\ No newline at end of file
+    return transcripts 
+
+async def fetch_transcripts_by_day(
+    api_key: str,
+    start_date: date,
+    end_date: date,
+    timezone: str = "UTC",
+    max_concurrency: int = DAY_FETCH_CONCURRENCY,
+) -> list[TranscriptCreate]:
+    """Fetch a multi-day range as concurrent one-day windows.
+
+    Pagination within a window is cursor-driven and therefore sequential,
+    so a long backfill is split into days that are fetched in parallel,
+    at most max_concurrency at a time, hiding per-request latency.
+
+    Args:
+        api_key: The Limitless API key.
+        start_date: First day to fetch (inclusive).
+        end_date: Last day to fetch (inclusive).
+        timezone: IANA timezone specifier. Defaults to UTC.
+        max_concurrency: Maximum number of days fetched concurrently.
+
+    Returns:
+        List of TranscriptCreate objects in day order, without duplicate
+        source_ids (lifelogs spanning midnight can appear in two windows).
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _fetch_day(day: date) -> list[TranscriptCreate]:
+        async with semaphore:
+            return await fetch_transcripts(
+                api_key=api_key,
+                start_time_iso=day.isoformat(),
+                end_time_iso=(day + timedelta(days=1)).isoformat(),
+                timezone=timezone,
+            )
+
+    days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    logger.info(f"Fetching {len(days)} day(s) from {start_date} to {end_date} with up to {max_concurrency} concurrent requests.")
+    per_day_transcripts = await asyncio.gather(*(_fetch_day(day) for day in days))
+
+    transcripts: list[TranscriptCreate] = []
+    seen_source_ids: set[str] = set()
+    for day_transcripts in per_day_transcripts:
+        for transcript in day_transcripts:
+            if transcript.source_id not in seen_source_ids:
+                seen_source_ids.add(transcript.source_id)
+                transcripts.append(transcript)
+    return transcripts
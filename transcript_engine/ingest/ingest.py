@@ -2,14 +2,14 @@
 
 import logging
 import os
-import sqlite3
 from typing import List, Optional
-from datetime import datetime
+from datetime import date
 
 from transcript_engine.core.config import Settings
 from transcript_engine.database.crud import get_db
-from transcript_engine.ingest.fetcher import fetch_transcripts
+from transcript_engine.ingest.fetcher import fetch_transcripts, fetch_transcripts_by_day, today_in_timezone
 from transcript_engine.database.models import TranscriptCreate
+from transcript_engine.ingest.pipeline import ingest_lifelog_stream
 
 logger = logging.getLogger(__name__)
 
@@ -46,13 +46,24 @@ async def ingest_transcripts(
     ingested_count = 0
     
     try:
-        # Fetch transcripts from the API
-        transcripts_to_ingest = await fetch_transcripts(
-            api_key=api_key,
-            start_time_iso=start_time_iso,
-            end_time_iso=end_time_iso,
-            timezone=timezone,
-        )
+        # Fetch transcripts from the API. An open-ended range starting on a
+        # past date (e.g. a backfill) is fetched as concurrent per-day windows.
+        start_day = date.fromisoformat(start_time_iso) if start_time_iso and len(start_time_iso) == 10 else None
+        today = today_in_timezone(timezone)
+        if start_day and not end_time_iso and start_day < today:
+            transcripts_to_ingest = await fetch_transcripts_by_day(
+                api_key=api_key,
+                start_date=start_day,
+                end_date=today,
+                timezone=timezone,
+            )
+        else:
+            transcripts_to_ingest = await fetch_transcripts(
+                api_key=api_key,
+                start_time_iso=start_time_iso,
+                end_time_iso=end_time_iso,
+                timezone=timezone,
+            )
 
         if not transcripts_to_ingest:
             logger.warning(f"No transcripts found to ingest for range: {ingest_range_log}.")
@@ -60,51 +71,14 @@ async def ingest_transcripts(
 
         logger.info(f"Fetched {len(transcripts_to_ingest)} transcripts from the API for range: {ingest_range_log}.")
 
-        # --- Duplicate Checking & Insertion --- 
-        existing_source_ids = set()
+        # --- Insertion ---
+        # The shared write path looks up each batch's source_ids and skips the
+        # ones already stored, so no full-table source_id scan is needed here
+        conn_insert = get_db()
         try:
-            with get_db() as conn_check:
-                cursor_check = conn_check.cursor()
-                cursor_check.execute("SELECT source_id FROM transcripts WHERE source = ?", ("limitless",))
-                existing_source_ids = {row[0] for row in cursor_check.fetchall()}
-                logger.debug(f"Found {len(existing_source_ids)} existing Limitless source_ids in DB.")
-        except Exception as e:
-             logger.error(f"Error checking existing transcripts: {e}", exc_info=True)
-             # Continue without duplicate check if this fails
-
-        inserted_transcripts: List[TranscriptCreate] = []
-        with get_db() as conn_insert:
-            cursor_insert = conn_insert.cursor()
-            for transcript in transcripts_to_ingest:
-                if transcript.source_id in existing_source_ids:
-                     logger.debug(f"Skipping already existing transcript with source_id: {transcript.source_id}")
-                     continue
-                 
-                try:
-                     cursor_insert.execute(
-                         """
-                         INSERT INTO transcripts (source, source_id, title, content, start_time, end_time)
-                         VALUES (?, ?, ?, ?, ?, ?)
-                         """,
-                         (
-                             transcript.source,
-                             transcript.source_id,
-                             transcript.title,
-                             transcript.content,
-                             transcript.start_time,
-                             transcript.end_time,
-                         ),
-                     )
-                     inserted_transcripts.append(transcript)
-                     existing_source_ids.add(transcript.source_id)
-                except sqlite3.IntegrityError:
-                     logger.warning(f"Integrity error (likely duplicate source_id {transcript.source_id}) on insert. Skipping.")
-                     existing_source_ids.add(transcript.source_id)
-                except Exception as e_insert:
-                     logger.error(f"Error inserting transcript {transcript.source_id}: {e_insert}", exc_info=True)
-                     
-            conn_insert.commit()
-            ingested_count = len(inserted_transcripts)
+            ingested_count = await ingest_lifelog_stream(conn_insert, transcripts_to_ingest)
+        finally:
+            conn_insert.close()
         # ------------------------------------
 
         logger.info(f"Successfully ingested {ingested_count} new transcripts into the database for range: {ingest_range_log}.")
@@ -1,9 +1,7 @@
 """Service responsible for orchestrating the transcript ingestion pipeline."""
 
-import asyncio
 import logging
-import time
-from typing import AsyncGenerator, Dict, Any, Optional, List
+from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 
 from transcript_engine.database import crud
@@ -11,7 +9,7 @@ from transcript_engine.interfaces.limitless import LimitlessInterface, Transcrip
 from transcript_engine.processing.chunking import chunk_text # Assuming simple chunking for now
 from transcript_engine.interfaces.embedding_interface import EmbeddingInterface
 from transcript_engine.interfaces.vector_store_interface import VectorStoreInterface
-from transcript_engine.database.models import TranscriptCreate, ChunkCreate
+from transcript_engine.ingest.pipeline import ingest_lifelog_stream
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +26,9 @@ INGESTION_STATUS: Dict[str, Any] = {
 # Define stages
 STAGES = ["fetch", "db_load", "process"]
 
+# Chunks staged in the vector store before each flush
+VECTOR_STORE_FLUSH_SIZE = 1000
+
 async def run_ingestion_pipeline(
     db: Any, # Use actual type hint like sqlite3.Connection if available
     limitless_client: LimitlessInterface, 
@@ -62,59 +63,38 @@ async def run_ingestion_pipeline(
         INGESTION_STATUS.update({"current_stage": "fetch", "message": "Fetching transcripts from Limitless..."})
         logger.info(f"Fetching transcripts starting from: {start_from_date}")
         
-        # Consume the async generator properly
-        new_transcripts_raw = []
-        async for transcript_data in limitless_client.fetch_transcripts(since=start_from_date):
-             new_transcripts_raw.append(transcript_data)
-        
-        logger.info(f"Fetched {len(new_transcripts_raw)} raw transcripts.")
-        INGESTION_STATUS["completed_stages"].append("fetch")
-        INGESTION_STATUS.update({"message": f"Fetched {len(new_transcripts_raw)} raw transcripts."})
-
-        # === DB Load Stage ===
-        INGESTION_STATUS.update({"current_stage": "db_load", "message": "Filtering and saving transcripts to database..."})
-        saved_count = 0
+        # === DB Load Stage (streamed) ===
+        # Each lifelog is handed to the shared batched writer as the client
+        # yields it, so DB writes overlap with page fetches and the raw
+        # lifelogs are never held in one list
+        fetched_count = 0
         skipped_count = 0
         new_transcripts_for_processing = []
-        with db: # Use context manager for transaction
-            for raw_transcript in new_transcripts_raw:
-                # Assuming raw_transcript is now the TranscriptData model from limitless client
-                # We need to convert it to TranscriptCreate for crud.save_transcript
-                # (Or update crud.save_transcript to accept TranscriptData)
-                # For now, let's assume crud.save_transcript needs TranscriptCreate
+
+        async def _valid_lifelogs():
+            nonlocal fetched_count, skipped_count
+            async for raw_transcript in limitless_client.fetch_transcripts(since=start_from_date):
+                fetched_count += 1
                 if not isinstance(raw_transcript, TranscriptData):
                     logger.error(f"Expected TranscriptData, got {type(raw_transcript)}. Skipping.")
                     skipped_count += 1
                     continue
-                
-                # Create the Pydantic model for DB insertion
-                transcript_to_create = TranscriptCreate(
-                    source=raw_transcript.source,
-                    source_id=raw_transcript.source_id,
-                    title=raw_transcript.title,
-                    content=raw_transcript.content, # Content should now be assembled
-                    start_time=raw_transcript.start_time,
-                    end_time=raw_transcript.end_time,
-                    # raw_data field is not in TranscriptCreate, maybe add if needed?
-                )
-
-                # Pass the Pydantic model to the CRUD function
-                transcript_id = crud.create_transcript(db, transcript_to_create)
-                if transcript_id:
-                     # Fetch the full transcript object now that it's created
-                     transcript_obj = crud.get_transcript_by_id(db, transcript_id)
-                     if transcript_obj:
-                         new_transcripts_for_processing.append(transcript_obj)
-                         saved_count += 1
-                     else:
-                         # This would be unusual if create_transcript succeeded
-                         logger.error(f"Could not retrieve newly created transcript with ID {transcript_id}")
-                         skipped_count += 1 # Count as skipped if retrieval failed
-                else:
-                     # Handle case where create_transcript might fail (e.g., duplicate source_id if IntegrityError wasn't caught/handled upstream)
-                     logger.warning(f"Failed to create transcript for source_id {transcript_to_create.source_id} or it already existed.")
-                     skipped_count += 1 # Count as skipped
-
+                yield raw_transcript
+
+        # Rows above this ID after the load are the ones this run inserted
+        last_existing_id = crud.get_max_transcript_id(db)
+        saved_count = await ingest_lifelog_stream(db, _valid_lifelogs())
+        # Existing source_ids are ignored by the batch insert
+        skipped_count += fetched_count - skipped_count - saved_count
+        for transcript_id in crud.get_transcript_ids_after(db, last_existing_id):
+            transcript_obj = crud.get_transcript_by_id(db, transcript_id)
+            if transcript_obj:
+                new_transcripts_for_processing.append(transcript_obj)
+            else:
+                logger.error(f"Could not retrieve newly created transcript with ID {transcript_id}")
+
+        logger.info(f"Fetched {fetched_count} raw transcripts.")
+        INGESTION_STATUS["completed_stages"].append("fetch")
         logger.info(f"Saved {saved_count} new transcripts to DB. Skipped {skipped_count}.")
         INGESTION_STATUS["completed_stages"].append("db_load")
         INGESTION_STATUS.update({"message": f"Saved {saved_count} new transcripts, skipped {skipped_count}."})
@@ -125,8 +105,9 @@ async def run_ingestion_pipeline(
         total_chunks = 0
         if new_transcripts_for_processing:
             logger.info(f"Starting chunking and embedding for {len(new_transcripts_for_processing)} transcripts...")
+            staged_chunks = 0
             for i, transcript in enumerate(new_transcripts_for_processing):
-                logger.debug(f"Processing transcript {i+1}/{len(new_transcripts_for_processing)} (ID: {transcript.id})")
+                logger.debug("Processing transcript %d/%d (ID: %s)", i + 1, len(new_transcripts_for_processing), transcript.id)
                 INGESTION_STATUS["message"] = f"Processing transcript {i+1}/{len(new_transcripts_for_processing)}..."
 
                 # 1. Chunk text content
@@ -135,12 +116,12 @@ async def run_ingestion_pipeline(
                     logger.warning(f"No chunks created for transcript ID: {transcript.id}")
                     continue
 
-                logger.debug(f"Generated {len(chunk_texts)} text chunks for transcript ID: {transcript.id}. Generating embeddings...")
+                logger.debug("Generated %d text chunks for transcript ID: %s. Generating embeddings...", len(chunk_texts), transcript.id)
 
                 try:
                     # 2. Generate embeddings for the text chunks
                     embeddings_list = embedding_service.embed_documents(chunk_texts)
-                    logger.debug(f"Generated {len(embeddings_list)} embeddings.")
+                    logger.debug("Generated %d embeddings.", len(embeddings_list))
 
                     # 3. Check for mismatch
                     if len(chunk_texts) != len(embeddings_list):
@@ -166,10 +147,12 @@ async def run_ingestion_pipeline(
                         structured_chunks_to_add.append(chunk_data)
 
                     # 5. Add structured chunks to vector store
-                    vector_store.add(structured_chunks_to_add) # Use the corrected method name 'add' and pass the list of dicts/models
-                    logger.debug(f"Added {len(structured_chunks_to_add)} chunks to vector store for transcript ID: {transcript.id}")
+                    # Staged, then written to the store every VECTOR_STORE_FLUSH_SIZE chunks
+                    vector_store.add_no_persist(structured_chunks_to_add)
+                    logger.debug("Added %d chunks to vector store for transcript ID: %s", len(structured_chunks_to_add), transcript.id)
                     total_chunks += len(structured_chunks_to_add)
                     processed_count += 1
+                    staged_chunks += len(structured_chunks_to_add)
 
                 except Exception as e:
                     logger.error(f"Error processing transcript ID {transcript.id}: {e}", exc_info=True)
@@ -180,8 +163,22 @@ async def run_ingestion_pipeline(
                         "last_error": f"Error processing transcript {transcript.id}: {e}",
                         "message": f"Error processing transcript {transcript.id}."
                     })
+                    # Keep chunks already processed before stopping, without
+                    # letting a flush failure replace the transcript's error
+                    try:
+                        vector_store.flush()
+                    except Exception as flush_error:
+                        logger.error(f"Failed to flush staged chunks after error: {flush_error}", exc_info=True)
                     return # Stop pipeline on error during processing
 
+                # Outside the per-transcript try: a failed write is a store
+                # error, not an error in whichever transcript filled the buffer
+                if staged_chunks >= VECTOR_STORE_FLUSH_SIZE:
+                    vector_store.flush()
+                    staged_chunks = 0
+
+            vector_store.flush()
+
             logger.info(f"Finished processing {processed_count} transcripts, generating {total_chunks} chunks/embeddings.")
         else:
             logger.info("No new transcripts needed processing.")
@@ -0,0 +1,157 @@
+"""Shared lifelog-to-database write path used by every ingest entry point.
+
+The CLI, the incremental ingest and the API-triggered pipeline all feed
+their lifelogs through ``ingest_lifelog_stream``, so batching and insert
+behaviour live in one place.
+"""
+
+import asyncio
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterable, Iterable, List, Optional, Union
+
+from transcript_engine.database.crud import TranscriptRow, create_transcripts
+from transcript_engine.database.models import TranscriptCreate
+from transcript_engine.interfaces.limitless import TranscriptData
+
+logger = logging.getLogger(__name__)
+
+# Transcripts written per batch-insert transaction
+INSERT_BATCH_SIZE = 500
+# Transcripts buffered between the producer and the writer (backpressure)
+WRITE_QUEUE_MAX_SIZE = 2000
+
+LifelogItem = Union[TranscriptData, TranscriptCreate]
+
+def _to_transcript_row(item: LifelogItem) -> TranscriptRow:
+    """Converts a fetched lifelog into a raw row for crud.create_transcripts.
+
+    Plain tuples skip TranscriptCreate validation on the hot path; the
+    fetched models were already validated once when they were built.
+    """
+    # --- Log content for debugging ---
+    if item.content is None or len(item.content.strip()) == 0:
+        logger.warning("TranscriptData source_id '%s' has None or empty content.", item.source_id)
+    return (item.source, item.source_id, item.title, item.content, item.start_time, item.end_time)
+
+def _flush_batch(conn: sqlite3.Connection, batch: List[TranscriptRow]) -> int:
+    """Writes a batch of transcripts in one transaction.
+
+    Duplicate source_ids are skipped by ON CONFLICT DO NOTHING, so the batch
+    never fails on lifelogs that are already stored.
+
+    Returns:
+        The number of new rows inserted.
+
+    Raises:
+        sqlite3.Error: If the batch could not be written; it is rolled back,
+            and the error ends the ingest instead of silently dropping the batch.
+    """
+    try:
+        return create_transcripts(conn, batch)
+    except sqlite3.Error as e:
+        logger.error(f"Failed to write batch of {len(batch)} transcripts (first source_id '{batch[0][1]}'): {e}", exc_info=True)
+        raise
+
+async def _transcript_writer(
+    write_queue: asyncio.Queue,
+    conn: sqlite3.Connection,
+    db_executor: Optional[ThreadPoolExecutor],
+) -> int:
+    """Single writer: drains the queue and commits up to INSERT_BATCH_SIZE rows per transaction.
+
+    It is the only code path that writes, so an ingest never contends
+    with itself for SQLite's write lock. Waits for one item, then takes
+    whatever else is already queued. A ``None`` item ends the stream.
+
+    Returns:
+        The number of new rows inserted.
+    """
+    loop = asyncio.get_running_loop()
+    ingested_count = 0
+    finished = False
+    while not finished:
+        item = await write_queue.get()
+        if item is None:
+            break
+        batch = [item]
+        while len(batch) < INSERT_BATCH_SIZE:
+            try:
+                item = write_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if item is None:
+                finished = True
+                break
+            batch.append(item)
+        if db_executor is not None:
+            ingested_count += await loop.run_in_executor(db_executor, _flush_batch, conn, batch)
+        else:
+            ingested_count += _flush_batch(conn, batch)
+        logger.info(f"Ingested {ingested_count} transcripts so far...")
+    return ingested_count
+
+async def _iterate(stream: Union[AsyncIterable[LifelogItem], Iterable[LifelogItem]]):
+    """Yields from either an async or a plain iterable."""
+    if hasattr(stream, "__aiter__"):
+        async for item in stream:
+            yield item
+    else:
+        for item in stream:
+            yield item
+
+async def ingest_lifelog_stream(
+    conn: sqlite3.Connection,
+    stream: Union[AsyncIterable[LifelogItem], Iterable[LifelogItem]],
+    db_executor: Optional[ThreadPoolExecutor] = None,
+) -> int:
+    """Writes a stream of lifelogs to the transcripts table in batches.
+
+    Items are converted to raw row tuples as they arrive and handed to a
+    single writer task, which commits them (skipping existing source_ids) in batches
+    of INSERT_BATCH_SIZE while the producer keeps iterating.
+
+    Args:
+        conn: Database connection the writer uses.
+        stream: Async or plain iterable of TranscriptData/TranscriptCreate.
+        db_executor: Optional single-thread executor that owns ``conn``; when
+            given, the blocking sqlite3 writes run there instead of on the
+            event loop.
+
+    Returns:
+        The number of new transcripts inserted.
+
+    Raises:
+        sqlite3.Error: If a batch fails to write. Batches committed before
+            it stay committed; the rest of the stream is not consumed.
+    """
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=WRITE_QUEUE_MAX_SIZE)
+    writer_task = asyncio.create_task(_transcript_writer(write_queue, conn, db_executor))
+    try:
+        async for item in _iterate(stream):
+            if writer_task.done():
+                break # Writer died; surface its error below
+            row = _to_transcript_row(item)
+            if not write_queue.full():
+                write_queue.put_nowait(row)
+                continue
+            # Backpressure: wait for room, unless the writer dies meanwhile
+            put_task = asyncio.ensure_future(write_queue.put(row))
+            await asyncio.wait((put_task, writer_task), return_when=asyncio.FIRST_COMPLETED)
+            if not put_task.done():
+                put_task.cancel()
+                break
+    except BaseException:
+        # Let the writer commit what was already queued before the error
+        # propagates: the caller may close ``conn`` as soon as we return
+        if not writer_task.done():
+            await write_queue.put(None)
+        try:
+            await writer_task
+        except Exception as writer_error:
+            logger.error(f"Transcript writer also failed: {writer_error}", exc_info=True)
+        raise
+    if not writer_task.done():
+        await write_queue.put(None)
+    return await writer_task
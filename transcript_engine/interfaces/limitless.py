@@ -1,18 +1,25 @@
 """Interface and implementation for fetching data from the Limitless API."""
 
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Any, Optional, Protocol, AsyncGenerator
+from typing import Dict, Any, Optional, Protocol, AsyncGenerator
 import httpx
 import logging
-import time
 import os
 from pathlib import Path
 import json
 import asyncio
 
+try:
+    import orjson # Installed alongside chromadb; parses bytes directly
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 from pydantic import BaseModel
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
+from transcript_engine.ingest.fetcher import _parse_iso_datetime # Memoized; shared with the fetcher
+
 logger = logging.getLogger(__name__)
 
 # --- Data Models --- 
@@ -57,7 +64,9 @@ class LimitlessAPIClient(LimitlessInterface):
     RETRY_WAIT_MIN = 10 # Increased initial wait to 10 seconds
     RETRY_WAIT_MAX = 60 # Increased max wait to 60 seconds
     REQUEST_TIMEOUT = 60.0 # Increased timeout
+    KEEPALIVE_EXPIRY = 120.0 # Keep the pooled connection open across paced page fetches
     DEFAULT_TIMEZONE = "UTC"
+    RAW_SAVE_MAX_PENDING = 32 # Raw page writes in flight before the fetch loop waits on them
 
     def __init__(self, api_key: Optional[str] = None, save_dir: Optional[Path | str] = None):
         self.api_key = api_key or os.getenv("LIMITLESS_API_KEY")
@@ -69,11 +78,29 @@ class LimitlessAPIClient(LimitlessInterface):
         if self.save_dir:
              self.save_dir.mkdir(parents=True, exist_ok=True)
              logger.info(f"Raw Limitless responses will be saved to: {self.save_dir}")
+        # Raw page writes running on worker threads, off the event loop
+        self._pending_saves: set[asyncio.Task] = set()
              
-        self.http_client = httpx.AsyncClient(timeout=self.REQUEST_TIMEOUT)
+        # One persistent connection is reused for every page: the TLS handshake
+        # and socket setup happen once, and auth headers are built once here
+        # instead of on each request.
+        self.http_client = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            headers={
+                "X-API-Key": self.api_key,
+                "Accept": "application/json",
+            },
+            timeout=self.REQUEST_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=1,
+                max_keepalive_connections=1,
+                keepalive_expiry=self.KEEPALIVE_EXPIRY,
+            ),
+        )
 
     async def close(self):
         """Close the underlying HTTP client."""
+        await self._drain_raw_saves()
         await self.http_client.aclose()
         logger.info("Limitless HTTP client closed.")
 
@@ -86,23 +113,38 @@ class LimitlessAPIClient(LimitlessInterface):
     async def _fetch_single_page(
         self,
         params: Dict[str, Any]
-    ) -> Dict[str, Any]:
+    ) -> httpx.Response:
         """Fetches a single page of lifelogs with retry logic."""
-        headers = {
-            "X-API-Key": self.api_key,
-            "Accept": "application/json"
-        }
-        url = f"{self.BASE_URL}{self.LIFELOGS_ENDPOINT}"
-        
-        logger.debug(f"Fetching Limitless page with params: {params}")
-        response = await self.http_client.get(url, headers=headers, params=params)
+        logger.debug("Fetching Limitless page with params: %s", params)
+        response = await self.http_client.get(self.LIFELOGS_ENDPOINT, params=params)
         
         if 500 <= response.status_code < 600:
             logger.warning(f"Received {response.status_code} from Limitless API. Retrying...")
             response.raise_for_status()
             
         response.raise_for_status()
-        return response.json()
+        return response
+
+    async def _save_raw_page(self, raw: bytes, filename: str) -> None:
+        """Writes a raw page to save_dir on a worker thread, without awaiting the write.
+
+        The fetch loop keeps going while the write runs; it only waits once
+        RAW_SAVE_MAX_PENDING writes are outstanding.
+        """
+        task = asyncio.create_task(asyncio.to_thread((self.save_dir / filename).write_bytes, raw))
+        self._pending_saves.add(task)
+        task.add_done_callback(self._pending_saves.discard)
+        if len(self._pending_saves) >= self.RAW_SAVE_MAX_PENDING:
+            await asyncio.wait(self._pending_saves, return_when=asyncio.FIRST_COMPLETED)
+
+    async def _drain_raw_saves(self) -> None:
+        """Waits for outstanding raw page writes, logging any that failed."""
+        if not self._pending_saves:
+            return
+        results = await asyncio.gather(*self._pending_saves, return_exceptions=True)
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Failed to save raw Limitless response: {result}")
 
     async def fetch_transcripts(self, since: Optional[datetime] = None) -> AsyncGenerator[TranscriptData, None]:
         """Fetches transcripts from Limitless API asynchronously, yielding TranscriptData objects."""
@@ -121,6 +163,7 @@ class LimitlessAPIClient(LimitlessInterface):
         end_str = end_date.strftime(self.API_DATETIME_FORMAT)
 
         logger.info(f"Fetching Limitless lifelogs from {start_str} to {end_str} (Timezone: {self.DEFAULT_TIMEZONE})...")
+        run_stamp = end_date.strftime("%Y%m%dT%H%M%SZ") # Prefix for this run's raw page files
         
         next_cursor = None
         page_count = 0
@@ -140,7 +183,12 @@ class LimitlessAPIClient(LimitlessInterface):
                 params["cursor"] = next_cursor
 
             try:
-                raw_json_data = await self._fetch_single_page(params=params)
+                response = await self._fetch_single_page(params=params)
+                # The body bytes are saved verbatim and parsed once; nothing is
+                # re-serialized for the raw cache
+                if self.save_dir:
+                    await self._save_raw_page(response.content, f"lifelogs_{run_stamp}_page{page_count:04d}.json")
+                raw_json_data = _json_loads(response.content)
                 page_lifelogs = raw_json_data.get("data", {}).get("lifelogs", [])
                 
                 if not isinstance(page_lifelogs, list):
@@ -152,8 +200,10 @@ class LimitlessAPIClient(LimitlessInterface):
                 for lifelog in page_lifelogs:
                     total_lifelogs_processed += 1
                     try:
-                         start_time = datetime.fromisoformat(lifelog['startTime']) if lifelog.get('startTime') else None
-                         end_time = datetime.fromisoformat(lifelog['endTime']) if lifelog.get('endTime') else None
+                         start_time = _parse_iso_datetime(lifelog.get('startTime'))
+                         end_time = _parse_iso_datetime(lifelog.get('endTime'))
+                         if (start_time is None and lifelog.get('startTime')) or (end_time is None and lifelog.get('endTime')):
+                             raise ValueError("unparseable startTime/endTime")
                          
                          # Skip if start_time is before the requested 'since' time (API might return overlapping ranges)
                          if since and start_time and start_time < since:
@@ -204,6 +254,7 @@ class LimitlessAPIClient(LimitlessInterface):
                 logger.error(f"Unexpected error fetching/processing Limitless page {page_count}: {e}", exc_info=True)
                 raise # Re-raise after logging
                 
+        await self._drain_raw_saves()
         logger.info(f"Completed fetching Limitless lifelogs. Processed {total_lifelogs_processed} items across {page_count} page(s).")
 
 # --- Removed old fetch_transcripts function --- 
\ No newline at end of file
@@ -4,9 +4,6 @@
 import logging
 from typing import Protocol, List, Dict, Any, Optional, runtime_checkable
 
-# Import the Chunk model from its definition location
-from transcript_engine.database.models import Chunk 
-
 # Type alias for embedding vectors
 EmbeddingVector = List[float]
 
@@ -20,15 +17,32 @@ class VectorStoreInterface(Protocol):
     can be used interchangeably.
     """
 
-    def add(self, chunks: List[Chunk], embeddings: List[EmbeddingVector]) -> None:
+    def add(self, chunks_data: List[Dict[str, Any]]) -> None:
         """Adds chunks and their corresponding embeddings to the vector store.
 
         Args:
-            chunks: A list of Chunk objects to add.
-            embeddings: A list of embedding vectors corresponding to each chunk.
+            chunks_data: A list of dictionaries, one per chunk, with 'content',
+                'embedding' and 'metadata' keys and an optional 'id'.
+            
+        Raises:
+            Exception: For underlying vector store errors.
+        """
+        ...
+
+    def add_no_persist(self, chunks_data: List[Dict[str, Any]]) -> None:
+        """Stages chunks and embeddings to be written by the next flush().
+
+        Args:
+            chunks_data: A list of dictionaries in the format accepted by add().
+        """
+        ...
+
+    def flush(self) -> None:
+        """Writes everything staged with add_no_persist to the store.
+
+        Staged rows are kept if the write fails.
             
         Raises:
-            ValueError: If the number of chunks and embeddings doesn't match.
             Exception: For underlying vector store errors.
         """
         ...
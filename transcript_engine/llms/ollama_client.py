@@ -47,7 +47,8 @@ class OllamaClient(LLMInterface):
         Args:
             prompt: The input prompt.
             model: The model to use (defaults to settings.default_model).
-            **kwargs: Additional options for ollama.generate (e.g., temperature).
+            **kwargs: Additional options for ollama.generate: ``options`` (e.g.,
+                temperature) and ``format`` ("json" constrains the output to JSON).
 
         Returns:
             The generated text response.
@@ -62,10 +63,13 @@ class OllamaClient(LLMInterface):
             response = self.client.generate(
                 model=target_model,
                 prompt=prompt,
+                format=kwargs.get("format", ""),
                 options=kwargs.get("options", {}),
                 stream=False # Ensure we get the full response
             )
             generated_text = response.get('response', '').strip()
+            # prompt_eval_count only counts tokens not served from the cached prompt prefix
+            logger.debug("Ollama evaluated %s prompt tokens.", response.get('prompt_eval_count'))
             logger.debug(f"Generated text response (first 50 chars): '{generated_text[:50]}...'")
             return generated_text
         except ollama.ResponseError as e:
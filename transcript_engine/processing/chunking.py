@@ -29,20 +29,14 @@ def chunk_text(
     if not text:
         return []
 
-    chunks: List[str] = []
-    start = 0
-    while start < len(text):
-        end = min(start + chunk_size, len(text))
-        chunks.append(text[start:end])
-
-        # Move start index for the next chunk, considering overlap
-        next_start = start + chunk_size - chunk_overlap
-        if next_start <= start:  # Avoid infinite loop if overlap >= size
-            next_start = start + 1
-
-        start = next_start
-        if start >= len(text):
-            break  # Already processed the end
+    # Chunk start offsets form an arithmetic sequence, so the windows can be
+    # sliced directly in a single comprehension instead of a while loop
+    step = chunk_size - chunk_overlap
+    if step < 1:  # Avoid infinite loop if overlap >= size
+        step = 1
+    chunks: List[str] = [
+        text[start:start + chunk_size] for start in range(0, len(text), step)
+    ]
 
     logger.debug(
         f"Chunked text into {len(chunks)} chunks (size={chunk_size}, overlap={chunk_overlap})."
@@ -28,6 +28,11 @@ class ChromaStore(VectorStoreInterface):
             settings: The application settings containing ChromaDB configuration.
         """
         persist_directory = None # Initialize for error logging
+        # Rows staged by add_no_persist, written to the collection by flush()
+        self._pending_ids: List[str] = []
+        self._pending_docs: List[str] = []
+        self._pending_embeddings: List[EmbeddingVector] = []
+        self._pending_metadatas: List[Dict[str, Any]] = []
         collection_name_from_settings = None
         try:
             # --- WORKAROUND for potential stale Settings object --- 
@@ -70,22 +75,34 @@ class ChromaStore(VectorStoreInterface):
         automatic ID generation if IDs are not critical to pre-determine.
         Here, we'll generate an ID based on metadata and content hash for potential deduplication.
 
+        Any rows previously staged with add_no_persist are written in the same call.
+
         Args:
             chunks_data: A list of dictionaries, each containing keys like 
-                         'content', 'embedding', 'metadata' (with 'transcript_id').
+                         'content', 'embedding', 'metadata' (with 'transcript_id')
+                         and optionally 'id', used as the Chroma ID when given.
 
         Raises:
             Exception: For ChromaDB errors during addition.
         """
+        self.add_no_persist(chunks_data)
+        self.flush()
+
+    def add_no_persist(self, chunks_data: List[Dict[str, Any]]) -> None:
+        """Stages chunk data for the next flush() without writing to Chroma.
+
+        Each write to a persistent collection commits to Chroma's SQLite
+        store and updates its index, so callers adding many small batches
+        can stage them here and flush() once.
+
+        Args:
+            chunks_data: A list of dictionaries in the format accepted by add().
+        """
         if not chunks_data:
             logger.debug("No chunk data provided to add.")
             return
 
-        ids = []
-        docs = []
-        metadatas = []
-        embeddings_list = [] # Renamed from embeddings to avoid conflict
-
+        staged = 0
         for i, chunk_dict in enumerate(chunks_data):
             # Extract data safely
             content = chunk_dict.get('content')
@@ -96,31 +113,46 @@ class ChromaStore(VectorStoreInterface):
                 logger.warning(f"Skipping chunk {i} due to missing content or embedding.")
                 continue
 
-            # Generate a unique ID - combining transcript_id and a simple index or hash
-            # Using index for simplicity here, ensure transcript_id is present
-            transcript_id = metadata_in.get('transcript_id', 'unknown')
-            chunk_id_str = f"{transcript_id}_{i}" # Simple unique ID within the transcript
+            chunk_id_str = chunk_dict.get('id')
+            if chunk_id_str is None:
+                # Generate a unique ID - combining transcript_id and a simple index or hash
+                # Using index for simplicity here, ensure transcript_id is present
+                transcript_id = metadata_in.get('transcript_id', 'unknown')
+                chunk_id_str = f"{transcript_id}_{i}" # Simple unique ID within the transcript
             
-            ids.append(chunk_id_str)
-            docs.append(content)
-            embeddings_list.append(embedding)
+            self._pending_ids.append(chunk_id_str)
+            self._pending_docs.append(content)
+            self._pending_embeddings.append(embedding)
             
             # Filter out None values from metadata for Chroma compatibility
             metadata_out = {k: v for k, v in metadata_in.items() if v is not None}
-            metadatas.append(metadata_out)
+            self._pending_metadatas.append(metadata_out)
+            staged += 1
 
         # Check if we have anything left to add after filtering
-        if not ids:
+        if not staged:
             logger.warning("No valid chunks to add after processing the input list.")
+
+    def flush(self) -> None:
+        """Writes all rows staged by add_no_persist to the collection in one call.
+
+        The staging buffers are only cleared once the write succeeds, so a
+        failed flush keeps the rows for the next attempt.
+
+        Raises:
+            Exception: For ChromaDB errors during addition.
+        """
+        ids = self._pending_ids
+        if not ids:
             return
             
         try:
             logger.debug(f"Adding {len(ids)} chunks to Chroma collection '{self.collection_name}'.")
             self.collection.add(
                 ids=ids,
-                embeddings=embeddings_list, # Use the extracted embeddings
-                documents=docs,
-                metadatas=metadatas
+                embeddings=self._pending_embeddings, # Use the extracted embeddings
+                documents=self._pending_docs,
+                metadatas=self._pending_metadatas
             )
             logger.info(f"Successfully added {len(ids)} chunks to Chroma.")
         except IDAlreadyExistsError:
@@ -130,6 +162,8 @@ class ChromaStore(VectorStoreInterface):
         except Exception as e:
             logger.error(f"Failed to add documents to Chroma: {e}", exc_info=True)
             raise
+        self._pending_ids, self._pending_docs = [], []
+        self._pending_embeddings, self._pending_metadatas = [], []
 
     def query(
         self, 